@@ -17,10 +17,252 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import sys
+import types
+import weakref
+
+import six
+
+from pyangbind.lib.yangtypes import YANGLeafSchema, _base_type_cache, _DetachedParent, _copy_slots, safe_name
+
+
+class ModificationCounter(object):
+    """
+    A monotonic count of the changes that have been made within a data tree,
+    shared by each object within the tree. The snapshots that share objects
+    of the tree are also tracked, such that changes to the tree are only
+    checked against snapshots whilst any exist.
+    """
+
+    __slots__ = ("value", "backers")
+
+    def __init__(self):
+        self.value = 0
+        self.backers = None
+
+    def tick(self):
+        self.value += 1
+
+
+def _clear_element(element):
+    """
+    Mark element, and its descendants, as unchanged. Returns whether the
+    element remains changed, as the key of a list entry does.
+    """
+    if hasattr(element, "clear_changes"):
+        element.clear_changes()
+        return False
+    if getattr(element, "_pybind_generated_by", None) == "YANGListType":
+        for entry in element.itervalues():
+            if entry._changed():
+                entry.clear_changes()
+    elif getattr(element, "_is_keyval", False):
+        return True
+    if getattr(element, "_mchanged", False):
+        element._mchanged = False
+    return False
+
+
+def _clone(obj, path_helper):
+    """
+    Return a copy of obj (a container or list) that is registered with
+    path_helper, or a new YANGPathHelper where obj is registered with a path
+    helper and none is supplied.
+    """
+    if path_helper is None:
+        if not getattr(obj, "_path_helper", False):
+            return obj.snapshot()
+        from pyangbind.lib.xpathhelper import YANGPathHelper
+
+        path_helper = YANGPathHelper()
+    copy = obj.snapshot()
+    registrations = []
+    _detach(copy, path_helper, registrations)
+    path_helper.register_many(registrations)
+    return copy
+
+
+def _detach(obj, path_helper, registrations):
+    """
+    Create each element of obj, and its descendants, within a snapshot such
+    that it no longer shares any objects with the tree that it was taken
+    from. Each object is moved to path_helper, and the registrations that
+    it requires are appended to registrations.
+    """
+    generated_by = getattr(obj, "_pybind_generated_by", None)
+    if getattr(obj, "_register_paths", False) and generated_by != "YANGListType":
+        registrations.append((obj._register_path(), obj))
+    if generated_by == "YANGListType":
+        for entry in obj.itervalues():
+            _detach(entry, path_helper, registrations)
+    elif generated_by == "container":
+        for element_name in obj._pyangbind_elements:
+            _detach(getattr(obj, element_name), path_helper, registrations)
+        source = getattr(obj, "_pybind_source", None)
+        if source is not None:
+            obj._pybind_source = None
+            source._modifications().backers.discard(obj)
+    # the elements of obj are created before it is moved, such that they are
+    # registered with path_helper together with obj.
+    if hasattr(obj, "_path_helper"):
+        obj._path_helper = path_helper
+
+
+# attributes that refer to objects that are not held by the object that they
+# are set on - its parent, its path helper, or objects that are shared by
+# each instance of a schema node.
+_unowned_attributes = frozenset(
+    (
+        "_parent",
+        "_path_helper",
+        "_extmethods",
+        "_schema_node",
+        "_contained_class",
+        "_pybind_source",
+        "_yang_list",
+    )
+)
+
+
+def _attribute_names(cls):
+    """
+    Return the names of the attributes that are stored in the slots of an
+    instance of cls, with the names of private slots mangled.
+    """
+    cache = _base_type_cache(cls, "_pybind_sized_slots")
+    names = cache.get(cls, None)
+    if names is None:
+        names = []
+        for c in cls.__mro__:
+            slots = vars(c).get("__slots__", ())
+            if isinstance(slots, six.string_types):
+                slots = (slots,)
+            for name in slots:
+                if name in ("__dict__", "__weakref__") or name in _unowned_attributes:
+                    continue
+                if name.startswith("__") and not name.endswith("__"):
+                    name = "_%s%s" % (c.__name__.lstrip("_"), name)
+                if name not in names:
+                    names.append(name)
+        names = cache[cls] = tuple(names)
+    return names
+
+
+def _sizeof(obj, seen):
+    """
+    Return the approximate number of bytes used by obj, and the objects that
+    it holds, that are not in seen - a set of the id() of the objects that
+    have been counted already, to which those of obj are added.
+    """
+    if obj is None or isinstance(obj, (bool, type, types.FunctionType, types.MethodType, types.BuiltinFunctionType)):
+        return 0
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        # the entries of a snapshot of a list are read without being copied.
+        for k, v in dict.items(obj):
+            size += _sizeof(k, seen) + _sizeof(v, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for v in obj:
+            size += _sizeof(v, seen)
+    for name in _attribute_names(type(obj)):
+        size += _sizeof(getattr(obj, name, None), seen)
+    attributes = getattr(obj, "__dict__", None)
+    if attributes is not None and id(attributes) not in seen:
+        seen.add(id(attributes))
+        size += sys.getsizeof(attributes)
+        for k, v in six.iteritems(attributes):
+            if k not in _unowned_attributes:
+                size += _sizeof(k, seen) + _sizeof(v, seen)
+    return size
+
+
+def _memory_elements(obj):
+    """
+    Return the (YANG name, object) of each element of obj that has been
+    created. The entries of a list are returned with the name of the list.
+    Compact leaves are returned as the value that is stored for them.
+    """
+    generated_by = getattr(obj, "_pybind_generated_by", None)
+    if generated_by == "YANGListType":
+        shared = getattr(obj._members, "_shared", {})
+        return [(None, entry) for entry in dict.values(obj._members) if id(entry) not in shared]
+    if generated_by != "container":
+        return []
+    elements = []
+    for element_name in obj._pyangbind_elements:
+        if not obj._materialised(element_name):
+            # the element holds its default value, or is shared with the
+            # object that obj is a snapshot of.
+            continue
+        leaf_schema = getattr(type(obj), "_pybind_schema_%s" % element_name, None)
+        if isinstance(leaf_schema, YANGLeafSchema):
+            value = getattr(obj, leaf_schema.slot)
+            if value is not None:
+                elements.append((leaf_schema.kwargs["schema"].yang_name, value))
+            continue
+        element = getattr(obj, element_name)
+        elements.append((element.yang_name(), element))
+    return elements
+
+
+def _memory_report(obj):
+    """
+    Return the number of objects, and the approximate number of bytes that
+    they use, within the subtree rooted at obj - in total, for each schema
+    path and for each pyangbind type.
+    """
+    seen = set()
+    paths, kinds = {}, {}
+    total = {"objects": 0, "bytes": 0}
+    root_path = "/" + "/".join(part.split("[")[0] for part in obj._path())
+    pending = [(root_path, obj)]
+    while pending:
+        path, element = pending.pop()
+        children = _memory_elements(element)
+        # the children are counted against their own paths, and the entries
+        # that a snapshot of a list shares are not counted.
+        seen.update(id(child) for _, child in children)
+        shared_entries = getattr(getattr(element, "_members", None), "_shared_entries", None)
+        if shared_entries is not None:
+            seen.update(id(entry) for entry in shared_entries())
+        size = _sizeof(element, seen)
+        if getattr(element, "_pybind_generated_by", None) is not None:
+            kind = element._pybind_generated_by
+        elif hasattr(type(element), "_base_type"):
+            kind = type(element)._base_type.__name__
+        else:
+            # the value of a compact leaf.
+            kind = "YANGLeafSchema"
+        for summary in (
+            total,
+            paths.setdefault(path, {"objects": 0, "bytes": 0}),
+            kinds.setdefault(kind, {"objects": 0, "bytes": 0}),
+        ):
+            summary["objects"] += 1
+            summary["bytes"] += size
+        for yang_name, child in children:
+            seen.discard(id(child))
+            pending.append((path if yang_name is None else path.rstrip("/") + "/" + yang_name, child))
+
+    path_helper = getattr(obj, "_path_helper", None)
+    total["paths"] = paths
+    total["types"] = kinds
+    total["path_helper"] = path_helper._index_size() if hasattr(path_helper, "_index_size") else None
+    return total
 
 
 class PybindBase(object):
-    __slots__ = ()
+    __slots__ = (
+        "__weakref__",
+        "_pybind_modifications",
+        "_pybind_dirty",
+        "_pybind_source",
+        "_pybind_backers",
+        "_pybind_leaf_metadata",
+    )
 
     def elements(self):
         return self._pyangbind_elements
@@ -28,14 +270,292 @@ class PybindBase(object):
     def __str__(self):
         return str(self.elements())
 
-    def get(self, filter=False):
+    def _materialised(self, element_name):
+        """
+        Return whether the element named element_name has been created. Classes
+        generated with --lazy-children only create each element when it is
+        first accessed, until which point it holds its default value, and a
+        snapshot creates each element when it is first accessed.
+        """
+        element_slots = getattr(self, "_pybind_element_slots", None)
+        if element_slots is None:
+            return True
+        return hasattr(self, element_slots[element_name])
+
+    def _materialise(self, element_name):
+        """
+        Create the element named element_name. Where this object is a
+        snapshot, the element is copied from the object that it is a
+        snapshot of, otherwise it is created with its default value.
+        """
+        source = getattr(self, "_pybind_source", None)
+        while source is not None and not source._materialised(element_name):
+            source = getattr(source, "_pybind_source", None)
+        element = getattr(source, element_name) if source is not None else None
+        generated_by = getattr(element, "_pybind_generated_by", None)
+        if generated_by in ("container", "YANGListType"):
+            setattr(
+                self,
+                self._pybind_element_slots[element_name],
+                element._snapshot(self, path_helper=self._path_helper),
+            )
+        elif element is not None and element._changed():
+            self._copy_leaf(element_name, element)
+        else:
+            getattr(self, "_unset_%s" % element_name)()
+            # leaves whose changes have been cleared are not changed, but hold
+            # a value that differs from that of the newly created leaf.
+            if element is not None and element != getattr(self, element_name):
+                delattr(self, self._pybind_element_slots[element_name])
+                self._copy_leaf(element_name, element)
+
+    def _serialised_element(self, element_name):
+        """
+        Return the element named element_name, to be serialised, without
+        creating it where it has not been created. Where this object is a
+        snapshot, the element of the object that it is a snapshot of is
+        returned, otherwise an element with the default value is created but
+        not stored.
+        """
+        if self._materialised(element_name):
+            return getattr(self, element_name)
+        source = getattr(self, "_pybind_source", None)
+        while source is not None and not source._materialised(element_name):
+            source = getattr(source, "_pybind_source", None)
+        if source is not None:
+            return getattr(source, element_name)
+        getattr(self, "_unset_%s" % element_name)()
+        try:
+            return getattr(self, element_name)
+        finally:
+            delattr(self, self._pybind_element_slots[element_name])
+
+    def _copy_leaf(self, element_name, element):
+        # the setter validates and creates the copy of the leaf as per any
+        # other value, but the copy is not a change to this object, so its
+        # changed state is restored afterwards.
+        changed = getattr(self, "_mchanged", None)
+        present = getattr(self, "_cpresent", None)
+        journalled = element_name in self._changed_elements()
+        counter = self._modifications()
+        count = counter.value
+        if changed is not None:
+            # stop the change being propagated to the parent.
+            self._mchanged = True
+            if self._presence:
+                self._cpresent = True
+        # the value of the leaf is not changed by the copy, so the indexes of
+        # the list that this object is an entry of are not updated (which
+        # would read the leaf before the copy is stored).
+        yang_list = getattr(self, "_yang_list", None)
+        if yang_list is not None:
+            self._yang_list = None
+        value = element
+        if getattr(element, "_pybind_generated_by", None) == "TypedListType":
+            # a leaf-list is initialised from the values that it holds.
+            value = list(element)
+        try:
+            getattr(self, "_set_%s" % element_name)(value, load=True)
+            getattr(self, element_name)._mchanged = element._changed()
+        finally:
+            if yang_list is not None:
+                self._yang_list = yang_list
+            if changed is not None:
+                self._mchanged = changed
+                self._cpresent = present
+            if not journalled and self._pybind_dirty:
+                self._pybind_dirty.discard(element_name)
+            counter.value = count
+
+    def _snapshot(self, parent, path_helper=False, yang_list=None):
+        """
+        Return a copy of this object within parent, whose elements are
+        created from those of this object when they are first accessed.
+        """
+        if getattr(self, "_pybind_element_slots", None) is None:
+            raise TypeError(
+                "%s was generated by an earlier version of pyangbind, and does not support snapshots"
+                % type(self).__name__
+            )
+        snapshot = _copy_slots(self)
+        if parent is not None:
+            snapshot._parent = parent
+        snapshot._path_helper = path_helper
+        if yang_list is not None:
+            snapshot._yang_list = yang_list
+        metadata = getattr(self, "_pybind_metadata", None)
+        if metadata is not None:
+            snapshot._pybind_metadata = dict(metadata)
+        dirty = getattr(self, "_pybind_dirty", None)
+        if dirty:
+            snapshot._pybind_dirty = set(dirty)
+        snapshot._pybind_source = self
+
+        backers = getattr(self, "_pybind_backers", None)
+        if backers is None:
+            backers = self._pybind_backers = []
+        backers.append(weakref.ref(snapshot))
+        counter = self._modifications()
+        if counter.backers is None:
+            counter.backers = weakref.WeakSet()
+        counter.backers.add(snapshot)
+        return snapshot
+
+    def snapshot(self):
+        """
+        Return a copy of this object, which shares the elements of this object
+        until they are changed - either in the copy or in this object. Taking
+        a snapshot creates a single object, the elements of the snapshot are
+        created from those of this object when they are first accessed, or
+        before the corresponding element of this object is changed - such
+        that creating a list within the snapshot copies its keys, but not its
+        entries. The snapshot is not registered with a path helper.
+        """
+        parent = getattr(self, "_parent", None)
+        return self._snapshot(_DetachedParent(parent) if parent is not None else None)
+
+    def clone(self, path_helper=None):
+        """
+        Return a copy of this object that is registered with path_helper.
+        Where path_helper is not specified, and this object is registered
+        with a path helper, a new YANGPathHelper is used - otherwise, the
+        copy is a snapshot().
+        """
+        return _clone(self, path_helper)
+
+    def memory_report(self):
+        """
+        Return a summary of the memory used by this object and its
+        descendants, which can be serialised to JSON. The number of objects,
+        and the approximate number of bytes that they use (as reported by
+        sys.getsizeof), are given in total, for each schema path ("paths")
+        and for each pyangbind type ("types"). Objects that are shared -
+        such as the schema of each element, or the elements of a snapshot
+        that have not been copied - are counted at most once, and elements
+        that have not been created are not counted. Where this object is
+        registered with a path helper, the size of its index is reported as
+        "path_helper".
+        """
+        return _memory_report(self)
+
+    def _child_changing(self, child):
+        """
+        Called before child, an element of this object, is changed.
+        """
+        if self._modifications().backers:
+            self._before_change(safe_name(child._yang_name))
+
+    def _before_change(self, element_name):
+        """
+        Called before the element named element_name is changed, such that
+        each snapshot that shares it creates its copy of the element first.
+        """
+        if not self._modifications().backers:
+            return
+        # the snapshots of the ancestors of this object create their copies
+        # of the path to the element, from the root down.
+        path = [(self, element_name)]
+        node = self
+        parent = getattr(node, "_parent", None)
+        while parent is not None and hasattr(parent, "_before_change"):
+            path.append((parent, safe_name(node._yang_name)))
+            node = parent
+            parent = getattr(node, "_parent", None)
+        for node, name in reversed(path):
+            # snapshots of the list that the node is an entry of take their
+            # copy of the entry, rather than sharing it.
+            yang_list = getattr(node, "_yang_list", None)
+            if yang_list is not None:
+                yang_list._entry_changing(node)
+            backers = getattr(node, "_pybind_backers", None)
+            if not backers:
+                continue
+            live = []
+            for ref in backers:
+                backer = ref()
+                if backer is None:
+                    continue
+                live.append(ref)
+                if not backer._materialised(name):
+                    backer._materialise(name)
+            node._pybind_backers = live
+
+    def _mark_dirty(self, element_name):
+        """
+        Record that the element named element_name has changed.
+        """
+        dirty = getattr(self, "_pybind_dirty", None)
+        if dirty is None:
+            dirty = self._pybind_dirty = set()
+        dirty.add(element_name)
+
+    def _changed_elements(self):
+        """
+        Return the names of the elements of this object that have changed
+        since it was created, or since clear_changes() was last called. Only
+        these elements need to be visited to find the changes within the
+        tree.
+        """
+        return getattr(self, "_pybind_dirty", None) or frozenset()
+
+    def clear_changes(self):
+        """
+        Mark this object and each element within it as unchanged, such that
+        filtered serialisation includes only changes that are subsequently
+        made. The keys of list entries remain changed, since they identify
+        the entries.
+        """
+        remaining = set()
+        for element_name in list(self._changed_elements()):
+            self._before_change(element_name)
+            if _clear_element(getattr(self, element_name)):
+                remaining.add(element_name)
+        self._pybind_dirty = remaining or None
+        if getattr(self, "_mchanged", False):
+            self._mchanged = False
+
+    def _modifications(self):
+        """
+        Return the ModificationCounter of the tree that this object is within,
+        which is found from the parent of the object the first time that it
+        is required.
+        """
+        counter = getattr(self, "_pybind_modifications", None)
+        if counter is None:
+            parent_modifications = getattr(getattr(self, "_parent", None), "_modifications", None)
+            counter = parent_modifications() if parent_modifications is not None else ModificationCounter()
+            self._pybind_modifications = counter
+        return counter
+
+    def _modification_count(self):
+        """
+        Return the number of changes that have been made within the tree that
+        this object is within. The count only ever increases, such that a
+        caller can determine whether anything has changed since an earlier
+        value was retrieved.
+        """
+        return self._modifications().value
+
+    def get(self, filter=False, skip=None):
+        """
+        Return a dictionary of the values of the elements of this container,
+        keyed by their YANG names. Where filter is True, only the elements
+        that have changed are included. The elements that are skipped by
+        skip, a pyangbind.lib.serialise.SkipPaths, are omitted without being
+        visited.
+        """
+
         def error():
             return NameError, "element does not exist"
 
         d = {}
+        changed_elements = self._changed_elements() if filter is True else None
         # for each YANG element within this container.
         for element_name in self._pyangbind_elements:
-            element = getattr(self, element_name, error)
+            if changed_elements is not None and element_name not in changed_elements:
+                # an element that has not changed contains no changes
+                continue
+            element = self._serialised_element(element_name)
             if hasattr(element, "yang_name"):
                 # retrieve the YANG name method
                 yang_name = getattr(element, "yang_name", error)
@@ -43,10 +563,19 @@ class PybindBase(object):
             else:
                 element_id = element_name
 
+            element_skip = None
+            if skip is not None:
+                element_skip = skip.element(element_id)
+                if element_skip is not None and element_skip.skipped:
+                    continue
+
             if hasattr(element, "get"):
                 # this is a YANG container that has its own
                 # get method
-                d[element_id] = element.get(filter=filter)
+                if element_skip is None or getattr(element, "_pybind_generated_by", None) == "TypedListType":
+                    d[element_id] = element.get(filter=filter)
+                else:
+                    d[element_id] = element.get(filter=filter, skip=element_skip)
                 if filter is True:
                     # if the element hadn't changed but we were
                     # filtering unchanged elements, remove it
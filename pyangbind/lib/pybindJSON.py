@@ -19,13 +19,22 @@ limitations under the License.
 """
 from __future__ import unicode_literals
 
-import copy
 import json
 from collections import OrderedDict
 
 import six
 
-from pyangbind.lib.serialise import pybindIETFJSONEncoder, pybindJSONDecoder, pybindJSONEncoder, pybindJSONIOError
+from pyangbind.lib.serialise import (
+    JSONEncoding,
+    SkipPaths,
+    iterencode_json,
+    pybindIETFJSONEncoder,
+    pybindJSONDecoder,
+    pybindJSONEncoder,
+    pybindJSONIOError,
+    pybindJSONStreamDecoder,
+)
+from pyangbind.lib.yangtypes import safe_name
 
 
 def remove_path(tree, path):
@@ -45,6 +54,118 @@ def remove_path(tree, path):
     return tree
 
 
+def _skip_paths(obj, skip_subtrees):
+    """
+    Return the SkipPaths of the paths of skip_subtrees that are within obj,
+    or None where there are none.
+    """
+    if not isinstance(skip_subtrees, list):
+        raise AttributeError("the subtrees to be skipped should be a list")
+    if not skip_subtrees:
+        return None
+    return SkipPaths.compile(skip_subtrees, base=obj._path())
+
+
+def _compile_select(list_obj, select):
+    """
+    Return the criteria of select for the entries of list_obj, as a list of
+    tuples of the names of the elements of the path to each leaf, without
+    their module prefixes, and the string that its value must equal. Where
+    select compares each key of the list, a tuple of the values of the keys
+    is also returned, otherwise None.
+    """
+    criteria = []
+    for k, v in six.iteritems(select):
+        criteria.append((tuple(i.rpartition(":")[2] for i in k.split(".")), v))
+    keys = dict((safe_name(path[0]), v) for path, v in criteria if len(path) == 1)
+    if list_obj._key_names and all(kn in keys for kn in list_obj._key_names):
+        keyparts = tuple(keys[kn] for kn in list_obj._key_names)
+    else:
+        keyparts = None
+    return keyparts, [(path, six.text_type(v)) for path, v in criteria]
+
+
+def _selected_value(entry, path, filter, mode, with_defaults):
+    """
+    Return the value of the leaf at path within entry as it is serialised by
+    dumps(), or None where the leaf is not included in the serialisation.
+    """
+    element = entry
+    for name in path:
+        get_method = getattr(element, "_get_%s" % safe_name(name), None)
+        if get_method is None:
+            raise KeyError("requested non-existent key (%s)" % name)
+        element = get_method()
+    if hasattr(element, "get"):
+        # a container or leaf-list, which is compared as it is serialised.
+        return element.get(filter=filter)
+    if element._changed() or element._present() is True:
+        return element
+    if mode == "ietf":
+        if with_defaults is None:
+            return None if filter else element
+        return element if element._default == element else None
+    if filter is True:
+        return None
+    return element._default if element._default is not False and element._default else element
+
+
+def _select_entries(list_obj, select, filter, mode, with_defaults):
+    """
+    Return the key string and entry of each entry of list_obj that matches
+    select, and is included in the serialisation. Where select compares
+    each key of the list, the entry is retrieved by its key, rather than the
+    list being scanned.
+    """
+    keyparts, criteria = _compile_select(list_obj, select)
+    if keyparts is not None:
+        if len(keyparts) > 1:
+            keys = [list_obj._find_key(tuple(six.text_type(i) for i in keyparts))]
+        else:
+            keys = [list_obj._find_typed_key(keyparts[0])]
+        candidates = [(k, list_obj._members[k]) for k in keys if k is not None]
+    else:
+        candidates = six.iteritems(list_obj._members)
+
+    changed_only = JSONEncoding(filter, mode, with_defaults).changed_only
+    entries = []
+    for k, entry in candidates:
+        if list_obj._omits_entry(entry, changed_only):
+            continue
+        for path, value in criteria:
+            selected = _selected_value(entry, path, filter, mode, with_defaults)
+            if selected is None or not six.text_type(selected) == value:
+                break
+        else:
+            entries.append((list_obj._key_string(k), entry))
+    return entries
+
+
+def _selected_tree(list_obj, entries, filter, mode, with_defaults, skip):
+    """
+    Return the tree of the entries of list_obj, as per get() or, in IETF
+    mode, generate_element().
+    """
+    if mode == "ietf":
+        tree = []
+    else:
+        tree = OrderedDict()
+        tree._user_ordered = list_obj._members._user_ordered
+    for k, entry in entries:
+        entry_skip = None
+        if skip is not None:
+            entry_skip = skip.entry(k, entry)
+            if entry_skip is not None and entry_skip.skipped:
+                continue
+        if mode == "ietf":
+            tree.append(
+                pybindIETFJSONEncoder.generate_element(entry, flt=filter, with_defaults=with_defaults, skip=entry_skip)
+            )
+        else:
+            tree[k] = entry.get(filter=filter, skip=entry_skip)
+    return tree
+
+
 def loads(d, parent_pymod, yang_base, path_helper=None, extmethods=None, overwrite=False):
     # This check is not really logical - since one would expect 'd' to be
     # a string, given that this is loads. However, a previous issue meant
@@ -84,6 +205,45 @@ def load_ietf(fn, parent_pymod, yang_module, path_helper=None, extmethods=None,
     return loads_ietf(f, parent_pymod, yang_module, path_helper, extmethods=extmethods, overwrite=overwrite)
 
 
+def load_stream(
+    fn,
+    parent_pymod,
+    yang_module,
+    mode="default",
+    path_helper=None,
+    extmethods=None,
+    overwrite=False,
+    skip_unknown=False,
+    entry_callback=None,
+):
+    """
+    Load the JSON in fn, which is either the name of a file or a file-like
+    object, as per load() or load_ietf() where mode is "ietf". The document
+    is bound as it is read, rather than being decoded in full first, and
+    entry_callback is called with each list entry once it is loaded. Entries
+    for which it returns False are deleted.
+    """
+    if mode == "ietf":
+        load_json = pybindJSONStreamDecoder.load_ietf_json
+    else:
+        load_json = pybindJSONStreamDecoder.load_json
+    kwargs = dict(
+        path_helper=path_helper,
+        extmethods=extmethods,
+        overwrite=overwrite,
+        skip_unknown=skip_unknown,
+        entry_callback=entry_callback,
+    )
+    if hasattr(fn, "read"):
+        return load_json(fn, parent_pymod, yang_module, **kwargs)
+    try:
+        fp = open(fn, "rb")
+    except IOError as m:
+        raise pybindJSONIOError("could not open file to read: %s" % m)
+    with fp:
+        return load_json(fp, parent_pymod, yang_module, **kwargs)
+
+
 def dumps(obj, indent=4, filter=True, skip_subtrees=[], select=False, mode="default", with_defaults=None):
     def lookup_subdict(dictionary, key):
         if not isinstance(key, list):
@@ -101,33 +261,29 @@ def dumps(obj, indent=4, filter=True, skip_subtrees=[], select=False, mode="defa
         current = key.pop(0)
         return lookup_subdict(dictionary[current], key)
 
-    if not isinstance(skip_subtrees, list):
-        raise AttributeError("the subtrees to be skipped should be a list")
-    if mode == "ietf":
-        tree = pybindIETFJSONEncoder.generate_element(obj, flt=filter, with_defaults=with_defaults)
+    # skipped subtrees are pruned as the tree is built, rather than being
+    # removed from it afterwards.
+    skip = _skip_paths(obj, skip_subtrees)
+    # classes generated with --json-encoders build the encoded tree in a
+    # single pass. select compares the values of leaves before they are
+    # encoded, and so uses get().
+    to_json_obj = getattr(obj, "_to_json_obj", None) if not select else None
+    # the entries of a list that are selected are found before the list is
+    # serialised, such that only they are serialised.
+    select_entries = select and getattr(obj, "_pybind_generated_by", None) == "YANGListType"
+    if select_entries:
+        entries = _select_entries(obj, select, filter, mode, with_defaults)
+        tree = _selected_tree(obj, entries, filter, mode, with_defaults, skip)
+    elif to_json_obj is not None:
+        tree = to_json_obj(filter=filter, mode=mode, with_defaults=with_defaults, skip=skip)
+    elif mode == "ietf":
+        tree = pybindIETFJSONEncoder.generate_element(obj, flt=filter, with_defaults=with_defaults, skip=skip)
+    elif skip is not None:
+        tree = obj.get(filter=filter, skip=skip)
     else:
         tree = obj.get(filter=filter)
-    for p in skip_subtrees:
-        pp = p.split("/")[1:]
-        # Iterate through the skip path and the object's own path to determine
-        # whether they match, then skip the relevant subtrees.
-        match = True
-        trimmed_path = copy.deepcopy(pp)
-        for i, j in zip(obj._path(), pp):
-            # paths may have attributes in them, but the skip dictionary does
-            # not, so we ensure that the object's absolute path is attribute
-            # free,
-            if "[" in i:
-                i = i.split("[")[0]
-            if not i == j:
-                match = False
-                break
-            trimmed_path.pop(0)
 
-        if match and len(trimmed_path):
-            tree = remove_path(tree, trimmed_path)
-
-    if select:
+    if select and not select_entries:
         key_del = []
         for t in tree:
             keep = True
@@ -150,6 +306,9 @@ def dumps(obj, indent=4, filter=True, skip_subtrees=[], select=False, mode="defa
             for i in key_del:
                 tree.remove(i)
 
+    if to_json_obj is not None:
+        # the values in the tree are already encoded.
+        return json.dumps(tree, indent=indent)
     if mode == "ietf":
         cls = pybindIETFJSONEncoder
     else:
@@ -158,10 +317,39 @@ def dumps(obj, indent=4, filter=True, skip_subtrees=[], select=False, mode="defa
     return json.dumps(tree, cls=cls, indent=indent)
 
 
-def dump(obj, fn, indent=4, filter=True, skip_subtrees=[], mode="default"):
+def iterdump(obj, indent=4, filter=True, skip_subtrees=[], mode="default", with_defaults=None):
+    """
+    Yield the JSON text of obj, as per dumps(), in chunks. Each container and
+    list is serialised as it is reached, such that neither the tree nor the
+    full text is held in memory.
+    """
+    return iterencode_json(
+        obj,
+        indent=indent,
+        filter=filter,
+        mode=mode,
+        with_defaults=with_defaults,
+        skip=_skip_paths(obj, skip_subtrees),
+    )
+
+
+def dump(obj, fn, indent=4, filter=True, skip_subtrees=[], mode="default", with_defaults=None):
+    """
+    Write the JSON text of obj, as per dumps(), to fn, which is either the
+    name of a file or a file-like object. The text is written as it is
+    generated.
+    """
+    chunks = iterdump(
+        obj, indent=indent, filter=filter, skip_subtrees=skip_subtrees, mode=mode, with_defaults=with_defaults
+    )
+    if hasattr(fn, "write"):
+        for chunk in chunks:
+            fn.write(chunk)
+        return
     try:
         fh = open(fn, "w")
     except IOError as m:
         raise pybindJSONIOError("could not open file for writing: %s" % m)
-    fh.write(dumps(obj, indent=indent, filter=filter, skip_subtrees=skip_subtrees, mode=mode))
-    fh.close()
+    with fh:
+        for chunk in chunks:
+            fh.write(chunk)
@@ -25,7 +25,10 @@ serialise:
 """
 from __future__ import unicode_literals
 
+import codecs
+import itertools
 import json
+import re
 from collections import OrderedDict
 from decimal import Decimal
 import base64
@@ -34,7 +37,7 @@ import six
 from enum import IntEnum
 from lxml import objectify, etree
 
-from pyangbind.lib.yangtypes import YANGBool, safe_name
+from pyangbind.lib.yangtypes import YANGBool, _base_type_cache, safe_name
 
 
 if six.PY3:
@@ -67,6 +70,53 @@ class SerialisedTypedList(list):
     pass
 
 
+def _encode_text(serialiser, obj):
+    return six.text_type(obj)
+
+
+def _encode_int(serialiser, obj):
+    return int(obj)
+
+
+def _encode_bool(serialiser, obj):
+    return True if obj else False
+
+
+def _encode_binary(serialiser, obj):
+    return six.text_type(base64.b64encode(obj), "ascii")
+
+
+def _encode_reference(serialiser, obj):
+    return serialiser.default(obj._get())
+
+
+def _encode_container(serialiser, obj):
+    return serialiser.preprocess_element(obj.get())
+
+
+def _encode_list(serialiser, obj):
+    return [serialiser.default(i) for i in obj]
+
+
+def _encode_dict(serialiser, obj):
+    return {k: serialiser.default(v) for k, v in six.iteritems(obj)}
+
+
+def _or_native(encoder):
+    """
+    Return a function that encodes a value using encoder, or as its native
+    type where encoder returns None.
+    """
+
+    def encode(serialiser, obj):
+        value = encoder(serialiser, obj)
+        if value is None:
+            return serialiser._native_encoder(obj)(serialiser, obj)
+        return value
+
+    return encode
+
+
 class YangDataSerialiser(object):
     """
     This class encapsulates the logic to parse the object tree and generate appropriate
@@ -97,111 +147,159 @@ class YangDataSerialiser(object):
             nd = d
         return nd
 
+    def __init__(self):
+        # The function used to encode each class and YANG type of value that
+        # has been seen by this serialiser.
+        self._encoders = {}
+
     def default(self, obj):
+        key = (type(obj), getattr(obj, "_yang_type", None))
+        encoder = self._encoders.get(key, None)
+        if encoder is None:
+            # the function is cached against the class of the value when it is
+            # first seen, such that it is determined once for each class.
+            cache = _base_type_cache(key[0], "_pybind_serialisers")
+            encoder = cache.get((type(self), key[1]), None)
+            if encoder is None:
+                encoder = cache[(type(self), key[1])] = self._encoder(obj)
+            self._encoders[key] = encoder
+        return encoder(self, obj)
+
+    def _encoder(self, obj):
+        """
+        Return the function, taking the serialiser and a value, that encodes
+        values of the class and YANG type of obj.
+        """
+        cls = type(self)
         pybc = getattr(obj, "_pybind_generated_by", None)
-        elem_name = getattr(obj, "_yang_name", None)
         orig_yangt = getattr(obj, "_yang_type", None)
 
         # Expand lists
         if isinstance(obj, list):
-            return [self.default(i) for i in obj]
+            return _encode_list
         # Expand dictionaries
         elif isinstance(obj, dict):
-            return {k: self.default(v) for k, v in six.iteritems(obj)}
+            return _encode_dict
 
         if pybc is not None:
             # Special cases where the wrapper has an underlying class
             if pybc == "RestrictedClassType":
                 pybc = getattr(obj, "_restricted_class_base")[0]
             elif pybc == "TypedListType":
-                return self.yangt_typed_list(obj)
+                return cls.yangt_typed_list
 
         # Map based on YANG type
         if orig_yangt in ["leafref"]:
-            return self.default(obj._get()) if hasattr(obj, "_get") else six.text_type(obj)
+            return _encode_reference if hasattr(obj, "_get") else _encode_text
         elif orig_yangt in ["int64", "uint64"]:
-            return self.yangt_long(obj)
+            return cls.yangt_long
         elif orig_yangt in ["identityref"]:
-            try:
-                return self.yangt_identityref(obj)
-            except UnmappedItem:
-                pass
+            fallback = self._pyangbind_encoder(pybc, orig_yangt, obj)
+            if cls.yangt_identityref is YangDataSerialiser.yangt_identityref:
+                # identityrefs are not mapped.
+                return fallback
+            identityref = cls.yangt_identityref
+
+            def encode_identityref(serialiser, value):
+                try:
+                    return identityref(serialiser, value)
+                except UnmappedItem:
+                    return fallback(serialiser, value)
+
+            return encode_identityref
         elif orig_yangt in ["int8", "int16", "int32", "uint8", "uint16", "uint32"]:
-            return self.yangt_int(obj)
+            return cls.yangt_int
         elif orig_yangt in ["string", "enumeration"]:
-            return six.text_type(obj)
+            return _encode_text
         elif orig_yangt in ["binary"]:
-            return six.text_type(base64.b64encode(obj), "ascii")
+            return _encode_binary
         elif orig_yangt in ["decimal64"]:
-            return self.yangt_decimal(obj)
+            return cls.yangt_decimal
         elif orig_yangt in ["bool"]:
-            return True if obj else False
+            return _encode_bool
         elif orig_yangt in ["empty"]:
-            return self.yangt_empty(obj)
+            return cls.yangt_empty
         elif orig_yangt in ["container"]:
-            return self.preprocess_element(obj.get())
+            return _encode_container
 
+        return self._pyangbind_encoder(pybc, orig_yangt, obj)
+
+    def _pyangbind_encoder(self, pybc, orig_yangt, obj):
         # The value class is actually a pyangbind class, so map it
         pyc = getattr(obj, "_pybind_base_class", None) if pybc is None else pybc
         if pyc is not None:
-            val = self.map_pyangbind_type(pyc, orig_yangt, obj)
-            if val is not None:
-                return val
+            encoder = self._pyangbind_type_encoder(pyc, orig_yangt, obj)
+            if encoder is not None:
+                return encoder
+        return self._native_encoder(obj)
 
+    def _native_encoder(self, obj):
         # We are left with a native type
         if isinstance(obj, list):
-            nlist = []
-            for elem in obj:
-                nlist.append(self.default(elem))
-            return nlist
+            return _encode_list
         elif isinstance(obj, dict):
-            ndict = {}
-            for k, v in six.iteritems(obj):
-                ndict[k] = self.default(v)
-            return ndict
+            return _encode_dict
         elif isinstance(obj, six.string_types + (six.text_type,)):
-            return six.text_type(obj)
+            return _encode_text
         elif isinstance(obj, six.integer_types):
-            return int(obj)
+            return _encode_int
         elif isinstance(obj, (YANGBool, bool)):
-            return bool(obj)
+            return _encode_bool
         elif isinstance(obj, Decimal):
-            return self.yangt_decimal(obj)
+            return type(self).yangt_decimal
 
         raise AttributeError(
-            "Unmapped type: %s, %s, %s, %s, %s, %s" % (elem_name, orig_yangt, pybc, pyc, type(obj), obj)
+            "Unmapped type: %s, %s, %s, %s, %s"
+            % (
+                getattr(obj, "_yang_name", None),
+                getattr(obj, "_yang_type", None),
+                getattr(obj, "_pybind_generated_by", None),
+                type(obj),
+                obj,
+            )
         )
 
     def map_pyangbind_type(self, map_val, original_yang_type, obj):
+        encoder = self._pyangbind_type_encoder(map_val, original_yang_type, obj)
+        return encoder(self, obj) if encoder is not None else None
+
+    def _pyangbind_type_encoder(self, map_val, original_yang_type, obj):
+        """
+        Return the function that encodes obj as the pyangbind type map_val,
+        or None if map_val is not mapped. Where the function returns None,
+        the value is encoded as its native type instead.
+        """
+        cls = type(self)
         if map_val in ["pyangbind.lib.yangtypes.RestrictedClass", "RestrictedClassType"]:
             map_val = getattr(obj, "_restricted_class_base")[0]
 
         if map_val in ["pyangbind.lib.yangtypes.ReferencePathType", "ReferencePathType"]:
-            return self.default(obj._get())
+            return _or_native(_encode_reference)
         elif map_val in ["pyangbind.lib.yangtypes.RestrictedPrecisionDecimal", "RestrictedPrecisionDecimal"]:
             # NOTE: this doesn't seem like it needs to be a special case?
-            return self.yangt_decimal(obj)
+            return cls.yangt_decimal
         elif map_val in ["pyangbind.lib.yangtypes.YANGBinary", "YANGBinary"]:
-            return six.text_type(base64.b64encode(obj), "ascii")
+            return _encode_binary
         elif map_val in ["unicode"]:
-            return six.text_type(obj)
+            return _encode_text
         elif map_val in ["pyangbind.lib.yangtypes.YANGBool"]:
             if original_yang_type == "empty":
                 # NOTE: previously with IETF mode the code would fall-through if obj was falsey
-                return self.yangt_empty(obj)
+                return _or_native(cls.yangt_empty)
             else:
-                return bool(obj)
+                return _encode_bool
         elif map_val in ["pyangbind.lib.yangtypes.TypedList"]:
-            return self.yangt_typed_list(obj)
+            return cls.yangt_typed_list
         elif map_val in ["int", "long"]:
             int_size = getattr(obj, "_restricted_int_size", None)
-            return self.yangt_long(obj) if int_size == 64 else self.yangt_int(obj)
+            return cls.yangt_long if int_size == 64 else cls.yangt_int
         elif map_val in ["container"]:
-            return self.preprocess_element(obj.get())
+            return _encode_container
         elif map_val in ["decimal.Decimal"]:
-            return self.yangt_decimal(obj)
+            return cls.yangt_decimal
         elif map_val in ["YANGBits"]:
-            return six.text_type(obj)
+            return _encode_text
+        return None
 
     def yangt_int(self, obj):
         # for values that are 32-bits and under..
@@ -234,14 +332,11 @@ class IETFYangDataSerialiser(YangDataSerialiser):
         return six.text_type(obj)
 
     def yangt_identityref(self, obj):
-        try:
-            emod = obj._enumeration_dict[obj]["@module"]
-            if emod != obj._defining_module:
-                # if not already prefixed with the type namespace
-                if not obj.startswith("%s" % emod):
-                    return "%s:%s" % (emod, obj)
-        except KeyError:
-            pass
+        emod = obj._enumeration_dict.module_of(obj)
+        if emod is not None and emod[0] != obj._defining_module:
+            # if not already prefixed with the type namespace
+            if not obj.startswith(emod[0]):
+                return "%s:%s" % (emod[0], obj)
         return six.text_type(obj)
 
     def yangt_decimal(self, obj):
@@ -275,11 +370,16 @@ class _pybindJSONEncoderBase(json.JSONEncoder):
 
     serialiser_class = None
 
+    def __init__(self, *args, **kwargs):
+        super(_pybindJSONEncoderBase, self).__init__(*args, **kwargs)
+        # the serialiser is shared by each of the values that are encoded.
+        self.serialiser = self.serialiser_class()
+
     def encode(self, obj):
-        return json.JSONEncoder.encode(self, self.serialiser_class().preprocess_element(obj))
+        return json.JSONEncoder.encode(self, self.serialiser.preprocess_element(obj))
 
     def default(self, obj):
-        return self.serialiser_class().default(obj)
+        return self.serialiser.default(obj)
 
 
 class pybindJSONEncoder(_pybindJSONEncoderBase):
@@ -296,18 +396,21 @@ class pybindIETFJSONEncoder(_pybindJSONEncoderBase):
 
     @staticmethod
     def yname_ns_func(parent_namespace, element, yname):
-        if not element._namespace == parent_namespace:
+        schema = element._schema_node
+        if not schema.namespace == parent_namespace:
             # if the namespace is different, then precede with the module
             # name as per spec.
-            return "%s:%s" % (element._defining_module, yname)
+            return "%s:%s" % (schema.defining_module, yname)
         else:
             return yname
 
     @staticmethod
-    def generate_element(obj, parent_namespace=None, flt=False, with_defaults=None):
+    def generate_element(obj, parent_namespace=None, flt=False, with_defaults=None, skip=None):
         """Restructure pybind `obj` to IETF spec"""
         ietf_tree_json_func = make_generate_ietf_tree(pybindIETFJSONEncoder.yname_ns_func)
-        return ietf_tree_json_func(obj, parent_namespace=parent_namespace, flt=flt, with_defaults=with_defaults)
+        return ietf_tree_json_func(
+            obj, parent_namespace=parent_namespace, flt=flt, with_defaults=with_defaults, skip=skip
+        )
 
 
 class pybindIETFXMLEncoder(object):
@@ -367,12 +470,13 @@ class pybindIETFXMLEncoder(object):
     @staticmethod
     def yname_ns_func(parent_namespace, element, yname):
         # to keeps things simple, we augment every key with a complete namespace map
-        ns_map = [(None, element._namespace)]
-        if element._yang_type == "identityref" and element._changed():
+        schema = element._schema_node
+        ns_map = [(None, schema.namespace)]
+        if schema.yang_type == "identityref" and element._changed():
             # configured identityref (i.e. points to a valid identity)
-            ns_map.append(
-                (element._enumeration_dict[element]["@module"], element._enumeration_dict[element]["@namespace"])
-            )
+            emod = element._enumeration_dict.module_of(element)
+            if emod is not None:
+                ns_map.append(emod)
         return yname, tuple(ns_map)
 
     @classmethod
@@ -390,6 +494,200 @@ class pybindIETFXMLEncoder(object):
         return etree.tostring(doc, pretty_print=pretty_print).decode("utf8")
 
 
+# a predicate of a path, of the form [name=value], where the value may be quoted.
+_PATH_PREDICATE = re.compile(r"""\[\s*([^=\s\]]+)\s*=\s*(?:'([^']*)'|"([^"]*)"|([^\]]*?))\s*\]""")
+
+
+def _split_path(path):
+    """
+    Split path at each / that is not within a predicate.
+    """
+    segments, current, quote, depth = [], [], None, 0
+    for char in path:
+        if quote is not None:
+            if char == quote:
+                quote = None
+        elif char in "'\"" and depth:
+            quote = char
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == "/" and not depth:
+            segments.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    segments.append("".join(current))
+    return segments
+
+
+def _parse_path_segment(segment):
+    """
+    Return the name of the path segment, without any module prefix, and a
+    tuple of the (leaf, value) pairs of its predicates, where leaf is the
+    safe name of the leaf.
+    """
+    name, bracket, predicates = segment.partition("[")
+    name = name.strip().rpartition(":")[2]
+    criteria = []
+    predicates = bracket + predicates
+    position = 0
+    while position < len(predicates):
+        match = _PATH_PREDICATE.match(predicates, position)
+        if match is None:
+            raise ValueError("invalid predicate in path segment %s" % segment)
+        leaf, single, double, bare = match.groups()
+        value = single if single is not None else double if double is not None else bare
+        criteria.append((safe_name(leaf.rpartition(":")[2]), value))
+        position = match.end()
+    return name, tuple(criteria)
+
+
+class _SkipNode(object):
+    """
+    A node of the trie of skipped paths. names maps the name of each element
+    (or the key string of each list entry) to the node that it leads to, and
+    wildcard is the node that any name leads to. predicates is a list of the
+    (criteria, node) pairs of the entries of the list that this node names.
+    """
+
+    __slots__ = ("names", "wildcard", "predicates", "skipped")
+
+    def __init__(self):
+        self.names = {}
+        self.wildcard = None
+        self.predicates = []
+        self.skipped = False
+
+    def child(self, name):
+        if name == "*":
+            if self.wildcard is None:
+                self.wildcard = _SkipNode()
+            return self.wildcard
+        node = self.names.get(name)
+        if node is None:
+            node = self.names[name] = _SkipNode()
+        return node
+
+    def entry_child(self, criteria):
+        for entry_criteria, node in self.predicates:
+            if entry_criteria == criteria:
+                return node
+        node = _SkipNode()
+        self.predicates.append((criteria, node))
+        return node
+
+
+class SkipPaths(object):
+    """
+    The paths whose subtrees are omitted when an object is serialised,
+    compiled into a trie. A serialiser steps through the trie as it descends
+    through the object - with element() for each element of a container, and
+    entry() for each entry of a list - and does not visit an element or entry
+    that is skipped. An instance is the set of nodes of the trie that match
+    the position in the object, or None where no skipped paths remain.
+
+    Each segment of a path is the YANG name of an element, optionally with a
+    module prefix, the key string of a list entry, or * which matches any
+    element or entry. An element that names a list may be followed by
+    predicates ([leaf=value]) that match its entries by the values of their
+    leaves - e.g., /interfaces/interface[name='eth0']/state.
+    """
+
+    __slots__ = ("nodes", "skipped", "_elements")
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.skipped = any(node.skipped for node in nodes)
+        self._elements = {}
+
+    @classmethod
+    def compile(cls, paths, base=()):
+        """
+        Return the SkipPaths of paths, which are absolute, that are within
+        the object whose path is base - as per the _path() method of the
+        object - or None where there are none. Paths that contain the object
+        itself are ignored.
+        """
+        base = [_parse_path_segment(i) for i in base]
+        root = _SkipNode()
+        for path in paths:
+            segments = [_parse_path_segment(i) for i in _split_path(path)[1:]]
+            if len(segments) <= len(base):
+                continue
+            for (name, criteria), (base_name, base_criteria) in zip(segments, base):
+                if name not in ("*", base_name) or (criteria and base_criteria and criteria != base_criteria):
+                    break
+            else:
+                node = root
+                for name, criteria in segments[len(base) :]:
+                    node = node.child(name)
+                    if criteria:
+                        node = node.entry_child(criteria)
+                node.skipped = True
+        if not root.names and root.wildcard is None:
+            return None
+        return cls((root,))
+
+    def element(self, name):
+        """
+        Return the SkipPaths within the element named name, which may have a
+        module prefix, or None where there are none.
+        """
+        try:
+            return self._elements[name]
+        except KeyError:
+            pass
+        local_name = name.rpartition(":")[2]
+        nodes = []
+        for node in self.nodes:
+            child = node.names.get(local_name)
+            if child is not None:
+                nodes.append(child)
+            if node.wildcard is not None:
+                nodes.append(node.wildcard)
+        skip = self._elements[name] = SkipPaths(tuple(nodes)) if nodes else None
+        return skip
+
+    def entry(self, key, entry):
+        """
+        Return the SkipPaths within entry, a member of the list that this
+        instance is within whose key string is key, or None where there are
+        none.
+        """
+        key = six.text_type(key)
+        nodes = []
+        for node in self.nodes:
+            child = node.names.get(key)
+            if child is not None:
+                nodes.append(child)
+            if node.wildcard is not None:
+                nodes.append(node.wildcard)
+            for criteria, child in node.predicates:
+                if all(
+                    six.text_type(getattr(entry, "_get_%s" % leaf, lambda: None)()) == value
+                    for leaf, value in criteria
+                ):
+                    nodes.append(child)
+        return SkipPaths(tuple(nodes)) if nodes else None
+
+
+def _unskipped_entries(list_obj, skip):
+    """
+    Yield the key string and entry of each entry of the list list_obj that
+    is not skipped by skip, and the SkipPaths within the entry.
+    """
+    for k, entry in six.iteritems(list_obj._members):
+        k = list_obj._key_string(k)
+        entry_skip = None
+        if skip is not None:
+            entry_skip = skip.entry(k, entry)
+            if entry_skip is not None and entry_skip.skipped:
+                continue
+        yield k, entry, entry_skip
+
+
 def make_generate_ietf_tree(yname_ns_func):
     """
     Convert a pyangbind class to a format which encodes to the IETF JSON
@@ -404,12 +702,21 @@ def make_generate_ietf_tree(yname_ns_func):
     The implementation is based on draft-ietf-netmod-yang-json-07.
 
     Resulting namespaced key names can be customised via *yname_func*
+
+    The elements and list entries that are skipped by *skip*, a SkipPaths,
+    are omitted without being visited.
     """
 
-    def generate_ietf_tree(obj, parent_namespace=None, flt=False, with_defaults=None):
+    def generate_ietf_tree(obj, parent_namespace=None, flt=False, with_defaults=None, skip=None):
+        # whether only the elements that have changed are serialised.
+        changed_only = bool(flt) and with_defaults is None
         generated_by = getattr(obj, "_pybind_generated_by", None)
         if generated_by == "YANGListType":
-            return [generate_ietf_tree(i, flt=flt, with_defaults=with_defaults) for i in obj.itervalues()]
+            return [
+                generate_ietf_tree(i, flt=flt, with_defaults=with_defaults, skip=entry_skip)
+                for _, i, entry_skip in _unskipped_entries(obj, skip)
+                if not obj._omits_entry(i, changed_only)
+            ]
         elif generated_by is None:
             # This is an element that is not specifically generated by
             # pyangbind, so we simply serialise it how we would if it
@@ -417,25 +724,39 @@ def make_generate_ietf_tree(yname_ns_func):
             return obj
 
         d = {}
+        changed_elements = obj._changed_elements() if changed_only else None
         for element_name in obj._pyangbind_elements:
-            element = getattr(obj, element_name, None)
+            if changed_elements is not None and element_name not in changed_elements:
+                continue
+            element = obj._serialised_element(element_name)
             yang_name = getattr(element, "yang_name", None)
             yname = yang_name() if yang_name is not None else element_name
 
+            skipped, element_skip = _skip_element(skip, yname)
+            if skipped:
+                continue
+
             # adjust yname, if necessary, given the current namespace context
             yname = yname_ns_func(parent_namespace, element, yname)
 
             generated_by = getattr(element, "_pybind_generated_by", None)
             if generated_by == "container":
                 d[yname] = generate_ietf_tree(
-                    element, parent_namespace=element._namespace, flt=flt, with_defaults=with_defaults
+                    element,
+                    parent_namespace=element._namespace,
+                    flt=flt,
+                    with_defaults=with_defaults,
+                    skip=element_skip,
                 )
                 if not len(d[yname]):
                     del d[yname]
             elif generated_by == "YANGListType":
                 d[yname] = [
-                    generate_ietf_tree(i, parent_namespace=element._namespace, flt=flt, with_defaults=with_defaults)
-                    for i in element.itervalues()
+                    generate_ietf_tree(
+                        i, parent_namespace=element._namespace, flt=flt, with_defaults=with_defaults, skip=entry_skip
+                    )
+                    for _, i, entry_skip in _unskipped_entries(element, element_skip)
+                    if not element._omits_entry(i, changed_only)
                 ]
                 if not len(d[yname]):
                     del d[yname]
@@ -453,6 +774,373 @@ def make_generate_ietf_tree(yname_ns_func):
     return generate_ietf_tree
 
 
+class JSONEncoding(object):
+    """
+    The options of a serialisation to JSON that is made by the _to_json_obj()
+    methods of classes generated with --json-encoders, and the serialiser
+    that is used to encode each value. mode, filter and with_defaults are as
+    per pybindJSON.dumps().
+    """
+
+    __slots__ = ("filter", "ietf", "with_defaults", "serialiser", "changed_only")
+
+    def __init__(self, filter=False, mode="default", with_defaults=None):
+        self.filter = filter
+        self.ietf = mode == "ietf"
+        self.with_defaults = with_defaults
+        self.serialiser = IETFYangDataSerialiser() if self.ietf else YangDataSerialiser()
+        # whether only the elements that have changed are serialised.
+        self.changed_only = (bool(filter) and with_defaults is None) if self.ietf else filter is True
+
+
+def _json_obj(obj, encoding, namespace, skip=None):
+    """
+    Return the JSON representation of the container obj, which is generated
+    by its _to_json_obj() method where it has one. The subtrees that are
+    skipped by skip, a SkipPaths, are omitted.
+    """
+    to_json_obj = getattr(obj, "_to_json_obj", None)
+    if to_json_obj is not None:
+        return to_json_obj(namespace=namespace, encoding=encoding, skip=skip)
+    if encoding.ietf:
+        tree = make_generate_ietf_tree(pybindIETFJSONEncoder.yname_ns_func)(
+            obj, parent_namespace=namespace, flt=encoding.filter, with_defaults=encoding.with_defaults, skip=skip
+        )
+    else:
+        tree = obj.get(filter=encoding.filter, skip=skip)
+    return encoding.serialiser.preprocess_element(tree)
+
+
+# returned in place of the value of an element that is not included in a
+# serialisation.
+_OMITTED = object()
+
+
+def _json_leaf_value(element, encoding):
+    """
+    Return the encoded value of the leaf element, or _OMITTED if it is not
+    included in the serialisation described by encoding.
+    """
+    if encoding.ietf:
+        if encoding.with_defaults is None:
+            if encoding.filter and not element._changed():
+                return _OMITTED
+        elif encoding.with_defaults == WithDefaults.IF_SET:
+            if not element._changed() and not element._default == element:
+                return _OMITTED
+        else:
+            return _OMITTED
+    else:
+        changed = element._changed()
+        if encoding.filter is False and not changed and not element._present() is True:
+            if element._default is not False and element._default:
+                element = element._default
+        elif not changed and not element._present() is True:
+            return _OMITTED
+    return encoding.serialiser.default(element)
+
+
+def _json_leaf_list_value(element, encoding):
+    """
+    Return the encoded values of the leaf-list element, or _OMITTED if they
+    are not included in the serialisation described by encoding.
+    """
+    if encoding.ietf:
+        return _json_leaf_value(element, encoding)
+    values = element.get(filter=encoding.filter)
+    if encoding.filter is True and not len(values):
+        return _OMITTED
+    return encoding.serialiser.default(values)
+
+
+def _json_keeps_empty(element, encoding):
+    """
+    Return whether the container or list element is included in the
+    serialisation described by encoding when it has no contents.
+    """
+    if encoding.ietf:
+        return False
+    # the module class that is the root of the tree has no presence.
+    return encoding.filter is not True or bool(getattr(element, "_presence", False) and element._present())
+
+
+def _json_list_entries(element, encoding, skip):
+    """
+    Yield the key string and entry of each entry of the list element that
+    is included in the serialisation described by encoding, and is not
+    skipped by skip, with the SkipPaths within the entry.
+    """
+    for k, entry, entry_skip in _unskipped_entries(element, skip):
+        if element._omits_entry(entry, encoding.changed_only):
+            continue
+        yield k, entry, entry_skip
+
+
+def _skip_element(skip, yname):
+    """
+    Return whether the element named yname is skipped by skip, and the
+    SkipPaths within it.
+    """
+    if skip is None:
+        return False, None
+    element_skip = skip.element(yname)
+    return element_skip is not None and element_skip.skipped, element_skip
+
+
+def encode_json_leaf(d, yname, element, encoding, skip=None):
+    """
+    Add the encoded value of the leaf element to d, under yname, where it is
+    included in the serialisation described by encoding. skip is the
+    SkipPaths within the container of the element.
+    """
+    if skip is not None and _skip_element(skip, yname)[0]:
+        return
+    value = _json_leaf_value(element, encoding)
+    if value is not _OMITTED:
+        d[yname] = value
+
+
+def encode_json_leaf_list(d, yname, element, encoding, skip=None):
+    """
+    Add the encoded values of the leaf-list element to d, under yname, where
+    it is included in the serialisation described by encoding.
+    """
+    if skip is not None and _skip_element(skip, yname)[0]:
+        return
+    value = _json_leaf_list_value(element, encoding)
+    if value is not _OMITTED:
+        d[yname] = value
+
+
+def encode_json_container(d, yname, element, encoding, namespace, skip=None):
+    """
+    Add the JSON representation of the container element, whose namespace is
+    namespace, to d under yname.
+    """
+    skipped, skip = _skip_element(skip, yname)
+    if skipped:
+        return
+    value = _json_obj(element, encoding, namespace, skip)
+    if value or _json_keeps_empty(element, encoding):
+        d[yname] = value
+
+
+def encode_json_list(d, yname, element, encoding, namespace, skip=None):
+    """
+    Add the JSON representation of the entries of the list element, whose
+    namespace is namespace, to d under yname.
+    """
+    skipped, skip = _skip_element(skip, yname)
+    if skipped:
+        return
+    if encoding.ietf:
+        entries = [
+            _json_obj(entry, encoding, namespace, entry_skip)
+            for _, entry, entry_skip in _json_list_entries(element, encoding, skip)
+        ]
+    else:
+        entries = {}
+        user_ordered = element._members._user_ordered
+        for k, entry, entry_skip in _json_list_entries(element, encoding, skip):
+            value = _json_obj(entry, encoding, namespace, entry_skip)
+            if user_ordered:
+                value["__yang_order"] = len(entries)
+            entries[k] = value
+    if entries or _json_keeps_empty(element, encoding):
+        d[yname] = entries
+
+
+# encode the names and scalar values of a streamed serialisation as per
+# json.dumps().
+_scalar_encoder = json.JSONEncoder()
+_encode_json_string = json.encoder.encode_basestring_ascii
+
+
+class _JSONStreamValue(object):
+    """
+    A JSON object or array whose members are yielded by an iterator as it is
+    written, such that they are not held in memory at once. The members of
+    an object are (name, value) tuples.
+    """
+
+    __slots__ = ("members", "is_object")
+
+    def __init__(self, members, is_object):
+        self.members = members
+        self.is_object = is_object
+
+
+def _peek(iterator):
+    """
+    Return an iterator over the same items as iterator, or None if it has no
+    items.
+    """
+    for first in iterator:
+        return itertools.chain((first,), iterator)
+    return None
+
+
+def _stream_container_members(obj, encoding, namespace, skip):
+    """
+    Yield the name and value of each element of the container obj that is
+    included in the serialisation described by encoding. Containers and
+    lists are yielded as _JSONStreamValue, and are not yielded when they
+    are omitted as empty. The elements that are skipped by skip, a
+    SkipPaths, are omitted.
+    """
+    changed = obj._changed_elements() if encoding.changed_only else None
+    for element_name in obj._pyangbind_elements:
+        if changed is not None and element_name not in changed:
+            continue
+        element = obj._serialised_element(element_name)
+        yang_name = getattr(element, "yang_name", None)
+        yname = yang_name() if yang_name is not None else element_name
+        skipped, element_skip = _skip_element(skip, yname)
+        if skipped:
+            continue
+        if encoding.ietf:
+            yname = pybindIETFJSONEncoder.yname_ns_func(namespace, element, yname)
+
+        # elements are distinguished as per generate_ietf_tree() in IETF
+        # mode, and as per PybindBase.get() otherwise.
+        generated_by = getattr(element, "_pybind_generated_by", None)
+        if generated_by == "YANGListType":
+            value = _stream_list(element, encoding, element._namespace, element_skip)
+        elif encoding.ietf:
+            if generated_by == "container":
+                value = _stream_container(element, encoding, element._namespace, element_skip)
+            else:
+                value = _json_leaf_value(element, encoding)
+        elif not hasattr(element, "get"):
+            value = _json_leaf_value(element, encoding)
+        elif generated_by == "TypedListType":
+            value = _json_leaf_list_value(element, encoding)
+        else:
+            value = _stream_container(element, encoding, element._namespace, element_skip)
+        if value is not _OMITTED:
+            yield yname, value
+
+
+def _stream_container(obj, encoding, namespace, skip):
+    """
+    Return the JSON representation of the container obj as a _JSONStreamValue,
+    or _OMITTED where it is empty and is not included in the serialisation.
+    """
+    members = _peek(_stream_container_members(obj, encoding, namespace, skip))
+    if members is None:
+        if not _json_keeps_empty(obj, encoding):
+            return _OMITTED
+        members = iter(())
+    return _JSONStreamValue(members, True)
+
+
+def _stream_list_entries(obj, encoding, namespace, skip):
+    """
+    Yield the entries of the list obj that are included in the serialisation,
+    as a _JSONStreamValue in IETF mode, and as the key string of the entry
+    and a _JSONStreamValue otherwise.
+    """
+    user_ordered = not encoding.ietf and obj._members._user_ordered
+    for index, (k, entry, entry_skip) in enumerate(_json_list_entries(obj, encoding, skip)):
+        members = _stream_container_members(entry, encoding, namespace, entry_skip)
+        if encoding.ietf:
+            yield _JSONStreamValue(members, True)
+            continue
+        if user_ordered:
+            members = itertools.chain(members, (("__yang_order", index),))
+        yield k, _JSONStreamValue(members, True)
+
+
+def _stream_list(obj, encoding, namespace, skip):
+    """
+    Return the JSON representation of the entries of the list obj as a
+    _JSONStreamValue, or _OMITTED where it has no entries and is not included
+    in the serialisation.
+    """
+    entries = _peek(_stream_list_entries(obj, encoding, namespace, skip))
+    if entries is None:
+        if not _json_keeps_empty(obj, encoding):
+            return _OMITTED
+        entries = iter(())
+    return _JSONStreamValue(entries, not encoding.ietf)
+
+
+def _iter_json_text(value, indent, newline):
+    """
+    Yield the JSON text of value, formatted as per json.dumps() with indent.
+    newline is the text that starts a new line at the depth of value.
+    """
+    if isinstance(value, _JSONStreamValue):
+        members, is_object = value.members, value.is_object
+    elif isinstance(value, dict):
+        members, is_object = six.iteritems(value), True
+    elif isinstance(value, (list, tuple)):
+        members, is_object = iter(value), False
+    else:
+        yield _scalar_encoder.encode(value)
+        return
+
+    inner = newline + indent if indent is not None else ""
+    separator = "," if indent is not None else ", "
+    opened = False
+    for member in members:
+        if opened:
+            yield separator
+        else:
+            yield "{" if is_object else "["
+            opened = True
+        yield inner
+        if is_object:
+            name, member = member
+            if not isinstance(name, six.string_types):
+                # keys of lists may be integers, which are named by their
+                # JSON encoding.
+                name = _scalar_encoder.encode(name)
+            yield _encode_json_string(name) + ": "
+        if isinstance(member, (_JSONStreamValue, dict, list, tuple)):
+            for text in _iter_json_text(member, indent, inner):
+                yield text
+        else:
+            yield _scalar_encoder.encode(member)
+    if not opened:
+        yield "{}" if is_object else "[]"
+        return
+    if indent is not None:
+        yield newline
+    yield "}" if is_object else "]"
+
+
+def iterencode_json(obj, indent=None, filter=True, mode="default", with_defaults=None, skip=None, chunk_size=65536):
+    """
+    Yield the JSON text of obj, which is identical to that of
+    pybindJSON.dumps() with the same arguments, in chunks of roughly
+    chunk_size characters. The containers and lists of obj are serialised
+    as they are reached, such that the memory that is used depends on the
+    depth of obj rather than its size.
+
+    The subtrees that are skipped by skip, a SkipPaths, are omitted.
+    """
+    encoding = JSONEncoding(filter, mode, with_defaults)
+    if isinstance(indent, six.integer_types):
+        indent = " " * indent
+    if getattr(obj, "_pybind_generated_by", None) == "YANGListType":
+        value = _stream_list(obj, encoding, None, skip)
+    else:
+        value = _stream_container(obj, encoding, None, skip)
+    if value is _OMITTED:
+        value = [] if encoding.ietf and getattr(obj, "_pybind_generated_by", None) == "YANGListType" else {}
+
+    chunk, size = [], 0
+    for text in _iter_json_text(value, indent, "\n"):
+        chunk.append(text)
+        size += len(text)
+        if size >= chunk_size:
+            yield "".join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield "".join(chunk)
+
+
 class pybindIETFXMLDecoder(object):
     """
     IETF XML decoder for pybind object tree deserialisation.
@@ -519,11 +1207,11 @@ class pybindIETFXMLDecoder(object):
                 for pkv, ykv in zip(chobj._keyval.split(" "), chobj._yang_keys.split(" ")):
                     add_kwargs[pkv] = child[ykv]
                     key_parts.append(str(child[ykv]))
-                key_str = " ".join(map(str, key_parts))
-                if key_str not in chobj:
+                entry_key = tuple(key_parts) if len(key_parts) > 1 else key_parts[0]
+                if entry_key not in chobj:
                     nobj = chobj.add(**add_kwargs)
                 else:
-                    nobj = chobj[key_str]
+                    nobj = chobj[entry_key]
 
                 # now we have created the nested object element, we add other members
                 pybindIETFXMLDecoder.load_xml(
@@ -571,28 +1259,89 @@ class pybindIETFXMLDecoder(object):
 
 
 class pybindJSONDecoder(object):
+    @staticmethod
+    def _root_object(parent, yang_base, path_helper, extmethods):
+        """
+        Return the instance of the class yang_base of the module parent that
+        JSON is loaded into, which is the existing instance where path_helper
+        has one.
+        """
+        # we need to find the class to create, as one has not been supplied.
+        base_mod_cls = getattr(parent, safe_name(yang_base))
+        tmp = base_mod_cls(path_helper=False)
+
+        if path_helper is not None:
+            # check that this path doesn't already exist in the
+            # tree, otherwise we create a duplicate.
+            existing_objs = path_helper.get(tmp._path())
+            if len(existing_objs) == 0:
+                return base_mod_cls(path_helper=path_helper, extmethods=extmethods)
+            elif len(existing_objs) == 1:
+                return existing_objs[0]
+            else:
+                raise pybindLoadUpdateError("update was attempted to a node that " + "was not unique")
+        # in this case, we cannot check for an existing object
+        return base_mod_cls(path_helper=path_helper, extmethods=extmethods)
+
+    @staticmethod
+    def _unset_elements(obj):
+        """
+        Unset each element of the container obj, such that it is overwritten
+        by the JSON that is loaded into it.
+        """
+        for elem in obj._pyangbind_elements:
+            if not obj._materialised(elem):
+                continue
+            obj._before_change(elem)
+            unsetchildelem = getattr(obj, "_unset_%s" % elem)
+            unsetchildelem()
+
+    @staticmethod
+    def _list_entry_key(list_obj, child_key, entry):
+        """
+        Return the key of the entry of the YANG list list_obj that is loaded
+        from entry, the object under child_key (the values of its keys
+        separated by spaces) in the JSON. For a list with multiple keys, the
+        key is taken from the key leaves of entry where they are present,
+        since the values of the keys may themselves contain spaces.
+        """
+        if len(list_obj._key_names) > 1 and isinstance(entry, dict):
+            yang_keys = list_obj._yang_keys.split(" ")
+            if all(yang_key in entry for yang_key in yang_keys):
+                return tuple(entry[yang_key] for yang_key in yang_keys)
+        return child_key
+
+    @staticmethod
+    def _ietf_list_entry(list_obj, elem):
+        """
+        Return the key and the entry of the YANG list list_obj that has the
+        keys of the IETF JSON object elem, which is added where it does not
+        exist.
+        """
+        if list_obj._keyval is False:
+            # Keyless list, generate a key
+            k = list_obj.add()
+            return k, list_obj[k]
+        elif " " in list_obj._keyval:
+            kwargs = {}
+            for pkv, ykv in zip(list_obj._keyval.split(" "), list_obj._yang_keys.split(" ")):
+                kwargs[pkv] = elem[ykv]
+            entry_key = tuple(kwargs[pkv] for pkv in list_obj._key_names)
+            if entry_key not in list_obj:
+                return entry_key, list_obj.add(**kwargs)
+            return entry_key, list_obj[entry_key]
+        else:
+            k = elem[list_obj._yang_keys]
+            if k not in list_obj:
+                return k, list_obj.add(k)
+            return k, list_obj[k]
+
     @staticmethod
     def load_json(
         d, parent, yang_base, obj=None, path_helper=None, extmethods=None, overwrite=False, skip_unknown=False
     ):
         if obj is None:
-            # we need to find the class to create, as one has not been supplied.
-            base_mod_cls = getattr(parent, safe_name(yang_base))
-            tmp = base_mod_cls(path_helper=False)
-
-            if path_helper is not None:
-                # check that this path doesn't already exist in the
-                # tree, otherwise we create a duplicate.
-                existing_objs = path_helper.get(tmp._path())
-                if len(existing_objs) == 0:
-                    obj = base_mod_cls(path_helper=path_helper, extmethods=extmethods)
-                elif len(existing_objs) == 1:
-                    obj = existing_objs[0]
-                else:
-                    raise pybindLoadUpdateError("update was attempted to a node that " + "was not unique")
-            else:
-                # in this case, we cannot check for an existing object
-                obj = base_mod_cls(path_helper=path_helper, extmethods=extmethods)
+            obj = pybindJSONDecoder._root_object(parent, yang_base, path_helper, extmethods)
 
         # Handle the case where we are supplied with a scalar value rather than
         # a list
@@ -618,9 +1367,7 @@ class pybindJSONDecoder(object):
             pybind_attr = getattr(chobj, "_pybind_generated_by", None)
             if pybind_attr in ["container"]:
                 if overwrite:
-                    for elem in chobj._pyangbind_elements:
-                        unsetchildelem = getattr(chobj, "_unset_%s" % elem)
-                        unsetchildelem()
+                    pybindJSONDecoder._unset_elements(chobj)
                 pybindJSONDecoder.load_json(
                     d[key], chobj, yang_base, obj=chobj, path_helper=path_helper, skip_unknown=skip_unknown
                 )
@@ -656,9 +1403,10 @@ class pybindJSONDecoder(object):
                     key_order = d[key].keys()
 
                 for child_key in key_order:
-                    if child_key not in chobj:
-                        chobj.add(child_key)
-                    parent = chobj[child_key]
+                    entry_key = pybindJSONDecoder._list_entry_key(chobj, child_key, d[key][child_key])
+                    if entry_key not in chobj:
+                        chobj.add(entry_key)
+                    parent = chobj[entry_key]
                     pybindJSONDecoder.load_json(
                         d[key][child_key],
                         parent,
@@ -669,15 +1417,15 @@ class pybindJSONDecoder(object):
                     )
                     set_via_stdmethod = False
                 if overwrite:
-                    for child_key in chobj:
-                        if child_key not in d[key]:
+                    for child_key in list(chobj):
+                        if chobj._key_string(child_key) not in d[key]:
                             chobj.delete(child_key)
             elif pybind_attr in ["TypedListType"]:
                 if not overwrite:
                     list_obj = getattr(obj, "_get_%s" % safe_name(key))()
-                    for item in d[key]:
-                        if item not in list_obj:
-                            list_obj.append(item)
+                    new_items = [item for item in d[key] if item not in list_obj]
+                    if new_items:
+                        list_obj.extend(new_items)
                     list_copy = []
                     for elem in list_obj:
                         list_copy.append(elem)
@@ -720,23 +1468,7 @@ class pybindJSONDecoder(object):
         d, parent, yang_base, obj=None, path_helper=None, extmethods=None, overwrite=False, skip_unknown=False
     ):
         if obj is None:
-            # we need to find the class to create, as one has not been supplied.
-            base_mod_cls = getattr(parent, safe_name(yang_base))
-            tmp = base_mod_cls(path_helper=False)
-
-            if path_helper is not None:
-                # check that this path doesn't already exist in the
-                # tree, otherwise we create a duplicate.
-                existing_objs = path_helper.get(tmp._path())
-                if len(existing_objs) == 0:
-                    obj = base_mod_cls(path_helper=path_helper, extmethods=extmethods)
-                elif len(existing_objs) == 1:
-                    obj = existing_objs[0]
-                else:
-                    raise pybindLoadUpdateError("update was attempted to a node that " + "was not unique")
-            else:
-                # in this case, we cannot check for an existing object
-                obj = base_mod_cls(path_helper=path_helper, extmethods=extmethods)
+            obj = pybindJSONDecoder._root_object(parent, yang_base, path_helper, extmethods)
 
         # Handle the case where we are supplied with a scalar value rather than
         # a list
@@ -802,27 +1534,7 @@ class pybindJSONDecoder(object):
                             for i in existing_keys:
                                 this_attr.delete(i)
                         #  this handles YANGLists
-                        if this_attr._keyval is False:
-                            # Keyless list, generate a key
-                            k = this_attr.add()
-                            nobj = this_attr[k]
-                        elif " " in this_attr._keyval:
-                            keystr = ""
-                            kwargs = {}
-                            for pkv, ykv in zip(this_attr._keyval.split(" "), this_attr._yang_keys.split(" ")):
-                                kwargs[pkv] = elem[ykv]
-                                keystr += "%s " % elem[ykv]
-                            keystr = keystr.rstrip(" ")
-                            if keystr not in this_attr:
-                                nobj = this_attr.add(**kwargs)
-                            else:
-                                nobj = this_attr[keystr]
-                        else:
-                            k = elem[this_attr._yang_keys]
-                            if k not in this_attr:
-                                nobj = this_attr.add(k)
-                            else:
-                                nobj = this_attr[k]
+                        _, nobj = pybindJSONDecoder._ietf_list_entry(this_attr, elem)
                         pybindJSONDecoder.load_ietf_json(
                             elem,
                             None,
@@ -874,3 +1586,461 @@ class pybindJSONDecoder(object):
                         set_method(val)
                 pybindJSONDecoder.check_metadata_add(key, d, get_method())
         return obj
+
+
+# the tokens of JSON that are not strings or numbers, and their values, as
+# per json.load().
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_JSON_CONSTANTS = (
+    ("true", True),
+    ("false", False),
+    ("null", None),
+    ("NaN", float("nan")),
+    ("Infinity", float("inf")),
+    ("-Infinity", float("-inf")),
+)
+# values are decoded only where at least this many characters follow them in
+# the buffer, or the buffer holds the end of the file, as numbers and
+# constants are otherwise not known to be complete.
+_JSON_CONSTANT_LENGTH = 9
+
+
+class _JSONTokenReader(object):
+    """
+    Read a JSON document from the file fp a chunk at a time, such that only
+    the part of the document that is being decoded is held in memory. The
+    members of objects and arrays are iterated over, and are each read in
+    turn, as per json.load() with an object_pairs_hook of OrderedDict.
+    """
+
+    def __init__(self, fp, chunk_size=65536):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        # the number of characters that have been discarded from the buffer.
+        self._offset = 0
+        self._eof = False
+
+    def _read(self):
+        """
+        Add the next chunk of the file to the buffer, discarding the part of
+        the buffer that has been decoded. Return False at the end of the file.
+        """
+        while not self._eof:
+            data = self._fp.read(self._chunk_size)
+            self._eof = not data
+            if isinstance(data, bytes):
+                data = self._decoder.decode(data, final=self._eof)
+            if data:
+                self._offset += self._pos
+                self._buffer = self._buffer[self._pos :] + data
+                self._pos = 0
+                return True
+        return False
+
+    def _error(self, msg):
+        raise pybindJSONDecodeError("%s at character %d" % (msg, self._offset + self._pos))
+
+    def peek(self):
+        """
+        Return the next character of the document that is not whitespace, or
+        an empty string at its end.
+        """
+        while True:
+            self._pos = _JSON_WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                return ""
+
+    def _expect(self, char):
+        if self.peek() != char:
+            self._error("expected '%s'" % char)
+        self._pos += 1
+
+    def _string(self):
+        if self.peek() != '"':
+            self._error("expected a string")
+        while True:
+            try:
+                value, self._pos = json.decoder.scanstring(self._buffer, self._pos + 1)
+                return value
+            except ValueError:
+                # the string may continue in the next chunk.
+                if not self._read():
+                    self._error("invalid string")
+
+    def _scalar(self):
+        if self.peek() == '"':
+            return self._string()
+        while True:
+            buf, pos = self._buffer, self._pos
+            match = json.scanner.NUMBER_RE.match(buf, pos)
+            if match is not None:
+                end = match.end()
+                if self._eof or len(buf) - end >= _JSON_CONSTANT_LENGTH or (end < len(buf) and buf[end] not in ".eE"):
+                    self._pos = end
+                    integer, frac, exp = match.groups()
+                    if frac or exp:
+                        return float(integer + (frac or "") + (exp or ""))
+                    return int(integer)
+            else:
+                for name, value in _JSON_CONSTANTS:
+                    if buf.startswith(name, pos):
+                        self._pos = pos + len(name)
+                        return value
+                if self._eof or len(buf) - pos >= _JSON_CONSTANT_LENGTH:
+                    self._error("invalid value")
+            if not self._read():
+                # the end of the file was reached, such that the value is
+                # decoded as it is.
+                continue
+
+    def iter_object(self):
+        """
+        Yield the name of each member of the object that is next in the
+        document. The value of each member must be read before the next name
+        is yielded.
+        """
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            name = self._string()
+            self._expect(":")
+            yield name
+            char = self.peek()
+            if char not in (",", "}"):
+                self._error("expected ',' or '}'")
+            self._pos += 1
+            if char == "}":
+                return
+
+    def iter_array(self):
+        """
+        Yield None for each member of the array that is next in the document,
+        whose value must be read before the next is yielded.
+        """
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield None
+            char = self.peek()
+            if char not in (",", "]"):
+                self._error("expected ',' or ']'")
+            self._pos += 1
+            if char == "]":
+                return
+
+    def value(self):
+        """
+        Return the value that is next in the document.
+        """
+        char = self.peek()
+        if char == "{":
+            d = OrderedDict()
+            for name in self.iter_object():
+                d[name] = self.value()
+            return d
+        elif char == "[":
+            return [self.value() for _ in self.iter_array()]
+        return self._scalar()
+
+    def skip(self):
+        """
+        Read the value that is next in the document without retaining it.
+        """
+        char = self.peek()
+        if char == "{":
+            for _ in self.iter_object():
+                self.skip()
+        elif char == "[":
+            for _ in self.iter_array():
+                self.skip()
+        else:
+            self._scalar()
+
+    def end(self):
+        """
+        Check that nothing but whitespace follows the value that was read.
+        """
+        if self.peek() != "":
+            self._error("extra data")
+
+
+# in place of a value that has not been read from the document.
+_UNREAD = object()
+
+
+class pybindJSONStreamDecoder(object):
+    """
+    Load a JSON document from a file into pyangbind classes as it is read,
+    such that the document is not held in memory. Each entry of a YANG list
+    is added to the list as it is read, after which entry_callback, where
+    supplied, is called with it, and the entry is deleted if the callback
+    returns False. The result of loading a document is otherwise that of
+    pybindJSONDecoder.load_json() or load_ietf_json().
+
+    Values of leaves, and members of list entries before the keys of the
+    entry in IETF JSON, are read into memory, and loaded by pybindJSONDecoder.
+    """
+
+    def __init__(self, reader, yang_base, path_helper, extmethods, skip_unknown, entry_callback):
+        self._reader = reader
+        self._yang_base = yang_base
+        self._path_helper = path_helper
+        self._extmethods = extmethods
+        self._skip_unknown = skip_unknown
+        self._entry_callback = entry_callback
+
+    @staticmethod
+    def load_json(
+        fp,
+        parent,
+        yang_base,
+        obj=None,
+        path_helper=None,
+        extmethods=None,
+        overwrite=False,
+        skip_unknown=False,
+        entry_callback=None,
+    ):
+        reader = _JSONTokenReader(fp)
+        if obj is None:
+            obj = pybindJSONDecoder._root_object(parent, yang_base, path_helper, extmethods)
+        decoder = pybindJSONStreamDecoder(reader, yang_base, path_helper, extmethods, skip_unknown, entry_callback)
+        if reader.peek() == "{":
+            decoder._load_members(obj, reader.iter_object(), overwrite)
+        else:
+            pybindJSONDecoder.load_json(
+                reader.value(), parent, yang_base, obj=obj, path_helper=path_helper, skip_unknown=skip_unknown
+            )
+        reader.end()
+        return obj
+
+    @staticmethod
+    def load_ietf_json(
+        fp,
+        parent,
+        yang_base,
+        obj=None,
+        path_helper=None,
+        extmethods=None,
+        overwrite=False,
+        skip_unknown=False,
+        entry_callback=None,
+    ):
+        reader = _JSONTokenReader(fp)
+        if obj is None:
+            obj = pybindJSONDecoder._root_object(parent, yang_base, path_helper, extmethods)
+        decoder = pybindJSONStreamDecoder(reader, yang_base, path_helper, extmethods, skip_unknown, entry_callback)
+        if reader.peek() == "{":
+            decoder._load_ietf_members(obj, reader.iter_object(), overwrite)
+        else:
+            pybindJSONDecoder.load_ietf_json(
+                reader.value(), parent, yang_base, obj=obj, path_helper=path_helper, skip_unknown=skip_unknown
+            )
+        reader.end()
+        return obj
+
+    def _loaded_entry(self, list_obj, key, entry):
+        if self._entry_callback is not None and self._entry_callback(entry) is False:
+            list_obj.delete(key)
+            return False
+        return True
+
+    def _load_members(self, obj, names, overwrite, ordered=False):
+        """
+        Load the members of the object whose names are yielded by names into
+        the container obj, as per pybindJSONDecoder.load_json(). Where obj is
+        an entry of a user ordered list, return the value of its __yang_order
+        member.
+        """
+        order = None
+        for key in names:
+            if ordered and key == "__yang_order":
+                order = self._reader.value()
+                continue
+            child = getattr(obj, "_get_%s" % safe_name(key), None)
+            if child is None and self._skip_unknown:
+                self._reader.skip()
+                continue
+            chobj = child() if child is not None else None
+            pybind_attr = getattr(chobj, "_pybind_generated_by", None)
+            if pybind_attr in ["container", "YANGListType", "list"] and self._reader.peek() == "{":
+                if getattr(chobj, "_presence", False):
+                    chobj._set_present()
+                if pybind_attr == "container":
+                    if overwrite:
+                        pybindJSONDecoder._unset_elements(chobj)
+                    self._load_members(chobj, self._reader.iter_object(), False)
+                else:
+                    self._load_list(chobj, overwrite)
+                continue
+            pybindJSONDecoder.load_json(
+                OrderedDict([(key, self._reader.value())]),
+                None,
+                self._yang_base,
+                obj=obj,
+                path_helper=self._path_helper,
+                overwrite=overwrite,
+                skip_unknown=self._skip_unknown,
+            )
+        return order
+
+    def _load_list(self, list_obj, overwrite):
+        """
+        Load the entries of the object that is next in the document into the
+        YANG list list_obj, as per pybindJSONDecoder.load_json().
+        """
+        ordered = getattr(list_obj, "_ordered", None)
+        loaded = set()
+        # the keys of the entries that are added to a user ordered list, which
+        # are moved into the order of their __yang_order once all are loaded.
+        orders, unordered = {}, []
+        for child_key in self._reader.iter_object():
+            value = None
+            if len(list_obj._key_names) > 1 and len(child_key.split(" ")) != len(list_obj._key_names):
+                # the values of the keys contain spaces, so the entry is read
+                # to find them from its key leaves.
+                value = self._reader.value()
+                child_key = pybindJSONDecoder._list_entry_key(list_obj, child_key, value)
+            added = child_key not in list_obj
+            if added:
+                list_obj.add(child_key)
+            entry = list_obj[child_key]
+            if value is None and self._reader.peek() == "{":
+                order = self._load_members(entry, self._reader.iter_object(), False, ordered=ordered)
+            else:
+                order = None
+                if value is None:
+                    value = self._reader.value()
+                elif ordered and isinstance(value, dict):
+                    order = value.pop("__yang_order", None)
+                pybindJSONDecoder.load_json(
+                    value,
+                    entry,
+                    self._yang_base,
+                    obj=entry,
+                    path_helper=self._path_helper,
+                    skip_unknown=self._skip_unknown,
+                )
+            if overwrite:
+                loaded.add(list_obj._key_string(child_key))
+            if self._loaded_entry(list_obj, child_key, entry) and ordered and added:
+                if order is None:
+                    unordered.append(child_key)
+                else:
+                    orders[order] = child_key
+        if ordered:
+            unordered.reverse()
+            for child_key in [orders[k] for k in sorted(orders)] + unordered:
+                list_obj._members.move_to_end(list_obj._find_key(child_key))
+        if overwrite:
+            for child_key in list(list_obj):
+                if list_obj._key_string(child_key) not in loaded:
+                    list_obj.delete(child_key)
+
+    def _load_ietf_members(self, obj, names, overwrite, members=()):
+        """
+        Load the members of the object whose names are yielded by names into
+        the container obj, as per pybindJSONDecoder.load_ietf_json(). members
+        are the names and values of members of the object that have already
+        been read.
+        """
+        metadata = OrderedDict()
+        # the objects that the metadata of each member is added to, or the get
+        # method of the member where it is a leaf.
+        loaded = {}
+        for key, value in members:
+            self._load_ietf_member(obj, key, value, overwrite, metadata, loaded)
+        for key in names:
+            self._load_ietf_member(obj, key, _UNREAD, overwrite, metadata, loaded)
+        for key, value in six.iteritems(metadata):
+            if key == "@":
+                # Handle whole container metadata object
+                for k, v in six.iteritems(value):
+                    obj._add_metadata(k, v)
+            else:
+                targets = loaded.get(key[1:], ())
+                if callable(targets):
+                    targets = [targets()]
+                for target in targets:
+                    pybindJSONDecoder.check_metadata_add(key[1:], metadata, target)
+
+    def _load_ietf_member(self, obj, key, value, overwrite, metadata, loaded):
+        if "@" in key:
+            metadata[key] = self._reader.value() if value is _UNREAD else value
+            return
+        # Fix any namespace that was supplied in the JSON
+        ykey = key.split(":")[-1]
+        attr_get = getattr(obj, "_get_%s" % safe_name(ykey), None)
+        char = self._reader.peek() if value is _UNREAD else None
+        if char == "{" and (attr_get is not None or self._skip_unknown):
+            if attr_get is None:
+                # Skip unknown JSON keys
+                self._reader.skip()
+                return
+            chobj = attr_get()
+            if getattr(chobj, "_presence", False):
+                chobj._set_present()
+            self._load_ietf_members(chobj, self._reader.iter_object(), overwrite)
+            loaded[key] = [chobj]
+            return
+        if char == "[" and attr_get is not None:
+            list_obj = attr_get()
+            if hasattr(list_obj, "_keyval"):
+                loaded[key] = self._load_ietf_list(list_obj, overwrite)
+                return
+
+        if value is _UNREAD:
+            value = self._reader.value()
+        pybindJSONDecoder.load_ietf_json(
+            OrderedDict([(key, value)]),
+            None,
+            None,
+            obj=obj,
+            path_helper=self._path_helper,
+            extmethods=self._extmethods,
+            overwrite=overwrite,
+            skip_unknown=self._skip_unknown,
+        )
+        if attr_get is not None and not (isinstance(value, list) and hasattr(attr_get(), "_keyval")):
+            # the entries of YANG lists that are loaded here are not known.
+            loaded[key] = attr_get
+
+    def _load_ietf_list(self, list_obj, overwrite):
+        """
+        Load the entries of the array that is next in the document into the
+        YANG list list_obj, as per pybindJSONDecoder.load_ietf_json(), and
+        return the entries that are loaded.
+        """
+        entries = []
+        for index, _ in enumerate(self._reader.iter_array()):
+            if overwrite and index == 0:
+                for k in list(list_obj.keys()):
+                    list_obj.delete(k)
+            if self._reader.peek() != "{":
+                self._reader._error("expected an entry of list %s" % list_obj._yang_name)
+            names = self._reader.iter_object()
+            members, elem = [], {}
+            if list_obj._keyval is not False:
+                # the members of the entry are read until each of its keys is
+                # known, such that it can be added to the list.
+                yang_keys = set(list_obj._yang_keys.split(" "))
+                for name in names:
+                    members.append((name, self._reader.value()))
+                    if name in yang_keys:
+                        elem[name] = members[-1][1]
+                        if len(elem) == len(yang_keys):
+                            break
+            k, entry = pybindJSONDecoder._ietf_list_entry(list_obj, elem)
+            self._load_ietf_members(entry, names, overwrite, members)
+            if self._loaded_entry(list_obj, k, entry):
+                entries.append(entry)
+        return entries
@@ -25,6 +25,8 @@ xpathhelper:
 """
 from __future__ import unicode_literals
 
+import contextlib
+import sys
 import uuid
 from collections import OrderedDict
 
@@ -93,6 +95,37 @@ class PybindXpathHelper(object):
         """
         raise PybindImplementationError("The path helper class specified does " + "not implement get()")
 
+    def _index_size(self):
+        """
+        A PybindXpathHelper class may supply an _index_size() method that
+        returns the number of paths that are registered with it, and the
+        approximate number of bytes used to index them, as a dictionary with
+        "objects" and "bytes" keys - which memory_report() includes. By
+        default, None is returned.
+        """
+        return None
+
+    def register_many(self, registrations):
+        """
+        A PybindXpathHelper class may supply a register_many() method that
+        registers each of a sequence of (path, object_ptr) tuples, such that
+        objects that are created together (e.g., many entries of a list) can
+        be registered in a single operation. By default, register() is called
+        for each tuple.
+        """
+        for object_path, object_ptr in registrations:
+            self.register(object_path, object_ptr)
+
+    @contextlib.contextmanager
+    def deferred_registration(self):
+        """
+        A PybindXpathHelper class may supply a deferred_registration() context
+        manager, within which calls to register() may be collected and passed
+        to register_many() when the block exits. By default, objects are
+        registered immediately.
+        """
+        yield
+
 
 # A class which acts as "/" within the hierarchy - it acts as per any other
 # PyangBind element for the purposes of get() calls - allowing "/" to be
@@ -103,6 +136,11 @@ class FakeRoot(PybindBase):
     def __init__(self):
         self._pyangbind_elements = OrderedDict()
 
+    def _changed_elements(self):
+        # the elements of the root are not its children, and so do not
+        # record their changes against it.
+        return None
+
 
 class YANGPathHelper(PybindXpathHelper):
     _attr_re = regex.compile("^(?P<tagname>[^\[]+)(?P<args>(\[[^\]]+\])+)$")
@@ -112,6 +150,8 @@ class YANGPathHelper(PybindXpathHelper):
         + "(?P<remainder>.*)"
     )
     _relative_path_re = regex.compile("^(\.|\.\.)")
+    # registrations that are collected by deferred_registration()
+    _deferred = None
 
     def __init__(self):
         # Initialise an empty library and a new FakeRoot class to act as the
@@ -224,6 +264,16 @@ class YANGPathHelper(PybindXpathHelper):
         return (tagname, attributes)
 
     def register(self, object_path, object_ptr, caller=False):
+        if self._deferred is not None:
+            self._deferred.append((object_path, object_ptr))
+            return
+        self._register(object_path, object_ptr)
+
+    def _register(self, object_path, object_ptr):
+        """
+        Register object_ptr at object_path, returning the element of the
+        tree that it is registered against.
+        """
         if isinstance(object_path, str):
             raise XPathError("not meant to receive strings as input to register()")
 
@@ -244,20 +294,10 @@ class YANGPathHelper(PybindXpathHelper):
             raise XPathError("duplicate objects in tree - %s" % object_path)
         if this_obj_existing is not None and not this_obj_existing == []:
             this_obj_existing = this_obj_existing[0]
-            if self._library[this_obj_existing.get("obj_ptr")] == object_ptr:
-                return True
-            else:
-                del self._library[this_obj_existing.get("obj_ptr")]
-                new_uuid = str(uuid.uuid1())
-                self._library[new_uuid] = object_ptr
-                this_obj_existing.set("obj_ptr", new_uuid)
-                return True
+            self._update_pointer(this_obj_existing, object_ptr)
+            return this_obj_existing
 
-        this_obj_id = str(uuid.uuid1())
-        self._library[this_obj_id] = object_ptr
         parent = object_path[:-1]
-        (tagname, attributes) = self._tagname_attributes(object_path[-1])
-
         if parent == []:
             parent_o = self._root
         else:
@@ -269,15 +309,79 @@ class YANGPathHelper(PybindXpathHelper):
                     + "/".join(parent)
                 )
             if parent_o == []:
-                raise XPathError("parent node did not exist for %s @ %s" % (tagname, "/" + "/".join(parent)))
+                raise XPathError(
+                    "parent node did not exist for %s @ %s"
+                    % (self._tagname_attributes(object_path[-1])[0], "/" + "/".join(parent))
+                )
             parent_o = parent_o[0]
 
+        return self._add_element(parent_o, object_path[-1], object_ptr)
+
+    def _update_pointer(self, element, object_ptr):
+        if not self._library[element.get("obj_ptr")] == object_ptr:
+            del self._library[element.get("obj_ptr")]
+            new_uuid = str(uuid.uuid1())
+            self._library[new_uuid] = object_ptr
+            element.set("obj_ptr", new_uuid)
+
+    def _add_element(self, parent_o, path_part, object_ptr):
+        this_obj_id = str(uuid.uuid1())
+        self._library[this_obj_id] = object_ptr
+        (tagname, attributes) = self._tagname_attributes(path_part)
         added_item = etree.SubElement(parent_o, tagname, obj_ptr=this_obj_id)
         if attributes is not None:
             for k, v in six.iteritems(attributes):
                 added_item.set(k, v)
+        return added_item
+
+    def register_many(self, registrations):
+        """
+        Register each of a sequence of (path, object_ptr) tuples. Where the
+        parent of a path was registered earlier in the same sequence, it is
+        not searched for in the tree, such that registering a subtree of
+        objects requires a search only for its root.
+        """
+        registered = {}
+        for object_path, object_ptr in registrations:
+            path_key = tuple(object_path)
+            parent_o = registered.get(path_key[:-1], None) if len(path_key) > 1 else None
+            if parent_o is None:
+                element = self._register(object_path, object_ptr)
+            else:
+                element = registered.get(path_key, None)
+                if element is not None:
+                    self._update_pointer(element, object_ptr)
+                else:
+                    element = self._add_element(parent_o, object_path[-1], object_ptr)
+            registered[path_key] = element
+
+    @contextlib.contextmanager
+    def deferred_registration(self):
+        """
+        Collect the objects that are registered within the block, and
+        register them in a single operation when it exits. If the block
+        raises an exception, the collected registrations are discarded.
+        """
+        if self._deferred is not None:
+            # already deferring, the outer block registers the objects.
+            yield
+            return
+        self._deferred = []
+        try:
+            yield
+        except BaseException:
+            self._deferred = None
+            raise
+        registrations, self._deferred = self._deferred, None
+        self.register_many(registrations)
+
+    def _flush_deferred(self):
+        if self._deferred:
+            registrations, self._deferred = self._deferred, []
+            self.register_many(registrations)
 
     def unregister(self, object_path, caller=False):
+        self._flush_deferred()
         if isinstance(object_path, str):
             raise XPathError("should not receive paths as a str in unregister()")
         if regex.match("^(\.|\.\.|\/)", object_path[0]):
@@ -305,6 +409,7 @@ class YANGPathHelper(PybindXpathHelper):
         return retr_obj
 
     def get(self, object_path, caller=False):
+        self._flush_deferred()
         if isinstance(object_path, six.string_types + (six.text_type,)):
             object_path = self._path_parts(object_path)
 
@@ -334,3 +439,19 @@ class YANGPathHelper(PybindXpathHelper):
 
     def tostring(self, pretty_print=False):
         return etree.tostring(self._root, pretty_print=pretty_print)
+
+    def _index_size(self):
+        """
+        Return the number of paths that are registered with this path
+        helper, and the approximate number of bytes used to index them -
+        the library of registered objects and the tree of their paths, but
+        not the registered objects themselves.
+        """
+        size = sys.getsizeof(self._library)
+        for object_id in self._library:
+            size += sys.getsizeof(object_id)
+        for element in self._root.iter():
+            size += sys.getsizeof(element) + sys.getsizeof(element.tag)
+            for k, v in element.items():
+                size += sys.getsizeof(k) + sys.getsizeof(v)
+        return {"objects": len(self._library), "bytes": size}
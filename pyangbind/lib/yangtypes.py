@@ -24,9 +24,14 @@ from __future__ import unicode_literals
 import base64
 import collections
 from collections import abc
+import contextlib
 import copy
+import itertools
+import types
 import uuid
-from decimal import Decimal
+import weakref
+from decimal import Context, Decimal
+from operator import attrgetter
 
 import regex
 import six
@@ -131,13 +136,193 @@ def safe_name(arg):
     return arg
 
 
+# Caches of types derived from base types that cannot have attributes set on
+# them (e.g., builtins such as str and int), keyed by the cache name and the
+# base type.
+_builtin_type_caches = {}
+
+
+def _base_type_cache(base_type, cache_name):
+    """
+    Return the dictionary used to cache types that are derived from
+    base_type. The cache is stored against the base type itself where
+    possible, such that it is released along with the base type.
+    """
+    cache = vars(base_type).get(cache_name, None)
+    if cache is None:
+        cache = {}
+        try:
+            setattr(base_type, cache_name, cache)
+        except TypeError:
+            cache = _builtin_type_caches.setdefault((cache_name, base_type), {})
+    return cache
+
+
+def _copy_slots(obj):
+    """
+    Return a new instance of the class of obj, without calling its __init__,
+    with the attributes stored in the slots of obj copied to it. The slots of
+    the elements of a container, and those used to track changes, are not
+    copied.
+    """
+    cls = type(obj)
+    cache = _base_type_cache(cls, "_pybind_copied_slots")
+    names = cache.get(cls, None)
+    if names is None:
+        names = []
+        for c in cls.__mro__:
+            slots = vars(c).get("__slots__", ())
+            if isinstance(slots, six.string_types):
+                slots = (slots,)
+            for name in slots:
+                if name.startswith("__") or name.startswith("_pybind_") or name in names:
+                    continue
+                names.append(name)
+        names = cache[cls] = tuple(names)
+    copied = cls.__new__(cls)
+    for name in names:
+        try:
+            setattr(copied, name, getattr(obj, name))
+        except AttributeError:
+            pass
+    return copied
+
+
+class _DetachedParent(object):
+    """
+    The parent of a snapshot of a container or list that is not the root of
+    a data tree, which provides the path of the original parent (used for
+    the paths of the objects within the snapshot) but is not changed when
+    the snapshot is.
+    """
+
+    __slots__ = ("_path_elements", "_extmethods", "_path_helper")
+
+    def __init__(self, parent):
+        self._path_elements = parent._path()
+        self._extmethods = getattr(parent, "_extmethods", False)
+        self._path_helper = False
+
+    def _path(self):
+        return list(self._path_elements)
+
+
+class _SnapshotMembers(collections.OrderedDict):
+    """
+    The entries of yang_list, a snapshot of a list, which share the entries
+    of the list that it was taken from. A snapshot of each entry is taken
+    when the entry is first read from yang_list, or before it is changed
+    within the original list, such that taking a snapshot of a list copies
+    its keys but not its entries.
+    """
+
+    def __init__(self, members=None, yang_list=None):
+        collections.OrderedDict.__init__(self)
+        self._yang_list = yang_list
+        if members is None:
+            members = collections.OrderedDict()
+        for k, entry in collections.OrderedDict.items(members):
+            collections.OrderedDict.__setitem__(self, k, entry)
+        # the key of each entry that is shared, keyed by the id() of the
+        # entry.
+        self._shared = dict(zip(map(id, dict.values(members)), dict.keys(members)))
+
+    def _copy_entry(self, k, entry):
+        del self._shared[id(entry)]
+        yang_list = self._yang_list
+        entry = entry._snapshot(yang_list._parent, path_helper=yang_list._path_helper, yang_list=yang_list)
+        collections.OrderedDict.__setitem__(self, k, entry)
+        if yang_list._indexes:
+            yang_list._indexed[id(entry)] = k
+        return entry
+
+    def _entry_changing(self, entry):
+        """
+        Called before entry, an entry of the list that the snapshot was taken
+        from, is changed.
+        """
+        k = self._shared.get(id(entry), None)
+        if k is not None:
+            self._copy_entry(k, entry)
+
+    def _shared_entries(self):
+        return [entry for entry in dict.values(self) if id(entry) in self._shared]
+
+    def _copy_entries(self):
+        for k in list(six.itervalues(self._shared)):
+            self._copy_entry(k, dict.__getitem__(self, k))
+
+    def __getitem__(self, k):
+        entry = dict.__getitem__(self, k)
+        if id(entry) in self._shared:
+            return self._copy_entry(k, entry)
+        return entry
+
+    def get(self, k, default=None):
+        return self[k] if k in self else default
+
+    def __setitem__(self, k, v):
+        if k in self:
+            self._shared.pop(id(dict.__getitem__(self, k)), None)
+        collections.OrderedDict.__setitem__(self, k, v)
+
+    def __delitem__(self, k):
+        self._shared.pop(id(dict.__getitem__(self, k)), None)
+        collections.OrderedDict.__delitem__(self, k)
+
+    def pop(self, k, *default):
+        if k not in self:
+            return collections.OrderedDict.pop(self, k, *default)
+        entry = self[k]
+        collections.OrderedDict.__delitem__(self, k)
+        return entry
+
+    def popitem(self, last=True):
+        if not self:
+            raise KeyError("dictionary is empty")
+        k = next(reversed(self)) if last else next(iter(self))
+        return k, self.pop(k)
+
+    def clear(self):
+        self._shared.clear()
+        collections.OrderedDict.clear(self)
+
+    def values(self):
+        self._copy_entries()
+        return collections.OrderedDict.values(self)
+
+    def items(self):
+        self._copy_entries()
+        return collections.OrderedDict.items(self)
+
+
+def _is_per_instance_type(t):
+    """
+    Determine whether t is built afresh each time that a leaf using it is
+    created (e.g., a leafref), such that types that are derived from it
+    should not be cached.
+    """
+    return any(vars(c).get("_pybind_generated_by", None) == "ReferencePathType" for c in getattr(t, "__mro__", ()))
+
+
+# The RestrictedPrecisionDecimal type for each precision, such that the
+# leaves that have the same number of fraction-digits share a type.
+_precision_decimal_types = {}
+
+
 def RestrictedPrecisionDecimalType(*args, **kwargs):
     """
     Function to return a new type that is based on decimal.Decimal with
     an arbitrary restricted precision.
     """
-    precision = kwargs.pop("precision", False)
+    precision = int(kwargs.pop("precision", False))
+    cls = _precision_decimal_types.get(precision, None)
+    if cls is None:
+        cls = _precision_decimal_types[precision] = _build_precision_decimal(precision)
+    return type(cls(*args, **kwargs))
+
 
+def _build_precision_decimal(precision):
     class RestrictedPrecisionDecimal(Decimal):
         """
         Class extending decimal.Decimal to restrict the precision that is
@@ -145,27 +330,326 @@ def RestrictedPrecisionDecimalType(*args, **kwargs):
         type.
         """
 
-        _precision = 10.0 ** (-1.0 * int(precision))
+        _precision = 10.0 ** (-1.0 * precision)
         _pybind_generated_by = "RestrictedPrecisionDecimal"
+        # The exponent that values are quantized to, and the context that
+        # they are quantized in, are built once for the type rather than for
+        # each value.
+        _quantum = Decimal(str(_precision))
+        _context = Context()
 
         def __new__(self, *args, **kwargs):
             """
             Overloads the decimal __new__ function in order to round the input
             value to the new value.
             """
-            if self._precision is not None:
-                if len(args):
-                    value = Decimal(args[0]).quantize(Decimal(str(self._precision)))
-                else:
-                    value = Decimal(0)
-            elif len(args):
-                value = Decimal(args[0])
-            else:
-                value = Decimal(0)
-            obj = Decimal.__new__(self, value, **kwargs)
-            return obj
+            if not len(args):
+                return Decimal.__new__(self, 0, **kwargs)
+            value = args[0]
+            if not isinstance(value, Decimal):
+                value = Decimal(value)
+            return Decimal.__new__(self, value.quantize(self._quantum, context=self._context), **kwargs)
+
+        @classmethod
+        def create_many(cls, values):
+            """
+            Return a list of instances of the type, one for each of the numbers
+            or strings in values.
+            """
+            quantum, context = cls._quantum, cls._context
+            new = Decimal.__new__
+            return [
+                new(cls, (v if isinstance(v, Decimal) else Decimal(v)).quantize(quantum, context=context))
+                for v in values
+            ]
+
+    return RestrictedPrecisionDecimal
+
+
+# Regular expressions used to parse the range and length arguments that are
+# supplied to a RestrictedClassType.
+range_regex = regex.compile("(?P<low>\-?[0-9\.]+|min)([ ]+)?\.\.([ ]+)?" + "(?P<high>(\-?[0-9\.]+|max))")
+range_single_value_regex = regex.compile("(?P<value>\-?[0-9\.]+)")
+
+
+def convert_regexp(pattern):
+    """
+    Convert a YANG pattern statement into a regular expression that can
+    be used with the regex module.
+    """
+    # Some patterns include a $ character in them in some IANA modules, this
+    # is not escaped. Do some logic to escape them, whilst leaving one at the
+    # end of the string if it's there.
+    trimmed = False
+    if pattern[-1] == "$":
+        tmp_pattern = pattern[:-1]
+        trimmed = True
+    else:
+        tmp_pattern = pattern
+    tmp_pattern = tmp_pattern.replace("$", "\$")
+    pattern = tmp_pattern
+    if trimmed:
+        pattern += "$"
+
+    if not pattern[0] == "^":
+        pattern = "^%s" % pattern
+    if not pattern[len(pattern) - 1] == "$":
+        pattern = "%s$" % pattern
+
+    return pattern
+
+
+def build_length_range_tuples(range_spec, base_type, length=False, multiplier=1):
+    """
+    Parse a single range or length argument (e.g., "1..10") into a tuple
+    of (low, high) values, or a single value tuple.
+    """
+    if range_regex.match(range_spec):
+        low, high = range_regex.sub("\g<low>,\g<high>", range_spec).split(",")
+        if not length:
+            high = base_type(high) if not high == "max" else None
+            low = base_type(low) if not low == "min" else None
+        else:
+            high = int(high) * multiplier if not high == "max" else None
+            low = int(low) * multiplier if not low == "min" else None
+        return (low, high)
+    elif range_single_value_regex.match(range_spec):
+        eqval = range_single_value_regex.sub("\g<value>", range_spec)
+        if not length:
+            eqval = base_type(eqval) if eqval not in ["max", "min"] else None
+        else:
+            eqval = int(eqval) * multiplier
+        return (eqval,)
+    else:
+        raise ValueError("Invalid range or length argument specified")
+
+
+def in_range_check(low_high_tuples, length=False):
+    for check_tuple in low_high_tuples:
+        if len(check_tuple) not in (1, 2):
+            raise AttributeError("Invalid check tuple length specified")
+
+    def range_check(value):
+        if length:
+            value = len(value)
+        for check_tuple in low_high_tuples:
+            if len(check_tuple) == 2:
+                if check_tuple[0] is not None and value < check_tuple[0]:
+                    continue
+                if check_tuple[1] is not None and value > check_tuple[1]:
+                    continue
+                return True
+            elif value == float(check_tuple[0]):
+                return True
+        return False
+
+    return range_check
+
+
+class YANGPatternRegistry(object):
+    """
+    A registry of the YANG patterns that have been converted to regular
+    expressions and compiled. Patterns are shared between all of the types
+    that use them, such that a typedef used by many leaves is compiled once.
+
+    Optionally, the results of matching (pattern, value) pairs can be kept
+    in a bounded LRU cache, which is useful where the same values are
+    repeatedly set (e.g., next-hops, or interface names). The cache is
+    disabled when result_cache_size is 0.
+
+    The hit and miss counters for both the compiled patterns and the cached
+    results are returned by stats().
+    """
+
+    def __init__(self, result_cache_size=0):
+        self._patterns = {}
+        self._results = collections.OrderedDict()
+        self._result_cache_size = result_cache_size
+        self.reset_stats()
+
+    def compile(self, pattern):
+        """
+        Return the compiled regular expression for the YANG pattern.
+        """
+        compiled = self._patterns.get(pattern, None)
+        if compiled is None:
+            self._pattern_misses += 1
+            compiled = regex.compile(convert_regexp(pattern))
+            self._patterns[pattern] = compiled
+        else:
+            self._pattern_hits += 1
+        return compiled
+
+    def match(self, pattern, value):
+        """
+        Return whether the string value matches the YANG pattern.
+        """
+        if not self._result_cache_size:
+            compiled = self._patterns.get(pattern, None)
+            if compiled is None:
+                compiled = self.compile(pattern)
+            return compiled.match(value) is not None
+
+        # Store a plain string such that the cache does not hold references
+        # to pyangbind objects.
+        key = (pattern, value if type(value) is six.text_type else six.text_type(value))
+        result = self._results.get(key, None)
+        if result is not None:
+            self._result_hits += 1
+            self._results.move_to_end(key)
+            return result
+
+        self._result_misses += 1
+        compiled = self._patterns.get(pattern, None)
+        if compiled is None:
+            compiled = self.compile(pattern)
+        result = compiled.match(value) is not None
+        self._results[key] = result
+        if len(self._results) > self._result_cache_size:
+            self._results.popitem(last=False)
+        return result
+
+    def set_result_cache_size(self, size):
+        """
+        Set the maximum number of (pattern, value) results that are cached,
+        a size of 0 disables the cache.
+        """
+        self._result_cache_size = size
+        while len(self._results) > size:
+            self._results.popitem(last=False)
+
+    def clear(self):
+        self._patterns.clear()
+        self._results.clear()
+
+    def reset_stats(self):
+        self._pattern_hits = 0
+        self._pattern_misses = 0
+        self._result_hits = 0
+        self._result_misses = 0
+
+    def stats(self):
+        return {
+            "patterns": len(self._patterns),
+            "pattern_hits": self._pattern_hits,
+            "pattern_misses": self._pattern_misses,
+            "results": len(self._results),
+            "result_cache_size": self._result_cache_size,
+            "result_hits": self._result_hits,
+            "result_misses": self._result_misses,
+        }
 
-    return type(RestrictedPrecisionDecimal(*args, **kwargs))
+
+# The registry of compiled patterns used by all RestrictedClassTypes.
+pattern_registry = YANGPatternRegistry()
+
+
+def match_pattern_check(regexp):
+    pattern_registry.compile(regexp)
+
+    def mp_check(value):
+        if not isinstance(value, six.string_types + (six.text_type,)):
+            return False
+        return pattern_registry.match(regexp, value)
+
+    return mp_check
+
+
+def in_dictionary_check(dictionary):
+    return lambda i: six.text_type(i) in dictionary
+
+
+class YANGEnumerationTable(abc.Mapping):
+    """
+    An immutable table of the values of a YANG enumeration or identityref,
+    as used by a dict_key restriction. The table maps each name to a
+    read-only dictionary containing its "value" (and, for identities, the
+    "@module" and "@namespace" that define it), and additionally provides
+    direct name to value, value to name, and name to module lookups.
+
+    Tables are shared between all types that are built from the same
+    restriction argument.
+    """
+
+    __slots__ = ("_entries", "_values", "_names", "_modules")
+
+    def __init__(self, restriction_arg):
+        entries = collections.OrderedDict()
+        for k, v in restriction_arg.items():
+            if not k.startswith("@"):
+                entries[k] = dict(v)
+
+        # populate enum values
+        used_values = set()
+        for k in entries:
+            if "value" in entries[k]:
+                used_values.add(int(entries[k]["value"]))
+        c = 0
+        for k in entries:
+            while c in used_values:
+                c += 1
+            if "value" not in entries[k]:
+                entries[k]["value"] = c
+            c += 1
+
+        self._values = {}
+        self._names = {}
+        self._modules = {}
+        for k, v in entries.items():
+            self._values[k] = v["value"]
+            self._names.setdefault(int(v["value"]), k)
+            if "@module" in v:
+                self._modules[k] = (v["@module"], v.get("@namespace", None))
+            entries[k] = types.MappingProxyType(v)
+        self._entries = entries
+
+    def __getitem__(self, k):
+        return self._entries[k]
+
+    def __contains__(self, k):
+        return k in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__, dict(self._entries))
+
+    def value_of(self, name):
+        """
+        Return the integer value of the enumeration name.
+        """
+        return self._values[name]
+
+    def name_of(self, value):
+        """
+        Return the enumeration name that has the integer value.
+        """
+        return self._names[value]
+
+    def module_of(self, name):
+        """
+        Return a (module, namespace) tuple for the identity name, or None if
+        the name was not defined with a module.
+        """
+        return self._modules.get(name, None)
+
+
+# Enumeration tables that have been built, keyed by the repr() of the
+# restriction argument that they were built from.
+_enumeration_tables = {}
+
+
+def get_enumeration_table(restriction_arg):
+    key = repr(restriction_arg)
+    table = _enumeration_tables.get(key, None)
+    if table is None:
+        table = YANGEnumerationTable(restriction_arg)
+        _enumeration_tables[key] = table
+    return table
 
 
 def RestrictedClassType(*args, **kwargs):
@@ -174,6 +658,10 @@ def RestrictedClassType(*args, **kwargs):
     a specified restriction. The restriction_type specified determines the
     type of restriction placed on the class, and the restriction_arg gives
     any input data that this function needs.
+
+    The restrictions are compiled once, when the type is built, and the
+    type is re-used for subsequent calls with the same base_type and
+    restrictions.
     """
     base_type = kwargs.pop("base_type", six.text_type)
     restriction_type = kwargs.pop("restriction_type", None)
@@ -181,6 +669,23 @@ def RestrictedClassType(*args, **kwargs):
     restriction_dict = kwargs.pop("restriction_dict", None)
     int_size = kwargs.pop("int_size", None)
 
+    if restriction_dict is None:
+        if restriction_type is not None and restriction_arg is not None:
+            restriction_dict = {restriction_type: restriction_arg}
+        else:
+            raise ValueError("must specify either a restriction dictionary or" + " a type and argument")
+
+    cache = _base_type_cache(base_type, "_pybind_restricted_cache")
+    cache_key = (repr(restriction_dict), int_size)
+    restricted_class = cache.get(cache_key, None)
+    if restricted_class is None:
+        restricted_class = _build_restricted_class(base_type, restriction_dict, int_size)
+        cache[cache_key] = restricted_class
+
+    return type(restricted_class(*args, **kwargs))
+
+
+def _build_restricted_class(base_type, restriction_dict, int_size):
     # this gives deserialisers some hints as to how to encode/decode this value
     # it must be a list since a restricted class can encapsulate a restricted
     # class
@@ -191,199 +696,95 @@ def RestrictedClassType(*args, **kwargs):
     else:
         restricted_class_hint = [current_restricted_class_type]
 
+    restriction_tests = []
+    enumeration_dict = None
+    has_range = False
+    for rtype, rarg in restriction_dict.items():
+        if rtype == "pattern":
+            restriction_tests.append(match_pattern_check(rarg))
+        elif rtype == "range":
+            ranges = [build_length_range_tuples(range_spec, base_type) for range_spec in rarg]
+            restriction_tests.append(in_range_check(ranges))
+            has_range = True
+        elif rtype == "length":
+            lengths = [build_length_range_tuples(range_spec, base_type, length=True) for range_spec in rarg]
+            restriction_tests.append(in_range_check(lengths, length=True))
+        elif rtype == "dict_key":
+            enumeration_dict = get_enumeration_table(rarg)
+            restriction_tests.append(in_dictionary_check(enumeration_dict))
+        else:
+            raise TypeError("unsupported restriction type")
+    restriction_tests = tuple(restriction_tests)
+
     class RestrictedClass(base_type):
         """
         A class that restricts the base_type class with a new function that the
-        input value is validated against before being applied. The function is
-        a static method which is assigned to _restricted_test.
+        input value is validated against before being applied. The validation
+        functions are built when the type is created, and stored in
+        _restriction_tests.
         """
 
         _pybind_generated_by = "RestrictedClassType"
 
         _restricted_class_base = restricted_class_hint
         _restricted_int_size = int_size
+        _restriction_dict = restriction_dict
+        _restriction_tests = restriction_tests
+        if enumeration_dict is not None:
+            _enumeration_dict = enumeration_dict
 
         def __init__(self, *args, **kwargs):
             """
-            Overloads the base_class __init__ method to check the input argument
-            against the validation function - returns on instance of the base_type
-            class, which can be manipulated as per a usual Python object.
+            Overloads the base_class __init__ method - the input argument has
+            already been validated in __new__.
             """
-            try:
-                self.__check(args[0])
-            except IndexError:
-                pass
             try:
                 super(RestrictedClass, self).__init__(*args, **kwargs)
             except TypeError:
                 super(RestrictedClass, self).__init__()
 
         def __new__(self, *args, **kwargs):
-            self._restriction_dict = restriction_dict
-            self._restriction_tests = []
-
             """
-        Create a new class instance, and dynamically define the
-        _restriction_test method so that it can be called by other functions.
-      """
-
-            range_regex = regex.compile("(?P<low>\-?[0-9\.]+|min)([ ]+)?\.\.([ ]+)?" + "(?P<high>(\-?[0-9\.]+|max))")
-            range_single_value_regex = regex.compile("(?P<value>\-?[0-9\.]+)")
-
-            def convert_regexp(pattern):
-                # Some patterns include a $ character in them in some IANA modules, this
-                # is not escaped. Do some logic to escape them, whilst leaving one at the
-                # end of the string if it's there.
-                trimmed = False
-                if pattern[-1] == "$":
-                    tmp_pattern = pattern[:-1]
-                    trimmed = True
-                else:
-                    tmp_pattern = pattern
-                tmp_pattern = tmp_pattern.replace("$", "\$")
-                pattern = tmp_pattern
-                if trimmed:
-                    pattern += "$"
-
-                if not pattern[0] == "^":
-                    pattern = "^%s" % pattern
-                if not pattern[len(pattern) - 1] == "$":
-                    pattern = "%s$" % pattern
-
-                return pattern
-
-            def build_length_range_tuples(range, length=False, multiplier=1):
-                if range_regex.match(range_spec):
-                    low, high = range_regex.sub("\g<low>,\g<high>", range_spec).split(",")
-                    if not length:
-                        high = base_type(high) if not high == "max" else None
-                        low = base_type(low) if not low == "min" else None
-                    else:
-                        high = int(high) * multiplier if not high == "max" else None
-                        low = int(low) * multiplier if not low == "min" else None
-                    return (low, high)
-                elif range_single_value_regex.match(range_spec):
-                    eqval = range_single_value_regex.sub("\g<value>", range_spec)
-                    if not length:
-                        eqval = base_type(eqval) if eqval not in ["max", "min"] else None
-                    else:
-                        eqval = int(eqval) * multiplier
-                    return (eqval,)
-                else:
-                    raise ValueError("Invalid range or length argument specified")
-
-            def in_range_check(low_high_tuples, length=False):
-                def range_check(value):
-                    if length:
-                        value = len(value)
-                    range_results = []
-                    for check_tuple in low_high_tuples:
-                        chk = True
-                        if len(check_tuple) == 2:
-                            if check_tuple[0] is not None and value < check_tuple[0]:
-                                chk = False
-                            if check_tuple[1] is not None and value > check_tuple[1]:
-                                chk = False
-                        elif len(check_tuple) == 1:
-                            if value != float(check_tuple[0]):
-                                chk = False
-                        else:
-                            raise AttributeError("Invalid check tuple length specified")
-                        range_results.append(chk)
-                    return True in range_results
-
-                return range_check
-
-            def match_pattern_check(regexp):
-                def mp_check(value):
-                    if not isinstance(value, six.string_types + (six.text_type,)):
-                        return False
-                    if regex.match(convert_regexp(regexp), value):
-                        return True
-                    return False
-
-                return mp_check
-
-            def in_dictionary_check(dictionary):
-                return lambda i: six.text_type(i) in dictionary
-
-            val = False
-            try:
+            Create a new class instance, checking the input value against the
+            restrictions of the type.
+            """
+            # Errors are raised as ValueError, since a TypeError is taken to
+            # mean that the arguments are not accepted by __new__ by classes
+            # that extend this type (e.g., YANGDynClass).
+            if len(args):
                 val = args[0]
-            except IndexError:
-                pass
-            if self._restriction_dict is None:
-                if restriction_type is not None and restriction_arg is not None:
-                    self._restriction_dict = {restriction_type: restriction_arg}
-                else:
-                    raise ValueError("must specify either a restriction dictionary or" + " a type and argument")
-
-            for rtype, rarg in self._restriction_dict.items():
-                if rtype == "pattern":
-                    self._restriction_tests.append(match_pattern_check(rarg))
-                elif rtype == "range":
-                    ranges = []
-                    for range_spec in rarg:
-                        ranges.append(build_length_range_tuples(range_spec))
-                    self._restriction_tests.append(in_range_check(ranges))
-                    if val:
-                        try:
-                            val = base_type(val)
-                        except Exception:
-                            raise TypeError("must specify a numeric type for a range " + "argument")
-                elif rtype == "length":
-                    multiplier = 1
-                    lengths = []
-                    for range_spec in rarg:
-                        lengths.append(build_length_range_tuples(range_spec, length=True, multiplier=multiplier))
-                    self._restriction_tests.append(in_range_check(lengths, length=True))
-                elif rtype == "dict_key":
-                    new_rarg = copy.deepcopy(rarg)
-                    for k in rarg:
-                        if k.startswith("@"):
-                            new_rarg.pop(k, None)
-                    # populate enum values
-                    used_values = []
-                    for k in new_rarg:
-                        if "value" in new_rarg[k]:
-                            used_values.append(int(new_rarg[k]["value"]))
-                    c = 0
-                    for k in new_rarg:
-                        while c in used_values:
-                            c += 1
-                        if "value" not in new_rarg[k]:
-                            new_rarg[k]["value"] = c
-                        c += 1
-                    self._restriction_tests.append(in_dictionary_check(new_rarg))
-                    self._enumeration_dict = new_rarg
-                else:
-                    raise TypeError("unsupported restriction type")
-
-            if val is not False:
-                for test in self._restriction_tests:
+                if has_range and val:
+                    try:
+                        val = base_type(val)
+                    except Exception:
+                        raise ValueError("must specify a numeric type for a range " + "argument")
+                # Values that are not already of the base type may be rejected
+                # before any conversion is attempted (e.g., a number supplied
+                # to a string with a pattern).
+                if not isinstance(val, base_type):
                     passed = False
-                    if test(val) is not False:
-                        passed = True
-                        break
-                if not passed:
-                    raise ValueError("%s does not match a restricted type" % val)
+                    try:
+                        for test in restriction_tests:
+                            if test(val) is not False:
+                                passed = True
+                                break
+                    except TypeError as m:
+                        raise ValueError("%s does not match a restricted type (%s)" % (val, m))
+                    if not passed:
+                        raise ValueError("%s does not match a restricted type" % val)
 
             try:
                 obj = base_type.__new__(self, *args, **kwargs)
+                checked = obj
             except TypeError:
                 obj = base_type.__new__(self)
-            return obj
+                checked = base_type(args[0]) if len(args) else None
 
-        def __check(self, v):
-            """
-            Run the _restriction_test static method against the argument v,
-            returning an error if the value does not validate.
-            """
-            v = base_type(v)
-            for chkfn in self._restriction_tests:
-                if not chkfn(v):
-                    raise ValueError("did not match restricted type")
-            return True
+            if len(args):
+                for chkfn in restriction_tests:
+                    if not chkfn(checked):
+                        raise ValueError("did not match restricted type")
+            return obj
 
         def getValue(self, *args, **kwargs):
             """
@@ -393,10 +794,10 @@ def RestrictedClassType(*args, **kwargs):
             if "dict_key" in self._restriction_dict:
                 value = kwargs.pop("mapped", False)
                 if value:
-                    return self._enumeration_dict[self.__str__()]["value"]
+                    return self._enumeration_dict.value_of(self.__str__())
             return self
 
-    return type(RestrictedClass(*args, **kwargs))
+    return RestrictedClass
 
 
 def TypedListType(*args, **kwargs):
@@ -409,74 +810,163 @@ def TypedListType(*args, **kwargs):
     if not isinstance(allowed_type, list):
         allowed_type = [allowed_type]
 
+    # Types that refer to a particular path (leafrefs) are built for each
+    # instance, and hence the list type is not cached for them.
+    cacheable = len(allowed_type) and not any(_is_per_instance_type(i) for i in allowed_type)
+    if cacheable:
+        cache = _base_type_cache(allowed_type[0], "_pybind_typedlist_cache")
+        typed_list = cache.get(tuple(allowed_type), None)
+        if typed_list is None:
+            typed_list = _build_typed_list(allowed_type)
+            cache[tuple(allowed_type)] = typed_list
+    else:
+        typed_list = _build_typed_list(allowed_type)
+
+    return type(typed_list(*args, **kwargs))
+
+
+# The ways in which a value can be coerced to each of the types allowed in a
+# TypedList. CAST calls the type with the value, STRING converts values that
+# are already strings, and INSTANCE accepts only values which are already
+# instances of the type.
+COERCE_CAST = 0
+COERCE_STRING = 1
+COERCE_INSTANCE = 2
+
+
+def _coercion_plan(allowed_type):
+    """
+    Determine how a value is coerced to each of the allowed types of a
+    TypedList, returning a tuple of (type, method, only_strings) tuples.
+    only_strings is set where the type can never accept a value that is not
+    a string.
+    """
+    plan = []
+    for i in allowed_type:
+        only_strings = False
+        generated_by = getattr(i, "_pybind_generated_by", None)
+        if generated_by in ["RestrictedClassType", "ReferencePathType", "RestrictedPrecisionDecimal"]:
+            method = COERCE_CAST
+            # a string type restricted solely by a pattern never matches a
+            # value that is not a string.
+            if generated_by == "RestrictedClassType" and issubclass(i, six.text_type):
+                only_strings = list(i._restriction_dict.keys()) == ["pattern"]
+        elif generated_by is not None:
+            method = COERCE_INSTANCE
+        elif i == six.text_type:
+            method = COERCE_STRING
+            only_strings = True
+        elif i in six.string_types:
+            method = COERCE_INSTANCE
+        else:
+            # for anything other than string we try
+            # and cast. Using things for string or
+            # unicode gives us strange results because we get
+            # class name represetnations
+            method = COERCE_CAST
+        plan.append((i, method, only_strings))
+    return tuple(plan)
+
+
+def _build_typed_list(allowed_type):
+    coercion_plan = _coercion_plan(allowed_type)
+
     class TypedList(abc.MutableSequence):
         _pybind_generated_by = "TypedListType"
         _list = list()
+        _coercion_plan = coercion_plan
+        # The entries of the coercion plan that are tried for each type of
+        # input value, built when a type is first seen.
+        _coercion_candidates = {}
+        # Where the list holds only decimal64 values, the values that are added
+        # to it by extend() are converted in a single call.
+        _create_many = (
+            allowed_type[0].create_many
+            if len(allowed_type) == 1
+            and getattr(allowed_type[0], "_pybind_generated_by", None) == "RestrictedPrecisionDecimal"
+            else None
+        )
 
         def __init__(self, *args, **kwargs):
             self._unique = kwargs.pop("unique", False)
             self._allowed_type = allowed_type
             self._list = list()
+            # For unique lists, a set of the values in the list is kept such
+            # that checking membership does not require a scan of the list. It
+            # is set to None if the list contains a value that cannot be hashed.
+            self._index = set() if self._unique else None
             if len(args):
                 if isinstance(args[0], list):
-                    tmp = []
-                    for i in args[0]:
-                        if not self._unique or i not in tmp:
-                            tmp.append(self.check(i))
-                    self._list.extend(tmp)
+                    self.extend(args[0])
                 else:
                     tmp = self.check(args[0])
                     self._list.append(tmp)
+                    self._index_add(tmp)
+
+        def _index_add(self, v):
+            if self._index is not None:
+                try:
+                    self._index.add(v)
+                except TypeError:
+                    self._index = None
+
+        def _index_discard(self, v):
+            if self._index is not None:
+                self._index.discard(v)
+
+        def __contains__(self, v):
+            if self._index is not None:
+                try:
+                    return v in self._index
+                except TypeError:
+                    pass
+            return v in self._list
 
         def check(self, v):
             # Short circuit uniqueness check
-            if self._unique and v in self._list:
+            if self._unique and v in self:
                 raise ValueError("Values in this list must be unique.")
-
-            passed = False
-            count = 0
-            for i in self._allowed_type:
+            return self._convert(v)
+
+        def _candidates(self, value_type):
+            candidates = []
+            is_string = issubclass(value_type, six.string_types + (six.text_type,))
+            for idx, (i, method, only_strings) in enumerate(self._coercion_plan):
+                if only_strings and not is_string and not issubclass(value_type, i):
+                    continue
+                if method == COERCE_INSTANCE and not issubclass(value_type, i):
+                    continue
+                candidates.append(idx)
+            candidates = tuple(candidates)
+            self._coercion_candidates[value_type] = candidates
+            return candidates
+
+        def _convert(self, v):
+            value_type = type(v)
+            candidates = self._coercion_candidates.get(value_type, None)
+            if candidates is None:
+                candidates = self._candidates(value_type)
+
+            for idx in candidates:
+                i, method, _ = self._coercion_plan[idx]
                 if isinstance(v, i):
-                    tmp = v
-                    passed = True
-                    break
+                    return v
                 try:
-                    if hasattr(i, "_pybind_generated_by"):
-                        attr = getattr(i, "_pybind_generated_by")
-                        if attr == "RestrictedClassType":
-                            tmp = i(v)
-                            passed = True
-                            break
-                        elif attr == "ReferencePathType":
-                            tmp = i(v)
-                            passed = True
-                            break
-                        elif attr == "RestrictedPrecisionDecimal":
-                            tmp = i(v)
-                            passed = True
-                            break
-                    elif i == six.text_type and isinstance(v, six.string_types + (six.text_type,)):
-                        tmp = six.text_type(v)
-                        passed = True
-                        break
-                    elif i not in six.string_types + (six.text_type,):
-                        # for anything other than string we try
-                        # and cast. Using things for string or
-                        # unicode gives us strange results because we get
-                        # class name represetnations
-                        tmp = i(v)
-                        passed = True
-                        break
+                    if method == COERCE_STRING:
+                        return six.text_type(v)
+                    elif method == COERCE_CAST:
+                        return i(v)
+                except TypeError:
+                    # A builtin type that cannot be built from this type of
+                    # value will never accept it, so do not try again.
+                    if getattr(i, "_pybind_generated_by", None) is None:
+                        self._coercion_candidates[value_type] = tuple(c for c in candidates if c != idx)
                 except Exception:
                     # we catch all exceptions because we duck-type as
                     # much as possible and some types - e.g., decimal do
                     # not use builtins.
                     pass
-                count += 1
-            if not passed:
-                raise ValueError("Cannot add %s to TypedList (accepts only %s)" % (v, self._allowed_type))
-            else:
-                return tmp
+            raise ValueError("Cannot add %s to TypedList (accepts only %s)" % (v, self._allowed_type))
 
         def __len__(self):
             return len(self._list)
@@ -485,7 +975,14 @@ def TypedListType(*args, **kwargs):
             return self._list[i]
 
         def __delitem__(self, i):
+            removed = self._list[i]
             del self._list[i]
+            if self._index is not None:
+                if isinstance(i, slice):
+                    for v in removed:
+                        self._index_discard(v)
+                else:
+                    self._index_discard(removed)
 
         def __setitem__(self, i, v):
             self.insert(i, v)
@@ -493,11 +990,53 @@ def TypedListType(*args, **kwargs):
         def insert(self, i, v):
             val = self.check(v)
             self._list.insert(i, val)
+            self._index_add(val)
 
         def append(self, v):
-            if not self._unique or v not in self._list:
-                val = self.check(v)
+            if not self._unique or v not in self:
+                val = self._convert(v)
                 self._list.append(val)
+                self._index_add(val)
+
+        def extend(self, values):
+            """
+            Validate each of the values and add them to the list. For unique
+            lists, values that are already present (or repeated within values)
+            are skipped, as per append(). No values are added if any of the
+            values are not valid.
+            """
+            new_values = []
+            if self._unique:
+                pending = set()
+                for v in values:
+                    if v in self:
+                        continue
+                    try:
+                        duplicate = v in pending if pending is not None else v in new_values
+                    except TypeError:
+                        duplicate = v in new_values
+                    if duplicate:
+                        continue
+                    val = self._convert(v)
+                    new_values.append(val)
+                    if pending is not None:
+                        try:
+                            pending.add(val)
+                        except TypeError:
+                            pending = None
+            elif self._create_many is not None:
+                try:
+                    new_values = self._create_many(values)
+                except (ArithmeticError, TypeError, ValueError):
+                    # convert each value such that the error reports the value
+                    # that is not valid.
+                    new_values = [self._convert(v) for v in values]
+            else:
+                new_values = [self._convert(v) for v in values]
+
+            self._list.extend(new_values)
+            for val in new_values:
+                self._index_add(val)
 
         def __str__(self):
             return str(self._list)
@@ -513,7 +1052,7 @@ def TypedListType(*args, **kwargs):
         def get(self, filter=False):
             return self._list
 
-    return type(TypedList(*args, **kwargs))
+    return TypedList
 
 
 def YANGListType(*args, **kwargs):
@@ -527,6 +1066,13 @@ def YANGListType(*args, **kwargs):
 
     .add(key) - initialises a new member of the list
     .delete(key) - removes it.
+    .add_many(keys) / .from_records(records) - add many entries at once.
+    .add_index(leaf) - maintains a secondary index of the entries by leaf.
+    .lookup(**kwargs) - returns the entries with the specified leaf values.
+
+    Entries of lists with multiple keys are stored under a tuple of the
+    string values of the keys. A string of the key values separated by
+    spaces is also accepted when retrieving an entry.
 
     Where a list exists that does not have a key - which can be the
     case for 'config false' lists - a uuid is generated and used
@@ -537,18 +1083,65 @@ def YANGListType(*args, **kwargs):
         listclass = args[1]
     except Exception:
         raise TypeError("A YANGList must be specified with a key value and a " + "contained class")
+    if not type(listclass) == type(int):
+        raise ValueError("contained class of a YANGList must be a class")
     is_container = kwargs.pop("is_container", False)
-    parent = kwargs.pop("parent", False)
     yang_name = kwargs.pop("yang_name", False)
     yang_keys = kwargs.pop("yang_keys", False)
     user_ordered = kwargs.pop("user_ordered", False)
-    path_helper = kwargs.pop("path_helper", None)
     extensions = kwargs.pop("extensions", None)
 
+    # The type is built once for each list of a contained class - the parent
+    # and path helper of each instance are those that YANGDynClass stores.
+    cache = _base_type_cache(listclass, "_pybind_list_types")
+    cache_key = (keyname, is_container, yang_name, yang_keys, user_ordered, repr(extensions))
+    list_type = cache.get(cache_key, None)
+    if list_type is None:
+        list_type = _build_list_type(keyname, listclass, is_container, yang_name, yang_keys, user_ordered, extensions)
+        cache[cache_key] = list_type
+    return list_type
+
+
+def _build_list_type(keyname, listclass, is_container, yang_name, yang_keys, user_ordered, extensions):
+    # The attributes of each entry of the list are shared by the entries.
+    entry_schema = YANGSchemaNode(yang_name=yang_name, is_container="container", extensions=extensions)
+    unkeyed_entry_schema = YANGSchemaNode(yang_name=yang_name, is_container=is_container, extensions=extensions)
+
+    # The names of the key leaves, and the format of the key string that is
+    # used in the path of each entry, are resolved when the type is built
+    # rather than by creating an instance of the contained class.
+    if keyname:
+        key_names = tuple(keyname.split(" "))
+        key_yang_names = tuple(yang_keys.split(" ")) if yang_keys else ()
+        if not len(key_yang_names) == len(key_names):
+            entry = listclass()
+            key_yang_names = tuple(getattr(entry, kn).yang_name() for kn in key_names)
+        key_setters = dict((kn, "_set_%s" % safe_name(kn)) for kn in key_names)
+        path_key_format = "[%s]" % " ".join("%s='%%s'" % yn for yn in key_yang_names)
+    else:
+        key_names, key_yang_names, key_setters, path_key_format = (), (), {}, None
+
     class YANGList(object):
-        __slots__ = ("_members", "_keyval", "_contained_class", "_path_helper", "_yang_keys", "_ordered")
+        __slots__ = (
+            "_members",
+            "_keyval",
+            "_contained_class",
+            "_path_helper",
+            "_yang_keys",
+            "_ordered",
+            "_indexes",
+            "_indexed",
+            "_batch",
+            "_pybind_backers",
+            "__weakref__",
+        )
         _pybind_generated_by = "YANGListType"
 
+        _key_names = key_names
+        _key_yang_names = key_yang_names
+        _key_setters = key_setters
+        _path_key_format = path_key_format
+
         def __init__(self, *args, **kwargs):
             self._ordered = True if user_ordered else False
             self._members = collections.OrderedDict()
@@ -556,11 +1149,19 @@ def YANGListType(*args, **kwargs):
             self._members._user_ordered = True if user_ordered else False
 
             self._keyval = keyname
-            if not type(listclass) == type(int):
-                raise ValueError("contained class of a YANGList must be a class")
             self._contained_class = listclass
-            self._path_helper = path_helper
+            self._path_helper = kwargs.get("path_helper", None)
             self._yang_keys = yang_keys
+            # Secondary indexes, keyed by the name of the indexed leaf. Each
+            # is a tuple of a dictionary mapping values to the keys of the
+            # entries that have that value, and one mapping each key to the
+            # value that it is indexed under.
+            self._indexes = {}
+            # The key of each indexed entry, keyed by the id() of the entry.
+            self._indexed = {}
+            # Set while entries are added by add_many(), during which changes
+            # to the entries are not propagated to the parent.
+            self._batch = False
 
         def __str__(self):
             return str(self._members)
@@ -569,26 +1170,11 @@ def YANGListType(*args, **kwargs):
             return repr(self._members)
 
         def __check__(self, v):
+            # Any generated class (which defines __slots__) is accepted as
+            # the value of an entry, and is loaded into the contained class.
             if self._contained_class is None:
                 return False
-            try:
-                tmp = YANGDynClass(
-                    base=self._contained_class,
-                    parent=parent,
-                    yang_name=yang_name,
-                    is_container=is_container,
-                    path_helper=False,
-                )
-                valid = False
-                if not tmp.__slots__ == v.__slots__:
-                    valid = True
-                elif self._contained_class.__slots__ == v.__slots__:
-                    valid = True
-                if valid is False:
-                    return valid
-            except Exception:
-                return False
-            return True
+            return hasattr(v, "__slots__")
 
         def iteritems(self):
             return six.iteritems(self._members)
@@ -599,33 +1185,131 @@ def YANGListType(*args, **kwargs):
         def _key_to_native_key_type(self, k):
             if self._keyval is False:
                 raise AttributeError("List does not have a key")
-            elif " " in self._keyval:
+            elif len(self._key_names) > 1:
                 raise AttributeError("Multiple key, string type should be used")
             else:
                 member = self._members[k]
                 getfn = getattr(member, "_get_%s" % self._keyval)
                 return getfn()
 
+        def _native_key(self, k):
+            """
+            Return the key that the entry for k is stored under. Entries of
+            lists with multiple keys are stored under a tuple of the string
+            values of each key, which may also be specified as a string with
+            the values separated by spaces.
+            """
+            if len(self._key_names) < 2:
+                return k
+            if isinstance(k, tuple):
+                keyparts = k
+            elif isinstance(k, six.string_types + (six.text_type,)):
+                keyparts = k.split(" ")
+            else:
+                raise KeyError("YANGList key must be a tuple or string of key elements (%s)" % (list(self._key_names)))
+            if not len(keyparts) == len(self._key_names):
+                raise KeyError("YANGList key must contain all key elements (%s)" % (list(self._key_names)))
+            return tuple(six.text_type(i) for i in keyparts)
+
+        def _key_string(self, k):
+            """
+            Return the string form of the key k, as used when serialising the
+            list.
+            """
+            if isinstance(k, tuple):
+                return " ".join(k)
+            return k
+
         def __iter__(self):
             return iter(self._members)
 
+        def _find_key(self, k):
+            """
+            Return the key that the entry for k is stored under, or None if
+            there is no such entry.
+            """
+            try:
+                native_key = self._native_key(k)
+            except KeyError:
+                if len(self._key_names) < 2 or not isinstance(k, six.string_types + (six.text_type,)):
+                    return None
+                # a string key with values that contain spaces, which can be
+                # split into its key elements in more than one way.
+                for native_key in self._split_key_string(k):
+                    if native_key in self._members:
+                        return native_key
+                return None
+            return native_key if native_key in self._members else None
+
+        def _find_typed_key(self, k):
+            """
+            Return the key that the entry for k is stored under, or None if
+            there is no such entry, where k is converted to the type of the
+            key of a list with a single key. Entries are stored under the
+            key that they were added with, such that the entry for key 1 may
+            be stored under 1 or "1", and is found by either.
+            """
+            native_key = self._find_key(k)
+            if native_key is not None or not len(self._key_names) == 1:
+                return native_key
+            entry = self._contained_class()
+            try:
+                getattr(entry, self._key_setters[self._key_names[0]])(k)
+            except (ValueError, TypeError):
+                # a value that is not valid for the key is not the key of
+                # any entry.
+                return None
+            typed_key = getattr(entry, "_get_%s" % self._key_names[0])()
+            for native_key in (typed_key, six.text_type(typed_key)):
+                try:
+                    if native_key in self._members:
+                        return native_key
+                except TypeError:
+                    continue
+            return None
+
+        def _split_key_string(self, k):
+            """
+            Return each tuple of key values that the string k, in which the
+            values are separated by spaces, can be split into where the values
+            themselves contain spaces.
+            """
+            parts = k.split(" ")
+            for cuts in itertools.combinations(range(1, len(parts)), len(self._key_names) - 1):
+                bounds = (0,) + cuts + (len(parts),)
+                yield tuple(" ".join(parts[start:end]) for start, end in zip(bounds, bounds[1:]))
+
         def __contains__(self, k):
-            if k in self._members:
-                return True
-            return False
+            try:
+                return self._find_key(k) is not None
+            except TypeError:
+                return False
 
         def __getitem__(self, k):
-            return self._members[k]
+            native_key = self._find_key(k)
+            if native_key is None:
+                raise KeyError(k)
+            return self._members[native_key]
 
         def __setitem__(self, k, v):
             self.__set(_k=k, _v=v)
 
+        def _before_change(self):
+            # snapshots that share the list take their copy of it before it
+            # is changed.
+            child_changing = getattr(getattr(self, "_parent", None), "_child_changing", None)
+            if child_changing is not None:
+                child_changing(self)
+
         def __set(self, *args, **kwargs):
+            self._before_change()
             k = kwargs.pop("_k", None)
             v = kwargs.pop("_v", None)
             named_set = kwargs.pop("_named_set", False)
 
-            if k is None and self._keyval and not named_set:
+            if named_set:
+                k = kwargs.pop("_python_key", None)
+            elif k is None and self._keyval:
                 k = args[0]
             elif k is None:
                 # this is a list that does not have a key specified, and hence
@@ -633,6 +1317,9 @@ def YANGListType(*args, **kwargs):
                 # returns the uuid for the upstream process to use
                 k = six.text_type(uuid.uuid1())
 
+            if self._keyval:
+                k = self._native_key(k)
+
             update = False
             if v is not None:
                 if not self.__check__(v):
@@ -645,55 +1332,26 @@ def YANGListType(*args, **kwargs):
 
             if self._keyval:
                 try:
-                    tmp = YANGDynClass(
-                        base=self._contained_class,
-                        parent=parent,
-                        yang_name=yang_name,
-                        is_container="container",
-                        path_helper=False,
-                    )
-                    keydict = None
-
-                    if " " in self._keyval and not named_set:
-                        keys = self._keyval.split(" ")
-                        keyparts = k.split(" ")
-                        keydict = {}
-                        for kp, kv in zip(keys, keyparts):
-                            keydict[kp] = kv
-
-                        if not len(keyparts) == len(keys):
-                            raise KeyError(
-                                "YANGList key must contain all key elements (%s)" % (self._keyval.split(" "))
-                            )
-                    elif named_set:
-                        k = kwargs.pop("_python_key", None)
+                    if named_set:
                         keydict = copy.copy(kwargs)
+                    elif len(self._key_names) > 1:
+                        keydict = dict(zip(self._key_names, k))
                     else:
                         if k == "":
                             raise KeyError("Cannot set a null key for a list entry!")
                         keydict = {self._keyval: k}
-                        kv_obj = getattr(tmp, self._keyval)
-                        path_keystring = "[%s='%s']" % (kv_obj.yang_name(), k)
-
-                    if keydict is not None:
-                        keys = self._keyval.split(" ")
-                        path_keystring = "["
-                        for kv in keys:
-                            kv_obj = getattr(tmp, kv)
-                            path_keystring += "%s='%s' " % (kv_obj.yang_name(), keydict[kv])
-                        path_keystring = path_keystring[:-1]
-                        path_keystring += "]"
+
+                    path_keystring = self._path_key_format % tuple(keydict[kn] for kn in self._key_names)
 
                     if not update:
                         tmp = YANGDynClass(
                             base=self._contained_class,
-                            parent=parent,
-                            yang_name=yang_name,
-                            is_container="container",
-                            path_helper=path_helper,
+                            parent=self._parent,
+                            schema=entry_schema,
+                            path_helper=self._path_helper,
                             register_path=(self._parent._path() + [self._yang_name + path_keystring]),
                             extmethods=self._parent._extmethods,
-                            extensions=extensions,
+                            yang_list=self,
                         )
                     else:
                         # hand the value to the init, rather than simply creating an empty
@@ -701,42 +1359,45 @@ def YANGListType(*args, **kwargs):
                         tmp = YANGDynClass(
                             v,
                             base=self._contained_class,
-                            parent=parent,
-                            yang_name=yang_name,
-                            is_container="container",
-                            path_helper=path_helper,
+                            parent=self._parent,
+                            schema=entry_schema,
+                            path_helper=self._path_helper,
                             register_path=(self._parent._path() + [self._yang_name + path_keystring]),
                             extmethods=self._parent._extmethods,
                             load=True,
-                            extensions=extensions,
+                            yang_list=self,
                         )
 
-                    if keydict is not None:
-                        for kn in keydict:
-                            key = getattr(tmp, "_set_%s" % safe_name(kn))
-                            key(keydict[kn], load=True)
+                    for kn in keydict:
+                        key = getattr(tmp, self._key_setters[kn])
+                        key(keydict[kn], load=True)
 
                     if hasattr(k, "_referenced_object") and k._referenced_object is not None:
                         k = k._referenced_object
 
+                    if k in self._members:
+                        self._unindex_entry(k, self._members[k])
                     self._members[k] = tmp
+                    self._index_entry(k, tmp)
 
                 except ValueError as m:
                     raise KeyError("key value must be valid, %s" % m)
             else:
                 self._members[k] = YANGDynClass(
                     base=self._contained_class,
-                    parent=parent,
-                    yang_name=yang_name,
-                    is_container=is_container,
-                    path_helper=path_helper,
+                    parent=self._parent,
+                    schema=unkeyed_entry_schema,
+                    path_helper=self._path_helper,
                     extmethods=self._parent._extmethods,
-                    extensions=extensions,
+                    yang_list=self,
                 )
+                self._index_entry(k, self._members[k])
                 return k
 
         def __delitem__(self, k):
-            del self._members[k]
+            k = self._native_key(k)
+            self._before_change()
+            self._unindex_entry(k, self._members.pop(k))
 
         def __len__(self):
             return len(self._members)
@@ -756,30 +1417,30 @@ def YANGListType(*args, **kwargs):
                 k = args[0]
             elif len(kwargs):
                 keyargs = {}
-                k = ""
-                for kn in self._keyval.split(" "):
+                for kn in self._key_names:
                     try:
                         keyargs[kn] = kwargs[kn]
                     except KeyError as m:
                         raise AttributeError(
                             "Keyword list add function must have all " + "keys specified - cannot find %s" % m
                         )
-                    k += "%s " % kwargs[kn]
-                k = k[:-1]
+                if len(self._key_names) > 1:
+                    k = tuple(six.text_type(keyargs[kn]) for kn in self._key_names)
+                else:
+                    k = six.text_type(keyargs[self._keyval])
             else:
                 k = None
             return (k, keyargs)
 
         def _extract_key(self, obj):
-            kp = self._keyval.split(" ")
-            if len(kp) > 1:
-                ks = ""
-                for k in kp:
+            if len(self._key_names) > 1:
+                ks = []
+                for k in self._key_names:
                     kv = getattr(obj, "_get_%s" % safe_name(k), None)
                     if kv is None:
                         raise KeyError("Invalid key attribute specified for object")
-                    ks += "%s " % six.text_type(kv())
-                return ks.rstrip(" ")
+                    ks.append(six.text_type(kv()))
+                return tuple(ks)
             else:
                 kv = getattr(obj, "_get_%s" % safe_name(self._keyval), None)
                 if kv is None:
@@ -800,77 +1461,397 @@ def YANGListType(*args, **kwargs):
 
             (k, keyargs) = self._generate_key(*args, **kwargs)
 
-            if k in self._members:
-                raise KeyError("%s is already defined as a list entry" % k)
+            if k is not None and k in self:
+                raise KeyError("%s is already defined as a list entry" % (self._key_string(self._native_key(k)),))
             if self._keyval and keyargs is None:
                 if k is None:
                     raise KeyError("a list with a key value must have a key specified")
                 self.__set(_k=k)
-                return self._members[k]
+                return self[k]
             elif self._keyval and keyargs is not None:
                 keyargs["_python_key"] = k
                 keyargs["_named_set"] = True
                 if value is not None:
                     keyargs["_v"] = value
                 self.__set(**keyargs)
-                return self._members[k]
+                return self[k]
             else:
                 k = self.__set()
                 return k
 
         def delete(self, *args, **kwargs):
             (k, _) = self._generate_key(*args, **kwargs)
+            if self._keyval:
+                k = self._native_key(k)
 
             if self._path_helper:
-                current_item = self._members[k]
-                if " " in self._keyval:
-                    keyparts = self._keyval.split(" ")
-                    keyargs = k.split(" ")
+                if k not in self._members:
+                    raise KeyError("key %s was not in list" % (self._key_string(k),))
+                if len(self._key_names) > 1:
                     key_string = "["
-                    for key, val in zip(keyparts, keyargs):
-                        kv_o = getattr(current_item, key)
-                        key_string += "%s=%s " % (kv_o.yang_name(), val)
+                    for key, val in zip(self._key_yang_names, k):
+                        key_string += "%s=%s " % (key, val)
                     key_string = key_string.rstrip(" ")
                     key_string += "]"
                 else:
-                    kv_o = getattr(current_item, self._keyval)
-                    key_string = "[@%s=%s]" % (kv_o.yang_name(), k)
+                    key_string = "[@%s=%s]" % (self._key_yang_names[0], k)
 
                 obj_path = self._parent._path() + [self._yang_name + key_string]
 
+            self._before_change()
             try:
-                del self._members[k]
+                self._unindex_entry(k, self._members.pop(k))
                 if self._path_helper:
                     self._path_helper.unregister(obj_path)
             except KeyError as m:
-                raise KeyError("key %s was not in list (%s)" % (k, m))
+                raise KeyError("key %s was not in list (%s)" % (self._key_string(k), m))
 
         def _item(self, *args, **kwargs):
-            keystr = ""
-            if " " in self._keyval:
-                keyparts = self._keyval.split(" ")
-            else:
-                keyparts = [self._keyval]
-            for kn in keyparts:
+            keyparts = []
+            for kn in self._key_names:
                 try:
-                    keystr += "%s " % kwargs[kn]
+                    keyparts.append(six.text_type(kwargs[kn]))
                 except KeyError:
                     raise KeyError("Must specify all keys to retrieve a list entry")
-            keystr = keystr[:-1]
 
-            return self._members[keystr]
+            return self._members[tuple(keyparts) if len(keyparts) > 1 else keyparts[0]]
 
-        def get(self, filter=False):
+        def add_many(self, keys):
+            """
+            Add an entry to the list for each of keys, which are specified
+            as to add() - either as the key value (a tuple of values for lists
+            with multiple keys), or a dictionary of key names to values.
+            Returns the new entries.
+
+            All keys are checked before any entry is added, and if any entry
+            cannot be added, none are. The new entries are registered with
+            the path helper in a single operation, and the parent is marked
+            as changed once, rather than for each entry.
+            """
+            return self._add_records(keys, False)
+
+        def from_records(self, records):
+            """
+            Add an entry to the list for each dictionary in records, which
+            map the names of leaves of the entry to their values. The keys of
+            each entry are taken from its record, and the remaining leaves are
+            set once the entry is created. Entries are added as per
+            add_many().
+            """
+            return self._add_records(records, True)
+
+        def _add_records(self, records, set_leaves):
+            if not self._keyval:
+                raise KeyError("entries can only be added in bulk to a list with a key")
+
+            batch = []
+            seen = set()
+            for record in records:
+                leaves = []
+                if isinstance(record, dict):
+                    keydict = {}
+                    for name, value in six.iteritems(record):
+                        name = safe_name(name)
+                        if name in self._key_setters:
+                            keydict[name] = value
+                        elif set_leaves:
+                            leaves.append((name, value))
+                    for kn in self._key_names:
+                        if kn not in keydict:
+                            raise AttributeError(
+                                "Keyword list add function must have all " + "keys specified - cannot find %s" % kn
+                            )
+                    k = self._native_key(
+                        tuple(keydict[kn] for kn in self._key_names)
+                        if len(self._key_names) > 1
+                        else six.text_type(keydict[self._keyval])
+                    )
+                elif set_leaves:
+                    raise TypeError("records must be dictionaries of leaf names and values")
+                else:
+                    k = self._native_key(record)
+                    if len(self._key_names) > 1:
+                        keydict = dict(zip(self._key_names, record if isinstance(record, tuple) else k))
+                    else:
+                        keydict = {self._keyval: record}
+                if k == "" or k is None:
+                    raise KeyError("Cannot set a null key for a list entry!")
+                if k in seen or k in self._members:
+                    raise KeyError("%s is already defined as a list entry" % (self._key_string(k),))
+                seen.add(k)
+                batch.append((k, keydict, leaves))
+
+            register_path = self._parent._path()
+            self._before_change()
+            added = []
+            # the paths of the entries that have been created, which may have
+            # been registered before the block exits (e.g., where the path
+            # helper is searched to check a leafref key).
+            entry_paths = []
+            self._batch = True
+            try:
+                with self._path_helper.deferred_registration() if self._path_helper else contextlib.nullcontext():
+                    for k, keydict, leaves in batch:
+                        path_keystring = self._path_key_format % tuple(keydict[kn] for kn in self._key_names)
+                        entry_paths.append(register_path + [self._yang_name + path_keystring])
+                        entry = YANGDynClass(
+                            base=self._contained_class,
+                            parent=self._parent,
+                            schema=entry_schema,
+                            path_helper=self._path_helper,
+                            register_path=entry_paths[-1],
+                            extmethods=self._parent._extmethods,
+                            yang_list=self,
+                        )
+                        try:
+                            for kn in self._key_names:
+                                getattr(entry, self._key_setters[kn])(keydict[kn], load=True)
+                        except ValueError as m:
+                            raise KeyError("key value must be valid, %s" % m)
+                        for name, value in leaves:
+                            setter = getattr(entry, "_set_%s" % name, None)
+                            if setter is None:
+                                raise AttributeError("%s is not a member of the list entries" % name)
+                            setter(value)
+                        self._members[k] = entry
+                        added.append((k, entry))
+            except Exception:
+                for k, _ in added:
+                    del self._members[k]
+                if self._path_helper:
+                    for entry_path in entry_paths:
+                        if self._path_helper.get(entry_path):
+                            self._path_helper.unregister(entry_path)
+                raise
+            finally:
+                self._batch = False
+
+            for k, entry in added:
+                self._index_entry(k, entry)
+            parent = getattr(self, "_parent", None)
+            if added and parent and hasattr(parent, "_set"):
+                parent._set()
+            return [entry for _, entry in added]
+
+        def add_index(self, leaf):
+            """
+            Maintain a secondary index of the entries of the list by the value
+            of the leaf named leaf, such that lookup() does not need to scan
+            the list to find entries by its value. The index is kept up to
+            date as entries are added, changed and removed.
+            """
+            leaf = safe_name(leaf)
+            if leaf in self._indexes:
+                return
+            schema_node = getattr(self._contained_class, "_pybind_element_schema", {}).get(leaf, None)
+            if schema_node is None or not schema_node.is_leaf:
+                raise ValueError("%s is not a leaf of the list entries, and cannot be indexed" % leaf)
+            self._indexes[leaf] = ({}, {})
+            for k, entry in six.iteritems(self._members):
+                self._index_entry(k, entry)
+
+        def _index_entry(self, k, entry):
+            if not self._indexes:
+                return
+            self._indexed[id(entry)] = k
+            for leaf, (by_value, by_key) in six.iteritems(self._indexes):
+                value = getattr(entry, "_get_%s" % leaf)()
+                if k in by_key:
+                    if by_key[k] == value:
+                        continue
+                    self._unindex_value(by_value, by_key, k)
+                by_key[k] = value
+                by_value.setdefault(value, collections.OrderedDict())[k] = None
+
+        def _unindex_value(self, by_value, by_key, k):
+            value = by_key.pop(k)
+            keys = by_value[value]
+            del keys[k]
+            if not keys:
+                del by_value[value]
+
+        def _unindex_entry(self, k, entry):
+            if not self._indexes:
+                return
+            self._indexed.pop(id(entry), None)
+            for by_value, by_key in six.itervalues(self._indexes):
+                if k in by_key:
+                    self._unindex_value(by_value, by_key, k)
+
+        def _entry_changed(self, entry):
+            """
+            Called when a leaf within an entry of the list is set, such that
+            any secondary indexes can be updated. Returns whether the change
+            should be propagated to the parent of the list.
+            """
+            if self._indexes:
+                k = self._indexed.get(id(entry), None)
+                if k is not None and self._members.get(k) is entry:
+                    self._index_entry(k, entry)
+            return not self._batch
+
+        def lookup(self, **kwargs):
+            """
+            Return the entries of the list whose leaves have the values that
+            are specified as keyword arguments (e.g., lookup(ifindex=42)).
+
+            Where all keys of the list are specified, the entry is retrieved
+            by its key, and where an indexed leaf is specified the index is
+            used to find candidate entries. Otherwise, the list is scanned.
+            """
+            criteria = dict((safe_name(k), v) for k, v in six.iteritems(kwargs))
+            if self._key_names and all(kn in criteria for kn in self._key_names):
+                keyparts = tuple(criteria.pop(kn) for kn in self._key_names)
+                if len(keyparts) > 1:
+                    k = self._native_key(keyparts)
+                else:
+                    # entries that are added by keyword are stored under the
+                    # string value of their key.
+                    k = keyparts[0] if keyparts[0] in self._members else six.text_type(keyparts[0])
+                candidates = [self._members[k]] if k in self._members else []
+            else:
+                indexed = [leaf for leaf in criteria if leaf in self._indexes]
+                if indexed:
+                    keys = None
+                    for leaf in indexed:
+                        try:
+                            matches = self._indexes[leaf][0].get(criteria.pop(leaf), {})
+                        except TypeError:
+                            return []
+                        keys = list(matches) if keys is None else [i for i in keys if i in matches]
+                    candidates = [self._members[k] for k in keys]
+                else:
+                    candidates = list(six.itervalues(self._members))
+            for leaf, value in six.iteritems(criteria):
+                getter = "_get_%s" % leaf
+                candidates = [i for i in candidates if getattr(i, getter)() == value]
+            return candidates
+
+        def _omits_entry(self, entry, changed_only):
+            """
+            Return whether entry is omitted from a serialisation of the list
+            that includes only the elements that have changed, where
+            changed_only is True. The entries of a keyed list are changed when
+            they are created, and hence are unchanged only after
+            clear_changes().
+            """
+            return bool(changed_only and self._keyval and not entry._changed())
+
+        def get(self, filter=False, skip=None):
             d = collections.OrderedDict()
             d._user_ordered = self._members._user_ordered
             for i in self._members:
+                if self._omits_entry(self._members[i], filter is True):
+                    continue
+                k = self._key_string(i)
+                entry_skip = None
+                if skip is not None:
+                    # skip is the SkipPaths within the list, whose entries
+                    # are skipped without being visited.
+                    entry_skip = skip.entry(k, self._members[i])
+                    if entry_skip is not None and entry_skip.skipped:
+                        continue
                 if hasattr(self._members[i], "get"):
-                    d[i] = self._members[i].get(filter=filter)
+                    d[k] = self._members[i].get(filter=filter, skip=entry_skip)
                 else:
-                    d[i] = self._members[i]
+                    d[k] = self._members[i]
             return d
 
-    return type(YANGList(*args, **kwargs))
+        def _snapshot(self, parent, path_helper=False):
+            """
+            Return a copy of the list within parent, whose entries are
+            snapshots of the entries of this list. The keys of the list are
+            copied, and the snapshot of each entry is taken when it is first
+            accessed.
+            """
+            snapshot = _copy_slots(self)
+            snapshot._parent = parent
+            snapshot._path_helper = path_helper
+            metadata = getattr(self, "_pybind_metadata", None)
+            if metadata is not None:
+                snapshot._pybind_metadata = dict(metadata)
+            members = _SnapshotMembers(self._members, snapshot)
+            members._user_ordered = self._members._user_ordered
+            snapshot._members = members
+            snapshot._indexes = dict(
+                (
+                    leaf,
+                    (
+                        dict((value, collections.OrderedDict(keys)) for value, keys in six.iteritems(by_value)),
+                        dict(by_key),
+                    ),
+                )
+                for leaf, (by_value, by_key) in six.iteritems(self._indexes)
+            )
+            snapshot._indexed = {}
+            snapshot._batch = False
+
+            # the snapshot takes its copy of each entry that it shares before
+            # the entry is changed.
+            backers = getattr(self, "_pybind_backers", None)
+            if backers is None:
+                backers = self._pybind_backers = []
+            backers.append(weakref.ref(snapshot))
+            modifications = getattr(self._parent, "_modifications", None)
+            if modifications is not None:
+                counter = modifications()
+                if counter.backers is None:
+                    counter.backers = weakref.WeakSet()
+                counter.backers.add(snapshot)
+            return snapshot
+
+        def _entry_changing(self, entry):
+            """
+            Called before entry, an entry of the list, is changed, such that
+            each snapshot of the list that shares the entry takes its copy of
+            it first.
+            """
+            backers = getattr(self, "_pybind_backers", None)
+            if not backers:
+                return
+            live = []
+            for ref in backers:
+                backer = ref()
+                if backer is None:
+                    continue
+                live.append(ref)
+                backer._members._entry_changing(entry)
+                # snapshots of the snapshot may share the entry too.
+                backer._entry_changing(entry)
+            self._pybind_backers = live
+
+        def snapshot(self):
+            """
+            Return a copy of the list, whose entries share the elements of the
+            entries of this list until they are changed - either in the copy
+            or in this list. Taking the copy copies the keys of the list, and
+            the copy of each entry is created when it is first accessed, or
+            before the entry is changed in this list. The copy is not
+            registered with a path helper.
+            """
+            return self._snapshot(_DetachedParent(self._parent))
+
+        def clone(self, path_helper=None):
+            """
+            Return a copy of the list that is registered with path_helper.
+            Where path_helper is not specified, and this list is registered
+            with a path helper, a new YANGPathHelper is used - otherwise, the
+            copy is a snapshot().
+            """
+            from pyangbind.lib.base import _clone
+
+            return _clone(self, path_helper)
+
+        def memory_report(self):
+            """
+            Return a summary of the memory used by the list and its entries,
+            as per the memory_report() method of a container.
+            """
+            from pyangbind.lib.base import _memory_report
+
+            return _memory_report(self)
+
+    return YANGList
 
 
 class YANGBool(int):
@@ -901,115 +1882,139 @@ class YANGBool(int):
         return str(self.__repr__())
 
 
-def YANGDynClass(*args, **kwargs):
+class YANGSchemaNode(object):
+    """
+    The attributes of a node of the schema that are the same for every
+    instance of it - such as its YANG name, namespace and type - which are
+    shared by each instance rather than being stored against it. The plugin
+    emits one YANGSchemaNode for each element of each container, which is
+    supplied to YANGDynClass as its schema argument. A YANGSchemaNode cannot
+    be modified once it is created.
     """
-    Wrap an type - specified in the base_type arugment - with
-    a set of custom attributes that YANG specifies (or are required
-    for serialisation of that object). Particularly:
 
-      - base_type:  the original type - for example, string, int.
-      - default:    the YANG specified default value of the type.
-      - yang_name:  the YANG name of the type (as opposed to a 'safe'
-                    Python version).
-      - parent:     the class which this type is a member of in the
-                    YANG-specified tree.
-      - choice:     The choice branch that this type is a member of.
-      - is_{container,leaf}: whether this element is a container or
-                             a leaf.
-      - path_helper: pyangbind helper class to allow XPATH lookups.
-      - supplied_register_path: an override for the path that this
-                                object should register to. This is
-                                used when an element is a member of
-                                a list to add the key attributes to
-                                the path.
-      - extensions:  The list of extensions that should be stored
-                     with the type.
-      - is_config:   Whether this is a configuration (editable)
-                     node.
-      - presence:    Whether the YANG container that is being
-                     represented has the presence keyword
+    __slots__ = (
+        "default",
+        "yang_name",
+        "choice",
+        "is_container",
+        "is_leaf",
+        "extensions",
+        "is_keyval",
+        "register_paths",
+        "yang_type",
+        "namespace",
+        "defining_module",
+        "is_config",
+        "presence",
+    )
+
+    def __init__(
+        self,
+        default=False,
+        yang_name=False,
+        choice=False,
+        is_container=False,
+        is_leaf=False,
+        extensions=None,
+        is_keyval=False,
+        register_paths=True,
+        yang_type=None,
+        namespace=None,
+        defining_module=None,
+        is_config=True,
+        presence=None,
+    ):
+        values = locals()
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+        if not default:
+            object.__setattr__(self, "default", False)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("%s cannot be modified" % type(self).__name__)
+
+    def __repr__(self):
+        return "%s(%s)" % (type(self).__name__, self.yang_name)
+
+
+# The attributes that are stored against every instance of a class built by
+# YANGDynClass - those that are the same for each instance of a schema node
+# are read from its YANGSchemaNode. Containers and lists use these as their
+# __slots__.
+dynclass_slots = (
+    "_schema_node",
+    "_mchanged",
+    "_parent",
+    "_supplied_register_path",
+    "_path_helper",
+    "_extmethods",
+    "_pybind_metadata",
+    "_cpresent",
+    "_yang_list",
+)
+
+
+def _choice_exclusions(base_type):
     """
-    base_type = kwargs.pop("base", False)
-    default = kwargs.pop("default", False)
-    yang_name = kwargs.pop("yang_name", False)
-    parent_instance = kwargs.pop("parent", False)
-    choice_member = kwargs.pop("choice", False)
-    is_container = kwargs.pop("is_container", False)
-    is_leaf = kwargs.pop("is_leaf", False)
-    path_helper = kwargs.pop("path_helper", None)
-    supplied_register_path = kwargs.pop("register_path", None)
-    extensions = kwargs.pop("extensions", None)
-    extmethods = kwargs.pop("extmethods", None)
-    is_keyval = kwargs.pop("is_keyval", False)
-    register_paths = kwargs.pop("register_paths", True)
-    yang_type = kwargs.pop("yang_type", None)
-    namespace = kwargs.pop("namespace", None)
-    defining_module = kwargs.pop("defining_module", None)
-    load = kwargs.pop("load", None)
-    is_config = kwargs.pop("is_config", True)
-    has_presence = kwargs.pop("presence", None)
+    Return a dict, keyed by (choice, case), of the elements of a container
+    class that must be unset when an element within that case of the choice
+    is set, along with the name of the method that unsets each.
+    """
+    exclusions = {}
+    for ch, cases in six.iteritems(getattr(base_type, "__choices__", {})):
+        for case in cases:
+            exclusions[(ch, case)] = tuple(
+                (elem, "_unset_%s" % elem) for other in cases if other != case for elem in cases[other]
+            )
+    return exclusions
 
-    if not base_type:
-        raise TypeError("must have a base type")
 
-    if isinstance(base_type, list):
-        # this is a union, we must infer type
-        if not len(args):
-            # there is no argument to infer the type from
-            # so use the first type (default)
-            base_type = base_type[0]
-        else:
-            type_test = False
-            for candidate_type in base_type:
-                try:
-                    type_test = candidate_type(args[0])  # does the slipper fit?
-                    break
-                except Exception:
-                    pass  # don't worry, move on, plenty more fish (types) in the sea...
-            if type_test is False:
-                # we're left alone at midnight -- no types fit the arguments
-                raise TypeError("did not find a valid type using the argument as a" + " hint")
-            # otherwise, hop, skip and jump with the last candidate
-            base_type = candidate_type
-
-    clsslots = [
-        "_default",
-        "_mchanged",
-        "_yang_name",
-        "_choice",
-        "_parent",
-        "_supplied_register_path",
-        "_path_helper",
-        "_base_type",
-        "_is_leaf",
-        "_is_container",
-        "_extensionsd",
-        "_extmethods",
-        "_is_keyval",
-        "_register_paths",
-        "_namespace",
-        "_yang_type",
-        "_defining_module",
-        "_metadata",
-        "_is_config",
-        "_cpresent",
-        "_presence",
-    ]
+def _get_dynclass(base_type, slotted, clsslots):
+    """
+    Return the YANGBaseClass that wraps base_type, building it only the first
+    time that a particular base type and set of class-level options is seen.
+    """
+    cache = _base_type_cache(base_type, "_pybind_dynclass_cache")
+    cache_key = (slotted, clsslots)
+    dynclass = cache.get(cache_key, None)
+    if dynclass is None:
+        dynclass = _build_dynclass(base_type, slotted, clsslots)
+        cache[cache_key] = dynclass
+    return dynclass
 
-    if extmethods:
-        rpath = None
-        if supplied_register_path is not None:
-            rpath = supplied_register_path
-        if parent_instance is not None:
-            rpath = parent_instance._path() + [yang_name]
-        else:
-            rpath = []
-        chk_path = "/" + "/".join(remove_path_attributes(rpath))
-        if chk_path in extmethods:
-            for method in [i for i in dir(extmethods[chk_path]) if not i.startswith("_")]:
-                clsslots.append("_" + method)
 
-    class YANGBaseClass(base_type):
+class _YANGSchemaAttributes(object):
+    """
+    The attributes of an object built by YANGDynClass that are read from its
+    YANGSchemaNode. These are defined once, rather than by each class that
+    YANGDynClass builds.
+    """
+
+    __slots__ = ()
+
+    _default = property(attrgetter("_schema_node.default"))
+    _yang_name = property(attrgetter("_schema_node.yang_name"))
+    _choice = property(attrgetter("_schema_node.choice"))
+    _is_leaf = property(attrgetter("_schema_node.is_leaf"))
+    _is_container = property(attrgetter("_schema_node.is_container"))
+    _is_config = property(attrgetter("_schema_node.is_config"))
+    _extensionsd = property(attrgetter("_schema_node.extensions"))
+    _is_keyval = property(attrgetter("_schema_node.is_keyval"))
+    _register_paths = property(attrgetter("_schema_node.register_paths"))
+    _namespace = property(attrgetter("_schema_node.namespace"))
+    _yang_type = property(attrgetter("_schema_node.yang_type"))
+    _defining_module = property(attrgetter("_schema_node.defining_module"))
+    _presence = property(attrgetter("_schema_node.presence"))
+
+    @property
+    def _metadata(self):
+        # the dictionary of metadata is created when metadata is first added.
+        metadata = getattr(self, "_pybind_metadata", None)
+        return metadata if metadata is not None else {}
+
+
+def _build_dynclass(base_type, slotted, clsslots):
+    class YANGBaseClass(_YANGSchemaAttributes, base_type):
         # we only create slots for things that are restricted
         # in adding attributes to them - this means containing
         # data nodes. This means that we can allow
@@ -1017,40 +2022,38 @@ def YANGDynClass(*args, **kwargs):
         # also fixes an issue whereby we could set __slots__
         # and try and inherit a variable-length inbuilt such
         # as long, which is not allowed.
-        if yang_type in ["container", "list"] or is_container == "container":
-            __slots__ = tuple(clsslots)
+        if slotted:
+            __slots__ = clsslots
 
         _pybind_base_class = regex.sub("<(type|class) '(?P<class>.*)'>", "\g<class>", str(base_type))
+        _pybind_choice_exclusions = _choice_exclusions(base_type)
+        _base_type = base_type
 
         def __new__(self, *args, **kwargs):
+            attrs = kwargs.pop("_pybind_attrs", None)
             try:
                 obj = base_type.__new__(self, *args, **kwargs)
             except TypeError:
+                # when trying the members of a union, an argument that the
+                # base type does not accept must not result in an empty value.
+                if attrs is not None and attrs["strict"]:
+                    raise
                 obj = base_type.__new__(self)
             return obj
 
         def __init__(self, *args, **kwargs):
-            self._default = False
+            attrs = kwargs.pop("_pybind_attrs")
+            load = attrs["load"]
+
+            self._schema_node = attrs["schema"]
             self._mchanged = False
-            self._yang_name = yang_name
-            self._parent = parent_instance
-            self._choice = choice_member
-            self._path_helper = path_helper
-            self._supplied_register_path = supplied_register_path
-            self._base_type = base_type
-            self._is_leaf = is_leaf
-            self._is_container = is_container
-            self._is_config = is_config
-            self._extensionsd = extensions
-            self._extmethods = extmethods
-            self._is_keyval = is_keyval
-            self._register_paths = register_paths
-            self._namespace = namespace
-            self._yang_type = yang_type
-            self._defining_module = defining_module
-            self._metadata = {}
-            self._presence = has_presence
+            self._parent = attrs["parent"]
+            self._path_helper = attrs["path_helper"]
+            self._supplied_register_path = attrs["register_path"]
+            self._extmethods = attrs["extmethods"]
             self._cpresent = False
+            if attrs["yang_list"] is not None:
+                self._yang_list = attrs["yang_list"]
 
             if self._extmethods:
                 chk_path = "/" + "/".join(remove_path_attributes(self._register_path()))
@@ -1064,10 +2067,13 @@ def YANGDynClass(*args, **kwargs):
                             if not hasattr(self, "_method"):
                                 setattr(self, "_" + method, self.__generate_extmethod(member))
 
-            if default:
-                self._default = default
             if len(args):
-                self._set()
+                # an object that is created to wrap an existing value is
+                # given its changed state, rather than being changed.
+                if attrs["changed"] is None:
+                    self._set()
+                else:
+                    self._mchanged = attrs["changed"]
 
             # lists themselves do not register, only elements within them
             # are actually created in the tree.
@@ -1111,31 +2117,66 @@ def YANGDynClass(*args, **kwargs):
             return super(YANGBaseClass, self).__repr__()
 
         def _set(self, choice=False):
-            if hasattr(self, "__choices__") and choice:
-                for ch in self.__choices__:
-                    if ch == choice[0]:
-                        for case in self.__choices__[ch]:
-                            if not case == choice[1]:
-                                for elem in self.__choices__[ch][case]:
-                                    method = "_unset_%s" % elem
-                                    if not hasattr(self, method):
-                                        raise AttributeError("unmapped choice!")
-                                    x = getattr(self, method)
-                                    x()
-
-            if self._choice and not choice:
-                choice = self._choice
+            # snapshots that share this object take their copy of it before
+            # it is changed.
+            parent = self._parent
+            child_changing = getattr(parent, "_child_changing", None)
+            if child_changing is not None:
+                child_changing(self)
+
+            if choice:
+                self._exclude_cases(choice)
+
+            # an object that is already changed (and present) has propagated
+            # the change to each of its ancestors, so propagation can stop
+            # here.
+            propagated = self._mchanged and (self._cpresent or not self._presence)
 
             self._mchanged = True
 
             if self._presence:
                 self._cpresent = True
 
-            if self._parent and hasattr(self._parent, "_set"):
-                self._parent._set(choice=choice)
+            # record the change in the parent's journal of changed elements,
+            # such that filtered serialisation visits only changed branches.
+            if not propagated:
+                mark_dirty = getattr(parent, "_mark_dirty", None)
+                if mark_dirty is not None:
+                    mark_dirty(safe_name(self._yang_name))
+
+            # entries of a list update the list's secondary indexes, and are
+            # not propagated while the list is being populated in bulk.
+            yang_list = getattr(self, "_yang_list", None)
+            if yang_list is not None and not yang_list._entry_changed(self):
+                return
+
+            if not propagated and parent and hasattr(parent, "_set"):
+                parent._set(choice=self._choice)
+                return
+
+            modifications = getattr(self, "_modifications", None) or getattr(parent, "_modifications", None)
+            if modifications is not None:
+                modifications().tick()
+
+        def _exclude_cases(self, choice):
+            # unset the elements within the other cases of the choice that
+            # the element that was set is within.
+            for elem, method in self._pybind_choice_exclusions.get((choice[0], choice[1]), ()):
+                if not self._materialised(elem):
+                    continue
+                unset = getattr(self, method, None)
+                if unset is None:
+                    raise AttributeError("unmapped choice!")
+                self._before_change(elem)
+                unset()
 
         def _add_metadata(self, k, v):
-            self._metadata[k] = v
+            metadata = getattr(self, "_pybind_metadata", None)
+            if metadata is None:
+                metadata = self._pybind_metadata = {}
+                if self._is_leaf and self._parent is not None:
+                    _store_leaf_metadata(self._parent, self, metadata)
+            metadata[k] = v
 
         def yang_name(self):
             return self._yang_name
@@ -1182,6 +2223,12 @@ def YANGDynClass(*args, **kwargs):
             self._set()
             super(YANGBaseClass, self).insert(*args, **kwargs)
 
+        def __delitem__(self, *args, **kwargs):
+            if not hasattr(super(YANGBaseClass, self), "__delitem__"):
+                raise AttributeError("%s object has no attribute __delitem__" % base_type)
+            self._set()
+            super(YANGBaseClass, self).__delitem__(*args, **kwargs)
+
         def _register_path(self):
             if self._supplied_register_path is not None:
                 return self._supplied_register_path
@@ -1201,6 +2248,9 @@ def YANGDynClass(*args, **kwargs):
         def _set_present(self, present=True):
             if not self._is_container == "container":
                 raise AttributeError("Cannot set presence on a non-container")
+            child_changing = getattr(self._parent, "_child_changing", None)
+            if child_changing is not None:
+                child_changing(self)
             self._cpresent = present
             if present is True:
                 self._set()
@@ -1214,7 +2264,331 @@ def YANGDynClass(*args, **kwargs):
 
             return self._cpresent
 
-    return YANGBaseClass(*args, **kwargs)
+    return YANGBaseClass
+
+
+class YANGUnionDispatch(object):
+    """
+    The dispatch table of a YANG union, built once for each set of member
+    types.
+
+    The members of the union are tried in the order in which they are
+    specified, and the first that accepts a value is used. Members that can
+    never accept a particular Python type of input value (e.g., a string
+    restricted solely by a pattern, when supplied an integer) are skipped,
+    the candidates for each input type being determined when it is first
+    seen. The number of values that each member has matched is counted in
+    matches.
+    """
+
+    # Members whose value is checked in __init__ rather than __new__ are
+    # tested before the leaf is created, such that a value that they reject
+    # is not registered in the data tree.
+    _checked_on_init = ["ReferencePathType", "YANGBits"]
+
+    __slots__ = ("members", "matches", "_plan", "_candidates", "__weakref__")
+
+    def __init__(self, members):
+        self.members = tuple(members)
+        self.matches = [0] * len(self.members)
+        plan = []
+        for i, only_strings in [(j[0], j[2]) for j in _coercion_plan(self.members)]:
+            generated_by = getattr(i, "_pybind_generated_by", None)
+            # str() accepts any value, unlike in a TypedList.
+            if i == six.text_type:
+                only_strings = False
+            plan.append((i, generated_by not in self._checked_on_init, generated_by is None, only_strings))
+        self._plan = tuple(plan)
+        self._candidates = {}
+
+    def candidates(self, value_type):
+        """
+        Return the indices of the members that may accept a value of
+        value_type, in the order in which they should be tried.
+        """
+        candidates = self._candidates.get(value_type, None)
+        if candidates is None:
+            is_string = issubclass(value_type, six.string_types + (six.text_type,))
+            candidates = tuple(
+                idx
+                for idx, (i, _, _, only_strings) in enumerate(self._plan)
+                if is_string or not only_strings or issubclass(value_type, i)
+            )
+            self._candidates[value_type] = candidates
+        return candidates
+
+    def discard(self, value_type, idx):
+        """
+        Stop trying the member at idx for values of value_type.
+        """
+        self._candidates[value_type] = tuple(i for i in self.candidates(value_type) if i != idx)
+
+    def construct(self, args, kwargs, attrs):
+        """
+        Create a leaf from args using the first member of the union that
+        accepts args[0]. Each candidate value is constructed only once.
+        """
+        value_type = type(args[0])
+        for idx in self.candidates(value_type):
+            member, direct, builtin, _ = self._plan[idx]
+            dynclass = _get_dynclass(member, False, ())
+            if not direct:
+                try:
+                    member(args[0])
+                except Exception:
+                    continue
+                self.matches[idx] += 1
+                return dynclass(*args, _pybind_attrs=attrs, **kwargs)
+            attrs["strict"] = True
+            try:
+                obj = dynclass(*args, _pybind_attrs=attrs, **kwargs)
+            except TypeError:
+                # a built-in type that does not accept the type of input
+                # value never will.
+                if builtin:
+                    self.discard(value_type, idx)
+                continue
+            except Exception:
+                continue
+            self.matches[idx] += 1
+            return obj
+        raise TypeError("did not find a valid type using the argument as a hint")
+
+    def stats(self):
+        """
+        Return a list of (member, matches) tuples for the union.
+        """
+        return list(zip(self.members, self.matches))
+
+
+def get_union_dispatch(members):
+    """
+    Return the dispatch table for a union of the types in members. The table
+    is shared by all unions of the same types, unless one of them is built
+    for each instance.
+    """
+    members = tuple(members)
+    if any(_is_per_instance_type(i) for i in members):
+        return YANGUnionDispatch(members)
+    cache = _base_type_cache(members[0], "_pybind_union_cache")
+    dispatch = cache.get(members, None)
+    if dispatch is None:
+        dispatch = YANGUnionDispatch(members)
+        cache[members] = dispatch
+    return dispatch
+
+
+def YANGDynClass(*args, **kwargs):
+    """
+    Wrap an type - specified in the base_type arugment - with
+    a set of custom attributes that YANG specifies (or are required
+    for serialisation of that object). Particularly:
+
+      - base_type:  the original type - for example, string, int.
+      - schema:     a YANGSchemaNode holding the attributes below that
+                    are the same for every instance of the node. Where
+                    it is not supplied, one is created from them.
+      - default:    the YANG specified default value of the type.
+      - yang_name:  the YANG name of the type (as opposed to a 'safe'
+                    Python version).
+      - parent:     the class which this type is a member of in the
+                    YANG-specified tree.
+      - choice:     The choice branch that this type is a member of.
+      - is_{container,leaf}: whether this element is a container or
+                             a leaf.
+      - path_helper: pyangbind helper class to allow XPATH lookups.
+      - supplied_register_path: an override for the path that this
+                                object should register to. This is
+                                used when an element is a member of
+                                a list to add the key attributes to
+                                the path.
+      - extensions:  The list of extensions that should be stored
+                     with the type.
+      - is_config:   Whether this is a configuration (editable)
+                     node.
+      - presence:    Whether the YANG container that is being
+                     represented has the presence keyword
+      - yang_list:   The YANGList that this object is an entry of.
+      - changed:     Whether an object created with a value is changed,
+                     where it wraps a value that was stored earlier. By
+                     default, setting a value is a change.
+
+    The class that wraps the base type is built once for each base type
+    and set of class-level options (whether it has __slots__, and which
+    extension methods are slotted), and is then re-used by subsequent
+    calls. All other arguments are stored against the instance.
+    """
+    base_type = kwargs.pop("base", False)
+    schema = kwargs.pop("schema", None)
+    if schema is None:
+        schema = YANGSchemaNode(
+            **dict((name, kwargs.pop(name)) for name in YANGSchemaNode.__slots__ if name in kwargs)
+        )
+    attrs = {
+        "schema": schema,
+        "parent": kwargs.pop("parent", False),
+        "path_helper": kwargs.pop("path_helper", None),
+        "register_path": kwargs.pop("register_path", None),
+        "extmethods": kwargs.pop("extmethods", None),
+        "load": kwargs.pop("load", None),
+        "yang_list": kwargs.pop("yang_list", None),
+        "changed": kwargs.pop("changed", None),
+        "strict": False,
+    }
+
+    if not base_type:
+        raise TypeError("must have a base type")
+
+    if isinstance(base_type, list):
+        # this is a union, we must infer type
+        if not len(args):
+            # there is no argument to infer the type from
+            # so use the first type (default)
+            base_type = base_type[0]
+        else:
+            # union members are leaves, and hence their classes are never
+            # slotted.
+            return get_union_dispatch(base_type).construct(args, kwargs, attrs)
+
+    clsslots = dynclass_slots
+    extmethods = attrs["extmethods"]
+    if extmethods:
+        rpath = None
+        if attrs["register_path"] is not None:
+            rpath = attrs["register_path"]
+        if attrs["parent"] is not None:
+            rpath = attrs["parent"]._path() + [schema.yang_name]
+        else:
+            rpath = []
+        chk_path = "/" + "/".join(remove_path_attributes(rpath))
+        if chk_path in extmethods:
+            clsslots += tuple(["_" + method for method in dir(extmethods[chk_path]) if not method.startswith("_")])
+
+    slotted = schema.yang_type in ["container", "list"] or schema.is_container == "container"
+    dynclass = _get_dynclass(base_type, slotted, clsslots if slotted else ())
+
+    return dynclass(*args, _pybind_attrs=attrs, **kwargs)
+
+
+# The built-in types that the value of a compactly stored leaf is held as.
+_leaf_value_types = (bool, Decimal, float, six.text_type, six.binary_type) + six.integer_types
+
+
+def _leaf_value(leaf):
+    """
+    Return the value of leaf as an instance of the built-in type that its
+    class is derived from, such that it does not hold the attributes of the
+    leaf.
+    """
+    cls = type(leaf)
+    cache = _base_type_cache(cls, "_pybind_leaf_value_type")
+    value_type = cache.get(cls, None)
+    if value_type is None:
+        value_type = next((c for c in cls.__mro__ if c in _leaf_value_types), False)
+        cache[cls] = value_type
+    return value_type(leaf) if value_type else leaf
+
+
+class YANGLeafSchema(object):
+    """
+    The arguments to YANGDynClass that are the same for every instance of a
+    leaf, shared by each instance of the container that the leaf is within.
+
+    Classes generated with --compact-leaves store only the value of such a
+    leaf in the slot of the container (None where the leaf is not set), and
+    whether it is changed in the container's journal of changed elements.
+    The leaf object is created from the value each time that it is accessed,
+    and metadata that is added to it is stored by the container. Leaves are
+    not compact where a path helper is used, since they are not registered
+    with it.
+    """
+
+    __slots__ = ("name", "slot", "kwargs")
+
+    def __init__(self, name, slot, **kwargs):
+        self.name = name
+        self.slot = slot
+        self.kwargs = kwargs
+
+    def leaf(self, parent, value, changed=None):
+        """
+        Return the leaf object within parent that holds value.
+        """
+        args = (value,) if value is not None else ()
+        leaf = YANGDynClass(
+            *args,
+            parent=parent,
+            path_helper=parent._path_helper,
+            extmethods=parent._extmethods,
+            changed=changed,
+            **self.kwargs,
+        )
+        stored = getattr(parent, "_pybind_leaf_metadata", None)
+        if stored:
+            metadata = stored.get(self.name, None)
+            if metadata is not None:
+                leaf._pybind_metadata = metadata
+        return leaf
+
+    def get(self, parent):
+        """
+        Return the leaf object for the value that is stored in parent.
+        """
+        try:
+            value = getattr(parent, self.slot)
+        except AttributeError:
+            parent._materialise(self.name)
+            value = getattr(parent, self.slot)
+        dirty = parent._changed_elements()
+        return self.leaf(parent, value, changed=dirty is not None and self.name in dirty)
+
+    def set(self, parent, leaf):
+        """
+        Store the value of leaf, which was created by leaf(), in parent.
+        """
+        setattr(parent, self.slot, _leaf_value(leaf))
+        # a new value is a new leaf object, without metadata.
+        self._discard_metadata(parent)
+
+    def unset(self, parent):
+        """
+        Return the leaf within parent to its default, unchanged, state.
+        """
+        setattr(parent, self.slot, None)
+        dirty = getattr(parent, "_pybind_dirty", None)
+        if dirty:
+            dirty.discard(self.name)
+        self._discard_metadata(parent)
+
+    def _discard_metadata(self, parent):
+        stored = getattr(parent, "_pybind_leaf_metadata", None)
+        if stored:
+            stored.pop(self.name, None)
+
+
+def _store_leaf_metadata(parent, leaf, metadata):
+    """
+    Store metadata, which has been added to leaf, in parent where leaf is a
+    compact leaf of parent, such that it is retained by the leaf objects
+    that are subsequently created for the value of the leaf.
+    """
+    cls = type(parent)
+    cache = _base_type_cache(cls, "_pybind_compact_leaf_names")
+    names = cache.get(cls, None)
+    if names is None:
+        names = {}
+        for element_name in getattr(cls, "_pyangbind_elements", ()):
+            leaf_schema = getattr(cls, "_pybind_schema_%s" % element_name, None)
+            if isinstance(leaf_schema, YANGLeafSchema):
+                names[id(leaf_schema.kwargs["schema"])] = element_name
+        cache[cls] = names
+    name = names.get(id(leaf._schema_node), None)
+    if name is None:
+        return
+    stored = getattr(parent, "_pybind_leaf_metadata", None)
+    if stored is None:
+        stored = parent._pybind_leaf_metadata = {}
+    stored[name] = metadata
 
 
 def ReferenceType(*args, **kwargs):
@@ -1372,7 +2746,21 @@ class YANGBinary(bytes):
         return str(self, encoding=encoding, errors=errors)
 
 
+# The YANGBits type for each set of bit definitions, such that the leaves
+# that have the same bits share a type (and its tables of positions).
+_bits_types = {}
+
+
 def YANGBitsType(allowed_bits):
+    positions = dict((bit, int(position)) for bit, position in six.iteritems(allowed_bits))
+    key = tuple(sorted(six.iteritems(positions)))
+    bits_type = _bits_types.get(key, None)
+    if bits_type is None:
+        bits_type = _bits_types[key] = _build_bits_type(positions)
+    return bits_type
+
+
+def _build_bits_type(allowed_bits):
     class YANGBits(set):
         """Map the ``bits`` built-in type of YANG
 
@@ -1387,59 +2775,160 @@ def YANGBitsType(allowed_bits):
 
         __init__ parses such a string, and __str__() prints the value as
         above. In the Python model, the bits that are set are kept as a set
-        of strings.
+        of strings, and as an integer in which each bit that is set has the
+        value 1 << position. The names and values of the bits are looked up
+        in tables that are built once for the type, and the canonical string
+        is kept until the bits are changed. int() returns the integer, and
+        from_int() creates a value from it.
 
         Override the ``add()``, ``discard()`` and similar methods to set and
-        clear the bits, checking for legal values.
+        clear the bits, checking for legal values. Iterating over the value
+        returns the names in the order of their positions.
 
         :param allowed_bits: dictionary of legal bit values and positions; it
             is set when generating the YANG-Python type mapping, when
             ``pyangbing.lib.pybing.build_elemtype`` recurses over the YANG model
         """
 
+        __slots__ = ("_mask", "_canonical", "_mchanged")
         _pybind_generated_by = "YANGBits"
+        _allowed_bits = allowed_bits
+        # the value of each bit, keyed by its name, and vice-versa.
+        _bit_masks = dict((bit, 1 << position) for bit, position in six.iteritems(allowed_bits))
+        _mask_names = dict((1 << position, bit) for bit, position in six.iteritems(allowed_bits))
+        _valid_mask = sum(_mask_names)
 
         def __init__(self, *args, **kwargs):
             super().__init__()
-            self._allowed_bits = allowed_bits
-
+            self._mask = 0
+            self._canonical = None
             if args:
                 value = args[0]
-                for bit in value.split():
-                    self.add(bit)
+                if getattr(value, "_bit_masks", None) is self._bit_masks:
+                    # a copy of another value of the same type.
+                    mask = value._mask
+                else:
+                    # a string of bits separated by spaces, or a set of bits.
+                    mask = self._mask_of(value.split() if isinstance(value, six.string_types) else value)
+                self._store(mask)
 
-        def _add_bit_definition(self, bit, position):
-            self._allowed_bits[bit] = position
+        @classmethod
+        def from_int(cls, value):
+            """
+            Return a value of the type from the integer returned by int() for
+            a value of the type, which can be assigned to a leaf of the type.
+            """
+            value = int(value)
+            if value < 0 or value & ~cls._valid_mask:
+                raise ValueError(f"Bits {value} not valid, expected a combination of {cls._allowed_bits}")
+            bits = YANGBits()
+            bits._store(value)
+            return bits
+
+        def _bit(self, bit):
+            mask = self._bit_masks.get(bit, None)
+            if mask is None:
+                raise ValueError(f"Bit value {bit} not valid, expected one of {self._allowed_bits}")
+            return mask
+
+        def _mask_of(self, bits):
+            mask = 0
+            for bit in bits:
+                mask |= self._bit(bit)
+            return mask
+
+        def _names(self, mask):
+            while mask:
+                lowest = mask & -mask
+                yield self._mask_names[lowest]
+                mask ^= lowest
+
+        def _bits_changed(self):
+            # called before the bits are changed - the change is propagated
+            # to the parent where the bits are within a data tree.
+            if hasattr(self, "_set"):
+                self._set()
+            else:
+                self._mchanged = True
+
+        def _store(self, mask):
+            # set the bits of mask and clear the others, without marking the
+            # value changed.
+            for bit in self._names(self._mask & ~mask):
+                set.discard(self, bit)
+            for bit in self._names(mask & ~self._mask):
+                set.add(self, bit)
+            self._mask = mask
+            self._canonical = None
+
+        def _replace(self, mask):
+            self._bits_changed()
+            self._store(mask)
+
+        def __iter__(self):
+            return self._names(self._mask)
+
+        def __int__(self):
+            return self._mask
 
         # overwrite set methods to 1/ check for legal values and 2/ set the
         # changed flag
         def add(self, bit):
-            if bit not in self._allowed_bits:
-                raise ValueError(f"Bit value {bit} not valid, expected one of {self._allowed_bits}")
-            super().add(bit)
-            self._mchanged = True
+            self._replace(self._mask | self._bit(bit))
 
         def clear(self):
-            super().clear()
-            self._mchanged = True
+            self._replace(0)
 
         def discard(self, bit):
-            if bit not in self._allowed_bits:
-                raise ValueError(f"Bit value {bit} not valid, expected one of {self._allowed_bits}")
-            super().discard(bit)
-            self._mchanged = True
+            self._replace(self._mask & ~self._bit(bit))
 
         def pop(self):
-            super().pop()
-            self._mchanged = True
+            if not self._mask:
+                raise KeyError("pop from an empty set")
+            lowest = self._mask & -self._mask
+            self._replace(self._mask ^ lowest)
+            return self._mask_names[lowest]
 
         def remove(self, bit):
-            super().remove(bit)
-            self._mchanged = True
+            if bit not in self:
+                raise KeyError(bit)
+            self._replace(self._mask & ~self._bit(bit))
+
+        def update(self, *others):
+            mask = self._mask
+            for other in others:
+                mask |= self._mask_of(other)
+            self._replace(mask)
+
+        def intersection_update(self, *others):
+            self._replace(self._mask_of(set(self).intersection(*others)))
+
+        def difference_update(self, *others):
+            self._replace(self._mask_of(set(self).difference(*others)))
+
+        def symmetric_difference_update(self, other):
+            self._replace(self._mask ^ self._mask_of(set(other)))
+
+        def __ior__(self, other):
+            self.update(other)
+            return self
+
+        def __iand__(self, other):
+            self.intersection_update(other)
+            return self
+
+        def __isub__(self, other):
+            self.difference_update(other)
+            return self
+
+        def __ixor__(self, other):
+            self.symmetric_difference_update(other)
+            return self
 
         def __str__(self, encoding="ascii", errors="replace"):
             """Return bits as shown in JSON."""
-            sort_key = self._allowed_bits.__getitem__
-            return " ".join(sorted(self, key=sort_key))
+            if self._canonical is None:
+                self._canonical = " ".join(self)
+            return self._canonical
 
     return YANGBits
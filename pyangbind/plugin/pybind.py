@@ -279,6 +279,38 @@ class PyangBindClass(plugin.PyangPlugin):
                                     keyword is used in the generated
                                     code.""",
         ),
+        option_group.add_option(
+            "--lazy-children",
+            dest="lazy_children",
+            action="store_true",
+            help="""Create the children of each
+                                  container when they are first
+                                  accessed, rather than when the
+                                  container is instantiated. Children
+                                  are created when the container is
+                                  instantiated where a path helper is
+                                  used, so this has no effect on
+                                  instances with a path helper""",
+        ),
+        option_group.add_option(
+            "--compact-leaves",
+            dest="compact_leaves",
+            action="store_true",
+            help="""Store only the value of each
+                                  leaf within its container, and
+                                  create the leaf object when it
+                                  is accessed. Leaves are not stored
+                                  compactly with --use-xpathhelper""",
+        ),
+        option_group.add_option(
+            "--json-encoders",
+            dest="json_encoders",
+            action="store_true",
+            help="""Generate a method for each
+                                  container that builds its JSON
+                                  representation in a single pass,
+                                  which is used by pybindJSON""",
+        ),
         option_group.add_option(
             "--build-notifications",
             dest="build_notifications",
@@ -330,10 +362,17 @@ def build_pybind(ctx, modules, fd):
         "ReferenceType",
         "YANGBinary",
         "YANGBitsType",
+        "YANGLeafSchema",
+        "YANGSchemaNode",
     ]
     for library in yangtypes_imports:
         ctx.pybind_common_hdr += "from pyangbind.lib.yangtypes import {}\n".format(library)
     ctx.pybind_common_hdr += "from pyangbind.lib.base import PybindBase\n"
+    if ctx.opts.json_encoders:
+        ctx.pybind_common_hdr += (
+            "from pyangbind.lib.serialise import JSONEncoding, encode_json_container, "
+            + "encode_json_leaf, encode_json_leaf_list, encode_json_list\n"
+        )
     ctx.pybind_common_hdr += "from collections import OrderedDict\n"
     ctx.pybind_common_hdr += "from decimal import Decimal\n"
     ctx.pybind_common_hdr += "import six\n"
@@ -790,16 +829,14 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
     # 'container', 'module', 'list' and 'submodule' all have their own classes
     # generated.
     if parent.keyword in ["container", "module", "list", "submodule", "input", "output", "rpc", "notification"]:
-        if ctx.opts.split_class_dir:
-            nfd.write("class %s(PybindBase):\n" % safe_name(parent.arg))
+        if ctx.opts.split_class_dir or path == "":
+            class_name = safe_name(parent.arg)
         else:
-            if not path == "":
-                nfd.write(
-                    "class yc_%s_%s_%s(PybindBase):\n"
-                    % (safe_name(parent.arg), safe_name(module.arg), safe_name(path.replace("/", "_")))
-                )
-            else:
-                nfd.write("class %s(PybindBase):\n" % safe_name(parent.arg))
+            class_name = "yc_%s_%s_%s" % (
+                safe_name(parent.arg),
+                safe_name(module.arg),
+                safe_name(path.replace("/", "_")),
+            )
 
         # If the container is actually a list, then determine what the key value
         # is and store this such that we can give a hint.
@@ -811,6 +848,16 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
             else:
                 keyval = [keyval]
 
+        # The YANGSchemaNode of each element is created once, when the module is
+        # imported, and shared by each instance of the class.
+        if len(elements):
+            nfd.write("_%s_schema = {\n" % class_name)
+            for i in elements:
+                nfd.write("  '%s': YANGSchemaNode(%s),\n" % (i["name"], schema_node_args(ctx, i, keyval, parent_cfg)))
+            nfd.write("}\n\n\n")
+
+        nfd.write("class %s(PybindBase):\n" % class_name)
+
         # Auto-generate a docstring based on the description that is provided in
         # the YANG module. This aims to provide readability to someone perusing the
         # code that is generated.
@@ -863,6 +910,18 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
             mod_location = module
         nfd.write("  _yang_namespace = '%s'\n" % (mod_location.search("namespace")[0].arg))
 
+        # The private attribute of an element is populated on first access
+        # with lazy children, or in a snapshot - store their (mangled) names
+        # such that PybindBase can determine whether an element has been
+        # created, and create it.
+        nfd.write(
+            "  _pybind_element_slots = {%s}\n"
+            % ", ".join("'%s': '_%s__%s'" % (i["name"], class_name.lstrip("_"), i["name"]) for i in elements)
+        )
+        # The schema node of each element, such that the elements of the class
+        # can be inspected without creating an instance of it.
+        nfd.write("  _pybind_element_schema = _%s_schema\n" % class_name)
+
         choices = {}
         choice_attrs = []
         classes = {}
@@ -875,9 +934,6 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
             # but YANG needs (such as a default value, the original YANG name, any
             # extension that were provided with the leaf, etc.).
             class_str = {}
-            if "default" in i and not i["default"] is None:
-                default_arg = '"%s"' % (i["default"]) if i["quote_arg"] else "%s" % i["default"]
-
             if i["class"] == "leaf-list":
                 # Map a leaf-list to the type specified in the class map. This is a
                 # TypedList (see lib.yangtypes) with a particular set of types allowed.
@@ -892,8 +948,6 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
                 else:
                     allowed_type = "%s" % (i["type"]["native_type"][1])
                 class_str["arg"] += "%s(allowed_type=%s)" % (i["type"]["native_type"][0], allowed_type)
-                if "default" in i and not i["default"] is None:
-                    class_str["arg"] += ", default=%s(%s)" % (i["defaulttype"], default_arg)
             elif i["class"] == "list":
                 # Map a list to YANGList class - this is dynamically derived by the
                 # YANGListType function to have the relevant characteristics, such as
@@ -925,8 +979,6 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
                     else:
                         class_str["arg"] += "%s," % u[1]["native_type"]
                 class_str["arg"] += "]"
-                if "default" in i and not i["default"] is None:
-                    class_str["arg"] += ", default=%s(%s)" % (i["defaulttype"], default_arg)
             elif i["class"] == "leafref":
                 # A leafref, pyangbind uses the special ReferenceType which performs a
                 # lookup against the path_helper class provided.
@@ -962,23 +1014,12 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
                     class_str["arg"] += "]"
                 else:
                     class_str["arg"] = "base=%s" % i["type"]
-                if "default" in i and not i["default"] is None:
-                    class_str["arg"] += ", default=%s(%s)" % (i["defaulttype"], default_arg)
-            if i["class"] == "container":
-                class_str["arg"] += ", is_container='container'"
-                if ctx.opts.generate_presence:
-                    class_str["arg"] += ", presence=%s" % i["presence"]
-            elif i["class"] == "list":
-                class_str["arg"] += ", is_container='list'"
-            elif i["class"] == "leaf-list":
-                class_str["arg"] += ", is_leaf=False"
-            else:
-                class_str["arg"] += ", is_leaf=True"
             if class_str["arg"]:
-                class_str["arg"] += ', yang_name="%s"' % i["yang_name"]
+                # The attributes of the element that are the same for each
+                # instance of the container are held by its YANGSchemaNode.
+                class_str["arg"] += ", schema=_%s_schema['%s']" % (class_name, i["name"])
                 class_str["arg"] += ", parent=self"
                 if i["choice"]:
-                    class_str["arg"] += ", choice=%s" % repr(i["choice"])
                     choice_attrs.append(i["name"])
                     if not i["choice"][0] in choices:
                         choices[i["choice"][0]] = {}
@@ -987,17 +1028,25 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
                     choices[i["choice"][0]][i["choice"][1]].append(i["name"])
                 class_str["arg"] += ", path_helper=self._path_helper"
                 class_str["arg"] += ", extmethods=self._extmethods"
-                class_str["arg"] += ", register_paths=%s" % i["register_paths"]
-                if "extensions" in i:
-                    class_str["arg"] += ", extensions=%s" % i["extensions"]
-                if keyval and i["yang_name"] in keyval:
-                    class_str["arg"] += ", is_keyval=True"
-                class_str["arg"] += ", namespace='%s'" % i["namespace"]
-                class_str["arg"] += ", defining_module='%s'" % i["defining_module"]
-                class_str["arg"] += ", yang_type='%s'" % i["origtype"]
-                class_str["arg"] += ", is_config=%s" % (i["config"] and parent_cfg)
                 classes[i["name"]] = class_str
 
+                # With compact leaves, the arguments of a leaf that do not
+                # depend upon the container instance are held by a schema
+                # that is shared by each instance.
+                if is_compact_leaf(ctx, i, keyval):
+                    class_str["schema"] = class_str["arg"].replace(", parent=self", "")
+                    class_str["schema"] = class_str["schema"].replace(", path_helper=self._path_helper", "")
+                    class_str["schema"] = class_str["schema"].replace(", extmethods=self._extmethods", "")
+
+        # The schema of each compact leaf is shared by each instance of the
+        # class.
+        for i in elements:
+            if "schema" in classes.get(i["name"], {}):
+                nfd.write(
+                    "  _pybind_schema_%s = YANGLeafSchema('%s', '_%s__%s', %s)\n"
+                    % (i["name"], i["name"], class_name.lstrip("_"), i["name"], classes[i["name"]]["schema"])
+                )
+
         # TODO: get and set methods currently have errors that are reported that
         # are a bit ugly. The intention here is to act like an immutable type -
         # such that new class instances are created each time that the value is
@@ -1051,9 +1100,24 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
             )
 
         # Write out the classes that are stored locally as self.__foo where
-        # foo is the safe YANG name.
-        for c in classes:
-            nfd.write("    self.%s = %s(%s)\n" % (classes[c]["name"], classes[c]["type"], classes[c]["arg"]))
+        # foo is the safe YANG name. With lazy children, these are created by
+        # the getter when the element is first accessed.
+        if not ctx.opts.lazy_children:
+            for c in classes:
+                if "schema" in classes[c]:
+                    nfd.write("    self.%s = None\n" % classes[c]["name"])
+                else:
+                    nfd.write("    self.%s = %s(%s)\n" % (classes[c]["name"], classes[c]["type"], classes[c]["arg"]))
+        elif ctx.opts.use_xpathhelper:
+            # Elements are registered with the path helper when they are
+            # created, such that they can be resolved as the targets of
+            # leafrefs, and hence are created eagerly where there is one.
+            nfd.write(
+                """
+    if self._path_helper:
+      for e in self._pyangbind_elements:
+        self._materialise(e)\n"""
+            )
         # Don't accept arguments to a container/list/submodule class
         nfd.write(
             """
@@ -1062,14 +1126,28 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
       if len(args) > 1:
         raise TypeError("cannot create a YANG container with >1 argument")
       all_attr = True
-      for e in self._pyangbind_elements:
-        if not hasattr(args[0], e):
-          all_attr = False
+      for e in self._pyangbind_elements:\n"""
+        )
+        # Look up properties on the class, such that checking the supplied
+        # object does not create its lazy children.
+        if ctx.opts.lazy_children:
+            nfd.write("""        if not hasattr(type(args[0]), e) and not hasattr(args[0], e):\n""")
+        else:
+            nfd.write("""        if not hasattr(args[0], e):\n""")
+        nfd.write(
+            """          all_attr = False
           break
       if not all_attr:
         raise ValueError("Supplied object did not have the correct attributes")
-      for e in self._pyangbind_elements:
-        nobj = getattr(args[0], e)
+      for e in self._pyangbind_elements:\n"""
+        )
+        if ctx.opts.lazy_children:
+            nfd.write(
+                """        if not getattr(args[0], "_materialised", lambda e: True)(e):
+          continue\n"""
+            )
+        nfd.write(
+            """        nobj = getattr(args[0], e)
         if nobj._changed() is False:
           continue
         setmethod = getattr(self, "_set_%s" % e)
@@ -1103,11 +1181,27 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
   def _get_%s(self):
     """
     Getter method for %s, mapped from YANG variable %s (%s)%s
-    """
-    return self.__%s
-      '''
-                % (i["name"], i["name"], i["path"], i["origtype"], description_str, i["name"])
+    """'''
+                % (i["name"], i["name"], i["path"], i["origtype"], description_str)
             )
+            if "schema" in c_str:
+                nfd.write(
+                    """
+    return self._pybind_schema_%s.get(self)
+      """
+                    % i["name"]
+                )
+            else:
+                nfd.write(
+                    """
+    try:
+      return self.__%s
+    except AttributeError:
+      self._materialise('%s')
+      return self.__%s
+      """
+                    % (i["name"], i["name"], i["name"])
+                )
 
             nfd.write(
                 '''
@@ -1134,12 +1228,20 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
     if hasattr(v, "_utype"):
       v = v._utype(v)"""
             )
-            nfd.write(
-                """
+            if "schema" in c_str:
+                nfd.write(
+                    """
+    try:
+      t = self._pybind_schema_%s.leaf(self, v)"""
+                    % i["name"]
+                )
+            else:
+                nfd.write(
+                    """
     try:
       t = %s(v,%s)"""
-                % (c_str["type"], c_str["arg"])
-            )
+                    % (c_str["type"], c_str["arg"])
+                )
             nfd.write(
                 """
     except (TypeError, ValueError):\n"""
@@ -1160,7 +1262,10 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
                     c_str["arg"],
                 )
             )
-            nfd.write("    self.__%s = t\n" % (i["name"]))
+            if "schema" in c_str:
+                nfd.write("    self._pybind_schema_%s.set(self, t)\n" % (i["name"]))
+            else:
+                nfd.write("    self.__%s = t\n" % (i["name"]))
             nfd.write("    if hasattr(self, '_set'):\n")
             nfd.write("      self._set()\n")
 
@@ -1168,12 +1273,20 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
             # be used. Generally, this is done in a choice where one branch needs to
             # be set to the default, but may be used wherever re-initialiation of
             # the object is required.
-            nfd.write(
-                """
+            if "schema" in c_str:
+                nfd.write(
+                    """
+  def _unset_%s(self):
+    self._pybind_schema_%s.unset(self)\n\n"""
+                    % (i["name"], i["name"])
+                )
+            else:
+                nfd.write(
+                    """
   def _unset_%s(self):
     self.__%s = %s(%s)\n\n"""
-                % (i["name"], i["name"], c_str["type"], c_str["arg"])
-            )
+                    % (i["name"], i["name"], c_str["type"], c_str["arg"])
+                )
 
         # When an element is read-only, write out the _set and _get methods, but
         # we don't actually make the property object accessible. This ensures that
@@ -1190,6 +1303,9 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
                 nfd.write("""  %s = __builtin__.property(_get_%s)\n""" % (i["name"], i["name"]))
             else:
                 nfd.write("""  %s = __builtin__.property(_get_%s, _set_%s)\n""" % (i["name"], i["name"], i["name"]))
+
+        if ctx.opts.json_encoders:
+            write_json_encoder(ctx, nfd, elements, keyval)
     nfd.write("\n")
 
     # Store a list of the choices that are included within this module such that
@@ -1211,6 +1327,117 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
     return None
 
 
+def write_json_encoder(ctx, nfd, elements, keyval):
+    """
+    Write the _to_json_obj() method of a container, which builds the JSON
+    representation of the container as per pybindJSON.dumps(). The kind of
+    each element, its name, and whether its value is stored in its private
+    attribute are determined here rather than when the container is
+    serialised.
+    """
+    nfd.write(
+        '''
+  def _to_json_obj(self, filter=False, mode='default', with_defaults=None, namespace=None, encoding=None, skip=None):
+    """
+    Return the JSON representation of this container, with each value encoded
+    as per mode ('default' or 'ietf'). namespace is that of the parent of the
+    container, which determines the names of its elements in IETF mode. The
+    subtrees that are skipped by skip, a SkipPaths, are omitted.
+    """
+    if encoding is None:
+      encoding = JSONEncoding(filter, mode, with_defaults)
+    ietf = encoding.ietf
+    changed = self._changed_elements() if encoding.changed_only else None
+    d = {}\n'''
+    )
+    for i in elements:
+        nfd.write("    if changed is None or '%s' in changed:\n" % i["name"])
+        if is_compact_leaf(ctx, i, keyval):
+            # the leaf object is created from the stored value.
+            nfd.write("      element = self._serialised_element('%s')\n" % i["name"])
+        else:
+            nfd.write(
+                """      try:
+        element = self.__%s
+      except AttributeError:
+        element = self._serialised_element('%s')\n"""
+                % (i["name"], i["name"])
+            )
+        yname = "'%s:%s' if ietf and namespace != '%s' else '%s'" % (
+            i["defining_module"],
+            i["yang_name"],
+            i["namespace"],
+            i["yang_name"],
+        )
+        if i["class"] == "container":
+            nfd.write("      encode_json_container(d, %s, element, encoding, '%s', skip)\n" % (yname, i["namespace"]))
+        elif i["class"] == "list":
+            nfd.write("      encode_json_list(d, %s, element, encoding, '%s', skip)\n" % (yname, i["namespace"]))
+        elif i["class"] in ["leaf-list", "leafref-list"]:
+            nfd.write("      encode_json_leaf_list(d, %s, element, encoding, skip)\n" % yname)
+        else:
+            nfd.write("      encode_json_leaf(d, %s, element, encoding, skip)\n" % yname)
+    nfd.write("    return d\n")
+
+
+def is_compact_leaf(ctx, element, keyval):
+    """
+    Return whether the value of element is stored compactly, which is the
+    case for leaves with --compact-leaves. Leaves whose type depends upon the
+    container instance (leafrefs), keys, and bits (whose value is mutable)
+    are not stored compactly. Nor are any leaves where a path helper is
+    used, since the leaf objects of compact leaves are not registered with
+    it, and hence cannot be resolved as the targets of leafrefs.
+    """
+    if not ctx.opts.compact_leaves or ctx.opts.use_xpathhelper:
+        return False
+    if element["class"] in ["container", "list", "leaf-list", "leafref", "leafref-list"]:
+        return False
+    if keyval and element["yang_name"] in keyval:
+        return False
+    element_type = str(element["type"])
+    return "YANGBitsType" not in element_type and "ReferenceType" not in element_type
+
+
+def schema_node_args(ctx, element, keyval, parent_cfg):
+    """
+    Return the arguments of the YANGSchemaNode that holds the attributes of
+    element that are the same for each instance of its container.
+    """
+    args = []
+    if element["class"] not in ["list", "leafref", "leafref-list"]:
+        if "default" in element and element["default"] is not None:
+            if element["quote_arg"]:
+                default_arg = '"%s"' % element["default"]
+            else:
+                default_arg = "%s" % element["default"]
+            args.append("default=%s(%s)" % (element["defaulttype"], default_arg))
+    if element["class"] == "container":
+        args.append("is_container='container'")
+        if ctx.opts.generate_presence:
+            args.append("presence=%s" % element["presence"])
+    elif element["class"] == "list":
+        args.append("is_container='list'")
+    elif element["class"] == "leaf-list":
+        args.append("is_leaf=False")
+    else:
+        args.append("is_leaf=True")
+    args.append('yang_name="%s"' % element["yang_name"])
+    if element["choice"]:
+        args.append("choice=%s" % repr(element["choice"]))
+    # compact leaves are not registered with a path helper.
+    args.append("register_paths=%s" % (element["register_paths"] and not is_compact_leaf(ctx, element, keyval)))
+    if "extensions" in element:
+        args.append("extensions=%s" % element["extensions"])
+    if keyval and element["yang_name"] in keyval:
+        args.append("is_keyval=True")
+    args.append("namespace='%s'" % element["namespace"])
+    args.append("defining_module='%s'" % element["defining_module"])
+    args.append("yang_type='%s'" % element["origtype"])
+    args.append("is_config=%s" % (element["config"] and parent_cfg))
+    return ", ".join(args)
+
+
 def build_elemtype(ctx, et, prefix=False):
     # Build a dictionary which defines the type for the element. This is used
     # both in the case that a typedef needs to be built, as well as on per-list
@@ -1350,9 +1577,9 @@ def build_elemtype(ctx, et, prefix=False):
             for bit in et.search("bit"):
                 position = bit.search_one("position")
                 if position is not None:
-                    pos = position.arg
+                    pos = int(position.arg)
                 else:
-                    pos = 1 + max(allowed_bits)
+                    pos = 1 + max(allowed_bits.values()) if allowed_bits else 0
                 allowed_bits[bit.arg] = pos
             cls = "restricted-bits"
             elemtype = {
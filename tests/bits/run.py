@@ -3,6 +3,7 @@ from __future__ import unicode_literals
 
 import unittest
 
+from pyangbind.lib.yangtypes import YANGBitsType
 from tests.base import PyangBindTestCase
 
 
@@ -56,6 +57,86 @@ class BitsTests(PyangBindTestCase):
         self.instance.bits2.add("foo")
         self.assertEqual(str(self.instance.bits2), "foo bar baz")
 
+    def test_string_is_updated_when_bits_change(self):
+        self.instance.bits2.add("baz")
+        self.assertEqual(str(self.instance.bits2), "baz")
+        self.instance.bits2.add("foo")
+        self.assertEqual(str(self.instance.bits2), "foo baz")
+        self.instance.bits2.discard("baz")
+        self.assertEqual(str(self.instance.bits2), "foo")
+
+    def test_bits_are_iterated_in_position_order(self):
+        self.instance.bits2.update(["baz", "foo", "bar"])
+        self.assertEqual(list(self.instance.bits2), ["foo", "bar", "baz"])
+        self.assertEqual(self.instance.bits2.pop(), "foo")
+        self.assertEqual(len(self.instance.bits2), 2)
+
+    def test_update_checks_values(self):
+        with self.assertRaises(ValueError):
+            self.instance.bits2.update(["foo", "unknownflag"])
+        self.assertEqual(len(self.instance.bits2), 0)
+
+    def test_set_operations_return_sets(self):
+        self.instance.bits2.add("foo")
+        self.assertEqual(self.instance.bits2 | {"bar"}, {"foo", "bar"})
+        self.assertEqual(self.instance.bits2.union(["baz"]), {"foo", "baz"})
+        self.assertTrue(self.instance.bits2.issubset({"foo", "bar"}))
+
+    def test_integer_encoding(self):
+        self.instance.bits2.update(["foo", "baz"])
+        self.assertEqual(int(self.instance.bits2), 0b101)
+        self.instance.bits2 = type(self.instance.bits2).from_int(0b010)
+        self.assertEqual(str(self.instance.bits2), "bar")
+        self.assertTrue(self.instance.bits2._changed())
+
+    def test_integer_with_unknown_bits_is_rejected(self):
+        with self.assertRaises(ValueError):
+            type(self.instance.bits2).from_int(0b1000)
+
+    def test_implicit_positions(self):
+        self.instance.implicit_bits.update(["third", "first"])
+        self.assertEqual(int(self.instance.implicit_bits), (1 << 0) | (1 << 6))
+        self.assertEqual(str(self.instance.implicit_bits), "first third")
+
+    def test_leaves_with_the_same_bits_share_a_type(self):
+        other = self.bindings.bits()
+        self.assertIs(type(self.instance.mybits), type(other.mybits))
+
+    def test_bits_are_a_set(self):
+        self.instance.bits2.update(["foo", "baz"])
+        self.assertIsInstance(self.instance.bits2, set)
+        self.assertEqual(set(self.instance.bits2), {"foo", "baz"})
+        self.assertEqual(self.instance.bits2.copy(), {"foo", "baz"})
+        self.assertTrue(self.instance.bits2.issuperset({"baz"}))
+        self.assertTrue(self.instance.bits2.isdisjoint({"bar"}))
+        self.assertEqual({"foo", "bar"} - self.instance.bits2, {"bar"})
+
+    def test_in_place_operators_check_values(self):
+        self.instance.bits2 |= {"baz", "foo"}
+        self.assertEqual(str(self.instance.bits2), "foo baz")
+        self.instance.bits2 -= {"foo"}
+        self.assertEqual(str(self.instance.bits2), "baz")
+        self.assertEqual(int(self.instance.bits2), 0b100)
+        with self.assertRaises(ValueError):
+            self.instance.bits2 |= {"unknownflag"}
+        self.assertEqual(str(self.instance.bits2), "baz")
+
+    def test_new_value_is_not_changed(self):
+        bits = YANGBitsType({"foo": 0, "bar": 1})("bar foo")
+        self.assertEqual(str(bits), "foo bar")
+        self.assertFalse(getattr(bits, "_mchanged", False))
+        bits.discard("foo")
+        self.assertTrue(bits._mchanged)
+
+    def test_clear_changes_after_add(self):
+        self.instance.bits2.add("foo")
+        self.assertEqual(self.instance.get(filter=True), {"bits2": {"foo"}})
+        self.instance.clear_changes()
+        self.assertFalse(self.instance.bits2._changed())
+        self.assertEqual(self.instance.get(filter=True), {})
+        self.instance.bits2.add("bar")
+        self.assertEqual(self.instance.get(filter=True), {"bits2": {"foo", "bar"}})
+
 
 if __name__ == "__main__":
     unittest.main()
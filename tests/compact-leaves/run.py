@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+
+import json
+import unittest
+from decimal import Decimal
+
+import pyangbind.lib.pybindJSON as pbJ
+from pyangbind.lib.xpathhelper import YANGPathHelper
+from tests.base import PyangBindTestCase
+
+
+class CompactLeavesTests(PyangBindTestCase):
+    yang_files = ["compact.yang"]
+    pyang_flags = ["--compact-leaves"]
+
+    def setUp(self):
+        self.instance = self.bindings.compact()
+
+    def stored(self, container, element_name):
+        return getattr(container, container._pybind_element_slots[element_name], None)
+
+    def test_unset_leaf_stores_nothing(self):
+        self.assertIsNone(self.stored(self.instance.device, "name"))
+        self.assertIsNone(self.stored(self.instance.device, "description"))
+
+    def test_leaf_value_is_stored_as_builtin(self):
+        self.instance.device.name = "eth0"
+        self.instance.device.mtu = 1500
+        self.instance.device.speed = "10.5"
+        for element_name, value in [("name", "eth0"), ("mtu", 1500), ("speed", Decimal("10.50"))]:
+            with self.subTest(element_name=element_name):
+                stored = self.stored(self.instance.device, element_name)
+                self.assertEqual(stored, value)
+                self.assertIs(type(stored), type(value))
+
+    def test_leaf_object_is_created_on_access(self):
+        self.instance.device.name = "eth0"
+        leaf = self.instance.device.name
+        self.assertEqual(leaf, "eth0")
+        self.assertEqual(leaf.yang_name(), "name")
+        self.assertEqual(leaf._path(), ["device", "name"])
+        self.assertTrue(leaf._changed())
+        self.assertFalse(self.instance.device.mtu._changed())
+
+    def test_default_of_compact_leaf(self):
+        self.assertEqual(self.instance.device.description, "")
+        self.assertEqual(self.instance.device.description._default, "none")
+
+    def test_leaves_share_schema(self):
+        other = self.bindings.compact()
+        self.assertIs(
+            type(self.instance.device)._pybind_schema_name,
+            type(other.device)._pybind_schema_name,
+        )
+
+    def test_types_are_round_tripped(self):
+        for element_name, value, expected in [
+            ("enabled", True, True),
+            ("enabled", "false", False),
+            ("state", "down", "down"),
+            ("address", 42, 42),
+            ("address", "lo0", "lo0"),
+            ("speed", "0.1", Decimal("0.10")),
+        ]:
+            with self.subTest(element_name=element_name, value=value):
+                setattr(self.instance.device, element_name, value)
+                self.assertEqual(getattr(self.instance.device, element_name), expected)
+
+    def test_invalid_value_is_not_stored(self):
+        self.instance.device.mtu = 1500
+        with self.assertRaises(ValueError):
+            self.instance.device.mtu = 10
+        self.assertEqual(self.instance.device.mtu, 1500)
+
+    def test_keys_bits_and_leaf_lists_are_not_compact(self):
+        self.assertFalse(hasattr(type(self.instance.device), "_pybind_schema_flags"))
+        self.assertFalse(hasattr(type(self.instance.device), "_pybind_schema_tags"))
+        entry = self.instance.device.interfaces.add("eth0")
+        self.assertFalse(hasattr(type(entry), "_pybind_schema_name"))
+        self.assertTrue(hasattr(type(entry), "_pybind_schema_mtu"))
+
+    def test_choice_unsets_compact_leaf(self):
+        self.instance.device.one_leaf = "one"
+        self.instance.device.two_leaf = "two"
+        self.assertIsNone(self.stored(self.instance.device, "one_leaf"))
+        self.assertFalse(self.instance.device.one_leaf._changed())
+        self.assertEqual(self.instance.get(filter=True), {"device": {"two-leaf": "two"}})
+
+    def test_clear_changes(self):
+        self.instance.device.name = "eth0"
+        self.instance.clear_changes()
+        self.assertFalse(self.instance.device.name._changed())
+        self.assertEqual(self.instance.device.name, "eth0")
+        self.assertEqual(self.instance.get(filter=True), {})
+
+    def test_json_round_trip(self):
+        self.instance.device.name = "eth0"
+        self.instance.device.mtu = 9000
+        self.instance.device.enabled = True
+        self.instance.device.interfaces.add("eth1").mtu = 1500
+        dumped = pbJ.dumps(self.instance)
+        self.assertEqual(
+            json.loads(dumped),
+            {
+                "device": {
+                    "name": "eth0",
+                    "mtu": 9000,
+                    "enabled": True,
+                    "interfaces": {"eth1": {"name": "eth1", "mtu": 1500}},
+                }
+            },
+        )
+        loaded = pbJ.loads(json.loads(dumped), self.bindings, "compact")
+        self.assertEqual(pbJ.dumps(loaded), dumped)
+
+    def test_snapshot_of_compact_leaves(self):
+        self.instance.device.name = "eth0"
+        snapshot = self.instance.snapshot()
+        self.instance.device.name = "eth1"
+        self.assertEqual(snapshot.device.name, "eth0")
+        self.assertTrue(snapshot.device.name._changed())
+
+    def test_metadata_is_retained(self):
+        self.instance.device.name = "eth0"
+        self.instance.device.name._add_metadata("origin", "intended")
+        self.assertEqual(self.instance.device.name._metadata, {"origin": "intended"})
+        self.assertEqual(self.instance.device.mtu._metadata, {})
+
+    def test_metadata_is_discarded_with_value(self):
+        self.instance.device.name = "eth0"
+        self.instance.device.name._add_metadata("origin", "intended")
+        self.instance.device.name = "eth1"
+        self.assertEqual(self.instance.device.name._metadata, {})
+        self.instance.device.name._add_metadata("origin", "applied")
+        self.instance.device._unset_name()
+        self.assertEqual(self.instance.device.name._metadata, {})
+
+    def test_metadata_of_ietf_json_is_retained(self):
+        loaded = pbJ.loads_ietf(
+            {"compact:device": {"name": "eth0", "@name": {"compact:origin": "intended"}}},
+            self.bindings,
+            "compact",
+        )
+        self.assertEqual(loaded.device.name._metadata, {"compact:origin": "intended"})
+
+
+class CompactLeavesPathHelperTests(PyangBindTestCase):
+    yang_files = ["compact.yang"]
+    pyang_flags = ["--compact-leaves", "--use-xpathhelper"]
+
+    def setUp(self):
+        self.path_helper = YANGPathHelper()
+        self.instance = self.bindings.compact(path_helper=self.path_helper)
+
+    def test_leaves_are_not_compact(self):
+        self.assertFalse(hasattr(type(self.instance.device), "_pybind_schema_name"))
+
+    def test_leafref_to_leaf(self):
+        self.instance.device.name = "eth0"
+        self.instance.device.primary = "eth0"
+        self.assertEqual(str(self.instance.device.primary), "eth0")
+        self.assertEqual([str(i) for i in self.path_helper.get("/device/name")], ["eth0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@
 from decimal import Decimal
 import unittest
 
+from pyangbind.lib.yangtypes import RestrictedPrecisionDecimalType
 from tests.base import PyangBindTestCase
 
 
@@ -71,6 +72,25 @@ class DecimalTests(PyangBindTestCase):
                     "Decimal64 leaf with range was not correctly set (%f -> %s != %s)" % (value[0], allowed, value[1]),
                 )
 
+    def test_types_with_the_same_precision_are_shared(self):
+        self.assertIs(RestrictedPrecisionDecimalType(precision=2), RestrictedPrecisionDecimalType(precision=2))
+        self.assertIsNot(RestrictedPrecisionDecimalType(precision=2), RestrictedPrecisionDecimalType(precision=3))
+        self.decimal_obj.container.dlist.append(1)
+        self.assertIsInstance(self.decimal_obj.container.dlist[0], RestrictedPrecisionDecimalType(precision=2))
+
+    def test_create_many(self):
+        values = RestrictedPrecisionDecimalType(precision=1).create_many(["1.26", 2, Decimal("0.04")])
+        self.assertEqual([str(v) for v in values], ["1.3", "2.0", "0.0"])
+
+    def test_leaf_list_values_are_converted(self):
+        self.decimal_obj.container.dlist = [1, "2.346", Decimal("3.1"), 4.0]
+        self.assertEqual([str(v) for v in self.decimal_obj.container.dlist], ["1.00", "2.35", "3.10", "4.00"])
+
+    def test_leaf_list_rejects_invalid_values(self):
+        with self.assertRaises(ValueError):
+            self.decimal_obj.container.dlist.extend(["1", "one"])
+        self.assertEqual(len(self.decimal_obj.container.dlist), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -51,6 +51,23 @@ class EnumerationTests(PyangBindTestCase):
             "Erroneously statically defined value returned (%s)" % self.enum_obj.container.e.getValue(mapped=True),
         )
 
+    def test_enumeration_table_maps_names_and_values(self):
+        table = self.enum_obj.container.e._enumeration_dict
+        self.assertEqual(table.value_of("one"), 0)
+        self.assertEqual(table.value_of("two"), 42)
+        self.assertEqual(table.value_of("three"), 2)
+        self.assertEqual(table.name_of(42), "two")
+        self.assertEqual(table.name_of(2), "three")
+
+    def test_enumeration_table_is_shared_and_immutable(self):
+        other = self.bindings.enumeration()
+        table = self.enum_obj.container.e._enumeration_dict
+        self.assertIs(table, other.container.e._enumeration_dict)
+        with self.assertRaises(TypeError):
+            table["two"]["value"] = 1
+        with self.assertRaises(TypeError):
+            table["four"] = {}
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+import json
+import unittest
+
+import pyangbind.lib.pybindJSON as pbJ
+from tests.base import PyangBindTestCase
+
+
+class JSONEncoderTests(PyangBindTestCase):
+    yang_files = ["encoders.yang"]
+    pyang_flags = ["--json-encoders"]
+
+    def setUp(self):
+        self.instance = self.bindings.encoders()
+        self.instance.device.name = "router"
+        self.instance.device.enabled = False
+        self.instance.device.tags.append("core")
+        self.instance.device.interfaces.add("eth0").speed = "10.5"
+        self.instance.device.interfaces.add("eth1")
+        self.instance.device.rules.add(2)
+        self.instance.device.rules.add(1)
+        self.instance.device.ref = "eth0"
+
+    def generic_dumps(self, obj, **kwargs):
+        # The output of dumps() when the generated encoders are not used.
+        kwargs.setdefault("select", {})
+        return pbJ.dumps(obj, **kwargs)
+
+    def test_containers_have_encoders(self):
+        self.assertTrue(hasattr(self.instance, "_to_json_obj"))
+        self.assertTrue(hasattr(self.instance.device.interfaces["eth0"], "_to_json_obj"))
+
+    def test_default_mode(self):
+        self.assertEqual(
+            json.loads(pbJ.dumps(self.instance)),
+            {
+                "device": {
+                    "name": "router",
+                    "enabled": False,
+                    "tags": ["core"],
+                    "interfaces": {"eth0": {"name": "eth0", "speed": 10.5}, "eth1": {"name": "eth1"}},
+                    "rules": {"2": {"id": 2, "__yang_order": 0}, "1": {"id": 1, "__yang_order": 1}},
+                    "ref": "eth0",
+                }
+            },
+        )
+
+    def test_ietf_mode(self):
+        self.assertEqual(
+            json.loads(pbJ.dumps(self.instance, mode="ietf")),
+            {
+                "encoders:device": {
+                    "name": "router",
+                    "enabled": False,
+                    "tags": ["core"],
+                    "interfaces": [{"name": "eth0", "speed": "10.50"}, {"name": "eth1"}],
+                    "rules": [{"id": 2}, {"id": 1}],
+                    "ref": "eth0",
+                }
+            },
+        )
+
+    def test_output_matches_generic_serialiser(self):
+        self.instance.device.settings._set_present()
+        for kwargs in [
+            {},
+            {"filter": False},
+            {"mode": "ietf"},
+            {"mode": "ietf", "filter": False},
+            {"mode": "ietf", "with_defaults": "report-all"},
+            {"indent": None},
+        ]:
+            with self.subTest(**kwargs):
+                self.assertEqual(pbJ.dumps(self.instance, **kwargs), self.generic_dumps(self.instance, **kwargs))
+
+    def test_only_changed_elements_are_encoded(self):
+        self.instance.clear_changes()
+        self.instance.device.mtu = 9000
+        self.assertEqual(json.loads(pbJ.dumps(self.instance)), {"device": {"mtu": 9000}})
+        self.assertEqual(pbJ.dumps(self.instance, mode="ietf"), self.generic_dumps(self.instance, mode="ietf"))
+
+    def test_skip_subtrees(self):
+        for skip_subtrees in [
+            ["/device/interfaces"],
+            ["/device/interfaces[name='eth0']/speed", "/device/rules/*", "/*/tags"],
+        ]:
+            for mode in ["default", "ietf"]:
+                with self.subTest(skip_subtrees=skip_subtrees, mode=mode):
+                    self.assertEqual(
+                        pbJ.dumps(self.instance, mode=mode, skip_subtrees=skip_subtrees),
+                        self.generic_dumps(self.instance, mode=mode, skip_subtrees=skip_subtrees),
+                    )
+
+    def test_dump_of_list_entry(self):
+        entry = self.instance.device.interfaces["eth0"]
+        self.assertEqual(json.loads(pbJ.dumps(entry)), {"name": "eth0", "speed": 10.5})
+
+
+class LazyCompactJSONEncoderTests(JSONEncoderTests):
+    pyang_flags = ["--json-encoders", "--lazy-children", "--compact-leaves"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+
+import json
+import unittest
+
+import pyangbind.lib.pybindJSON as pbJ
+from pyangbind.lib.xpathhelper import YANGPathHelper
+from tests.base import PyangBindTestCase
+
+
+class LazyChildrenTests(PyangBindTestCase):
+    yang_files = ["lazy.yang"]
+    pyang_flags = ["--lazy-children"]
+
+    def setUp(self):
+        self.instance = self.bindings.lazy()
+
+    def test_children_are_not_created_on_init(self):
+        self.assertFalse(self.instance._materialised("container"))
+        self.assertFalse(self.instance._materialised("other"))
+
+    def test_child_is_created_on_first_access(self):
+        container = self.instance.container
+        self.assertTrue(self.instance._materialised("container"))
+        self.assertIs(self.instance.container, container)
+        self.assertFalse(container._materialised("subcontainer"))
+        self.assertFalse(self.instance._materialised("other"))
+
+    def test_created_child_has_parent(self):
+        self.assertEqual(self.instance.container.subcontainer._path(), ["container", "subcontainer"])
+
+    def test_default_value_of_created_leaf(self):
+        self.assertEqual(self.instance.container.subcontainer.default_leaf._default, "lazy")
+        self.assertFalse(self.instance.container.subcontainer.default_leaf._changed())
+
+    def test_set_values(self):
+        self.instance.container.subcontainer.a_leaf = 42
+        self.instance.container.entries.add("one")
+        self.assertEqual(self.instance.container.subcontainer.a_leaf, 42)
+        self.assertTrue(self.instance.container.subcontainer.a_leaf._changed())
+        self.assertEqual(list(self.instance.container.entries.keys()), ["one"])
+
+    def test_iteration_creates_children(self):
+        self.assertEqual([name for name, _ in self.instance], ["container", "other"])
+        self.assertTrue(self.instance._materialised("other"))
+
+    def test_unfiltered_get_does_not_create_children(self):
+        self.assertEqual(
+            self.instance.get(),
+            {
+                "container": {"subcontainer": {"a-leaf": 0, "default-leaf": "lazy"}, "entries": {}},
+                "other": {"b-leaf": ""},
+            },
+        )
+        self.assertFalse(self.instance._materialised("container"))
+        self.assertFalse(self.instance._materialised("other"))
+
+    def test_filtered_get_does_not_create_children(self):
+        self.instance.container.subcontainer.a_leaf = 1
+        self.assertEqual(self.instance.get(filter=True), {"container": {"subcontainer": {"a-leaf": 1}}})
+        self.assertFalse(self.instance._materialised("other"))
+        self.assertFalse(self.instance.container._materialised("entries"))
+        self.assertFalse(self.instance.container.subcontainer._materialised("default_leaf"))
+
+    def test_serialisers_do_not_create_children(self):
+        self.instance.container.subcontainer.a_leaf = 1
+        for mode in ["default", "ietf"]:
+            with self.subTest(mode=mode):
+                self.assertEqual(
+                    json.loads(pbJ.dumps(self.instance, mode=mode)),
+                    {"lazy:container" if mode == "ietf" else "container": {"subcontainer": {"a-leaf": 1}}},
+                )
+        self.assertFalse(self.instance._materialised("other"))
+        self.assertFalse(self.instance.container._materialised("entries"))
+
+    def test_unfiltered_serialisers_do_not_create_children(self):
+        expected = self.bindings.lazy().get()
+        for mode in ["default", "ietf"]:
+            with self.subTest(mode=mode):
+                instance = self.bindings.lazy()
+                dumped = json.loads(pbJ.dumps(instance, filter=False, mode=mode))
+                self.assertEqual(json.loads("".join(pbJ.iterdump(instance, filter=False, mode=mode))), dumped)
+                if mode == "default":
+                    self.assertEqual(dumped, expected)
+                self.assertFalse(instance._materialised("container"))
+                self.assertFalse(instance._materialised("other"))
+
+    def test_unfiltered_get_of_accessed_child(self):
+        self.instance.container.subcontainer.a_leaf = 1
+        self.assertEqual(self.instance.get()["container"]["subcontainer"], {"a-leaf": 1, "default-leaf": "lazy"})
+        self.assertFalse(self.instance.container.subcontainer._materialised("default_leaf"))
+
+    def test_load_json(self):
+        loaded = pbJ.loads(
+            json.dumps({"container": {"entries": {"one": {"name": "one", "value": 1}}}}), self.bindings, "lazy"
+        )
+        self.assertEqual(loaded.container.entries["one"].value, 1)
+        self.assertFalse(loaded._materialised("other"))
+
+    def test_copy_constructor(self):
+        self.instance.container.subcontainer.a_leaf = 3
+        copied = self.bindings.lazy(self.instance)
+        self.assertEqual(copied.container.subcontainer.a_leaf, 3)
+        self.assertFalse(self.instance._materialised("other"))
+
+
+class LazyChildrenPathHelperTests(PyangBindTestCase):
+    yang_files = ["lazy-leafref.yang"]
+    pyang_flags = ["--lazy-children", "--use-xpathhelper"]
+
+    def setUp(self):
+        self.path_helper = YANGPathHelper()
+        self.instance = self.bindings.lazy_leafref(path_helper=self.path_helper)
+
+    def test_children_are_created_with_a_path_helper(self):
+        self.assertTrue(self.instance._materialised("interfaces"))
+        self.assertEqual(len(self.path_helper.get("/interfaces")), 1)
+
+    def test_leafref_key(self):
+        entry = self.instance.interfaces.interface.add("eth0")
+        self.assertEqual(str(entry.name), "eth0")
+        self.assertEqual(entry.config.name, "eth0")
+        self.assertEqual(
+            [str(i) for i in self.path_helper.get("/interfaces/interface[name=eth0]/config/name")], ["eth0"]
+        )
+
+    def test_children_are_lazy_without_a_path_helper(self):
+        self.assertFalse(self.bindings.lazy_leafref()._materialised("interfaces"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -127,6 +127,46 @@ class LeafListTests(PyangBindTestCase):
         with self.assertRaises(ValueError):
             self.leaflist_obj.container.leaflist[2] = "foo"
 
+    def test_leaf_lists_are_unique_after_extend(self):
+        self.leaflist_obj.container.leaflist.append("foo")
+        self.leaflist_obj.container.leaflist.extend(["bar", "foo", "baz", "bar"])
+        self.assertEqual(self.leaflist_obj.container.leaflist, ["foo", "bar", "baz"])
+
+    def test_extend_with_invalid_value_adds_nothing(self):
+        self.leaflist_obj.container.listtwo.append("a-valid-string")
+        with self.assertRaises(ValueError):
+            self.leaflist_obj.container.listtwo.extend(["another-valid-string", "broken-string"])
+        self.assertEqual(self.leaflist_obj.container.listtwo, ["a-valid-string"])
+
+    def test_value_can_be_added_again_after_removal(self):
+        self.leaflist_obj.container.leaflist = ["foo", "bar", "baz"]
+        self.leaflist_obj.container.leaflist.remove("foo")
+        del self.leaflist_obj.container.leaflist[0:1]
+        self.assertNotIn("foo", self.leaflist_obj.container.leaflist)
+        self.assertNotIn("bar", self.leaflist_obj.container.leaflist)
+        self.leaflist_obj.container.leaflist.append("foo")
+        self.leaflist_obj.container.leaflist.insert(0, "bar")
+        self.assertEqual(self.leaflist_obj.container.leaflist, ["bar", "baz", "foo"])
+
+    def test_union_leaflist_skips_types_that_cannot_match(self):
+        listthree = self.leaflist_obj.container.listthree
+        listthree.extend([1, "fish", 2, "chips"])
+        self.assertEqual(listthree, [1, "fish", 2, "chips"])
+        # a string allowed type is never tried for an integer value
+        string_idx = [idx for idx, entry in enumerate(listthree._coercion_plan) if entry[0] is str]
+        self.assertEqual(len(string_idx), 1)
+        self.assertNotIn(string_idx[0], listthree._coercion_candidates[int])
+        self.assertIn(string_idx[0], listthree._coercion_candidates[str])
+
+    def test_clear_changes_after_append(self):
+        self.leaflist_obj.container.leaflist.append("itemOne")
+        self.assertEqual(self.leaflist_obj.get(filter=True), {"container": {"leaflist": ["itemOne"]}})
+        self.leaflist_obj.clear_changes()
+        self.assertFalse(self.leaflist_obj.container.leaflist._changed())
+        self.assertEqual(self.leaflist_obj.get(filter=True), {})
+        self.leaflist_obj.container.leaflist.append("itemTwo")
+        self.assertEqual(self.leaflist_obj.get(filter=True), {"container": {"leaflist": ["itemOne", "itemTwo"]}})
+
 
 if __name__ == "__main__":
     unittest.main()
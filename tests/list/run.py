@@ -1,8 +1,12 @@
 #!/usr/bin/env python
 from __future__ import unicode_literals
 
+import io
+import json
 import unittest
+from unittest import mock
 
+import pyangbind.lib.pybindJSON as pbJ
 from tests.base import PyangBindTestCase
 
 
@@ -165,7 +169,9 @@ class ListTests(PyangBindTestCase):
         self.instance.list_container.list_eight.add(val="one", additional="ten")
         self.instance.list_container.list_eight.add(val="two", additional="twenty")
         self.instance.list_container.list_eight.delete(val="one", additional="ten")
-        self.assertEqual(list(self.instance.list_container.list_eight.keys()), ["value one value two", "two twenty"])
+        self.assertEqual(
+            list(self.instance.list_container.list_eight.keys()), [("value one", "value two"), ("two", "twenty")]
+        )
 
     def test_cant_delete_nonexistent_list_item_by_keywords(self):
         self.instance.list_container.list_eight.add(val="two", additional="twenty")
@@ -254,7 +260,7 @@ class ListTests(PyangBindTestCase):
             item.kvtwo = key2
             item.lv = val
             self.instance.list_ten.append(item)
-        self.assertEqual(list(self.instance.list_ten.keys()), ["12 13", "13 14"])
+        self.assertEqual(list(self.instance.list_ten.keys()), [("12", "13"), ("13", "14")])
 
     def test_append_new_list_item_with_identityref(self):
         item = self.instance.list_eleven._new_item()
@@ -277,6 +283,169 @@ class ListTests(PyangBindTestCase):
         with self.assertRaises(AttributeError):
             self.instance.list_eleven[1].nonexistent = False
 
+    def _count_entries_created(self, yang_list, fn):
+        contained = yang_list._contained_class
+        init = contained.__init__
+        created = []
+
+        def counting_init(entry, *args, **kwargs):
+            created.append(entry)
+            init(entry, *args, **kwargs)
+
+        with mock.patch.object(contained, "__init__", counting_init):
+            fn()
+        return len(created)
+
+    def test_adding_list_entry_creates_one_entry(self):
+        yang_list = self.instance.list_container.list_element
+        self.assertEqual(self._count_entries_created(yang_list, lambda: yang_list.add(1)), 1)
+
+    def test_adding_compound_key_list_entry_creates_one_entry(self):
+        yang_list = self.instance.list_container.list_four
+        self.assertEqual(self._count_entries_created(yang_list, lambda: yang_list.add(valone="aa", valtwo=2)), 1)
+        self.assertEqual(self._count_entries_created(yang_list, lambda: yang_list.add("bb 4")), 1)
+        self.assertEqual(yang_list["aa 2"]._path(), ["list-container", "list-four[valone='aa' valtwo='2']"])
+
+    def test_compound_keys_with_spaces_are_distinct(self):
+        self.instance.list_container.list_eight.add(val="a b", additional="c")
+        self.instance.list_container.list_eight.add(val="a", additional="b c")
+        self.assertEqual(len(self.instance.list_container.list_eight), 2)
+        self.assertEqual(self.instance.list_container.list_eight[("a b", "c")].additional, "c")
+        self.assertEqual(self.instance.list_container.list_eight[("a", "b c")].additional, "b c")
+
+    def test_compound_key_tuple_lookup(self):
+        self.instance.list_ten.add(kv=12, kvtwo=13)
+        self.assertIn((12, 13), self.instance.list_ten)
+        self.assertIn("12 13", self.instance.list_ten)
+        self.assertEqual(self.instance.list_ten[(12, 13)].kvtwo, 13)
+        self.assertEqual(self.instance.list_ten.lookup(kv=12, kvtwo=13), [self.instance.list_ten[(12, 13)]])
+        self.assertEqual(self.instance.list_ten.lookup(kv=12, kvtwo=14), [])
+
+    def test_lookup_by_leaf_value(self):
+        for kv, kvtwo, lv in [(12, 13, "THIRTEEN"), (13, 14, "FOURTEEN"), (14, 15, "FOURTEEN")]:
+            self.instance.list_ten.add(kv=kv, kvtwo=kvtwo)
+            self.instance.list_ten[(kv, kvtwo)].lv = lv
+        self.assertEqual([i.kv for i in self.instance.list_ten.lookup(lv="FOURTEEN")], [13, 14])
+        self.assertEqual([i.kv for i in self.instance.list_ten.lookup(lv="FOURTEEN", kvtwo=15)], [14])
+
+    def test_secondary_index_is_maintained(self):
+        yang_list = self.instance.list_container.list_element
+        yang_list.add(1)
+        yang_list[1].another_value = "one"
+        yang_list.add_index("another_value")
+        self.assertEqual(yang_list.lookup(another_value="one"), [yang_list[1]])
+
+        yang_list.add(2)
+        yang_list[2].another_value = "two"
+        self.assertEqual(yang_list.lookup(another_value="two"), [yang_list[2]])
+
+        yang_list[1].another_value = "two"
+        self.assertEqual(yang_list.lookup(another_value="one"), [])
+        self.assertEqual(yang_list.lookup(another_value="two"), [yang_list[2], yang_list[1]])
+
+        yang_list.delete(2)
+        self.assertEqual(yang_list.lookup(another_value="two"), [yang_list[1]])
+
+    def test_cannot_index_nonexistent_leaf(self):
+        with self.assertRaises(ValueError):
+            self.instance.list_container.list_element.add_index("nonexistent")
+
+    def test_list_type_is_shared_by_instances(self):
+        other = self.bindings.list_()
+        self.assertIs(type(self.instance.list_container.list_element), type(other.list_container.list_element))
+
+    def test_adding_index_creates_no_entry(self):
+        yang_list = self.instance.list_container.list_element
+        self.assertEqual(self._count_entries_created(yang_list, lambda: yang_list.add_index("another_value")), 0)
+
+    def test_compound_keys_with_spaces_are_round_tripped(self):
+        self.instance.list_container.list_eight.add(val="a b", additional="c")
+        self.instance.list_container.list_eight.add(val="d", additional="e")
+        dumped = pbJ.dumps(self.instance)
+        for method, loaded in [
+            ("loads", pbJ.loads(dumped, self.bindings, "list_")),
+            ("load_stream", pbJ.load_stream(io.StringIO(dumped), self.bindings, "list_")),
+        ]:
+            with self.subTest(method=method):
+                self.assertEqual(list(loaded.list_container.list_eight.keys()), [("a b", "c"), ("d", "e")])
+                self.assertEqual(pbJ.dumps(loaded), dumped)
+
+    def test_compound_key_string_with_spaces_is_split(self):
+        yang_list = self.instance.list_container.list_eight
+        yang_list.add(val="a b", additional="c d")
+        self.assertIn("a b c d", yang_list)
+        self.assertEqual(yang_list["a b c d"].val, "a b")
+        self.assertNotIn("a b c e", yang_list)
+        self.assertNotIn("a", yang_list)
+
+    def test_add_many_list_entries(self):
+        entries = self.instance.list_ten.add_many([(12, 13), "13 14", {"kv": 14, "kvtwo": 15}])
+        self.assertEqual(list(self.instance.list_ten.keys()), [("12", "13"), ("13", "14"), ("14", "15")])
+        self.assertEqual([i.kvtwo for i in entries], [13, 14, 15])
+        self.assertTrue(self.instance.list_ten[(12, 13)]._changed())
+
+    def test_add_many_list_entries_is_atomic(self):
+        self.instance.list_container.list_element.add(2)
+        for keys in [[1, 2], [1, 1], [1, "wrong-key-type"]]:
+            with self.subTest(keys=keys):
+                with self.assertRaises(KeyError):
+                    self.instance.list_container.list_element.add_many(keys)
+                self.assertEqual(list(self.instance.list_container.list_element.keys()), [2])
+
+    def test_add_many_marks_parent_as_changed(self):
+        self.assertFalse(self.instance.list_container._changed())
+        self.instance.list_container.list_element.add_many([1, 2])
+        self.assertTrue(self.instance.list_container._changed())
+
+    def test_list_entries_from_records(self):
+        self.instance.list_ten.from_records(
+            [{"kv": 12, "kvtwo": 13, "lv": "THIRTEEN"}, {"kv": 13, "kvtwo": 14, "lv": "FOURTEEN"}]
+        )
+        self.assertEqual(self.instance.list_ten[(13, 14)].lv, "FOURTEEN")
+        self.assertEqual(self.instance.list_ten.lookup(lv="THIRTEEN"), [self.instance.list_ten[(12, 13)]])
+
+    def test_filtered_get_after_clear_changes_includes_changed_entries(self):
+        self.instance.list_container.list_element.add(1)
+        self.instance.list_container.list_element.add(2)
+        self.instance.clear_changes()
+        self.assertEqual(self.instance.get(filter=True), {})
+        self.instance.list_container.list_element[2].another_value = "changed"
+        self.assertEqual(
+            self.instance.get(filter=True),
+            {"list-container": {"list-element": {2: {"keyval": 2, "another-value": "changed"}}}},
+        )
+
+    def test_serialisations_of_a_list_omit_unchanged_entries(self):
+        list_element = self.instance.list_container.list_element
+        list_element.add(1)
+        list_element.add(2)
+        self.instance.clear_changes()
+        list_element[2].another_value = "changed"
+        for mode in ["default", "ietf"]:
+            for method, serialised in [
+                ("dumps", pbJ.dumps(list_element, mode=mode)),
+                ("iterdump", "".join(pbJ.iterdump(list_element, mode=mode))),
+                ("select", pbJ.dumps(list_element, mode=mode, select={"keyval": 2})),
+            ]:
+                with self.subTest(mode=mode, method=method):
+                    entries = json.loads(serialised)
+                    if mode == "ietf":
+                        entries = [dict((k.split(":")[-1], v) for k, v in entry.items()) for entry in entries]
+                    else:
+                        entries = list(entries.values())
+                    self.assertEqual(entries, [{"keyval": 2, "another-value": "changed"}])
+            with self.subTest(mode=mode, method="select"):
+                self.assertEqual(
+                    json.loads(pbJ.dumps(list_element, mode=mode, select={"keyval": 1})), [] if mode == "ietf" else {}
+                )
+
+    def test_add_many_is_recorded_as_a_change(self):
+        self.instance.list_container.list_element.add_many([1, 2])
+        self.assertEqual(
+            self.instance.get(filter=True),
+            {"list-container": {"list-element": {1: {"keyval": 1}, 2: {"keyval": 2}}}},
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+from __future__ import unicode_literals
+
+import json
+import unittest
+
+from pyangbind.lib.xpathhelper import PybindXpathHelper, YANGPathHelper
+from tests.base import PyangBindTestCase
+
+
+class MemoryReportTests(PyangBindTestCase):
+    yang_files = ["memory.yang"]
+    pyang_flags = ["--use-xpathhelper"]
+
+    def setUp(self):
+        self.path_helper = YANGPathHelper()
+        self.instance = self.bindings.memory(path_helper=self.path_helper)
+        self.instance.device.name = "router"
+        self.instance.device.tags.append("core")
+        for name in ["eth0", "eth1", "eth2"]:
+            self.instance.device.interfaces.add(name).mtu = 1500
+
+    def test_report_can_be_serialised(self):
+        report = self.instance.memory_report()
+        self.assertEqual(json.loads(json.dumps(report)), report)
+
+    def test_totals_are_the_sum_of_paths_and_types(self):
+        report = self.instance.memory_report()
+        for breakdown in ["paths", "types"]:
+            with self.subTest(breakdown=breakdown):
+                for total in ["objects", "bytes"]:
+                    self.assertEqual(sum(s[total] for s in report[breakdown].values()), report[total])
+
+    def test_entries_are_counted_against_the_schema_path(self):
+        report = self.instance.memory_report()
+        self.assertEqual(report["paths"]["/device/interfaces/mtu"]["objects"], 3)
+        # the list and each of its entries.
+        self.assertEqual(report["paths"]["/device/interfaces"]["objects"], 4)
+        self.assertEqual(report["types"]["YANGListType"]["objects"], 1)
+        self.assertEqual(report["types"]["TypedListType"]["objects"], 1)
+        self.assertGreater(report["paths"]["/device/name"]["bytes"], 0)
+
+    def test_entries_increase_the_size_of_the_list(self):
+        before = self.instance.memory_report()["paths"]["/device/interfaces"]["bytes"]
+        self.instance.device.interfaces.add("eth3")
+        after = self.instance.memory_report()["paths"]["/device/interfaces"]["bytes"]
+        self.assertGreater(after, before)
+
+    def test_report_of_a_subtree(self):
+        report = self.instance.device.interfaces.memory_report()
+        self.assertEqual(
+            sorted(report["paths"]),
+            ["/device/interfaces", "/device/interfaces/mtu", "/device/interfaces/name"],
+        )
+
+    def test_path_helper_index_is_reported(self):
+        report = self.instance.memory_report()
+        self.assertEqual(report["path_helper"]["objects"], len(self.path_helper._library))
+        self.assertGreater(report["path_helper"]["bytes"], 0)
+
+    def test_index_of_other_path_helpers_is_not_reported(self):
+        class UnindexedPathHelper(PybindXpathHelper):
+            def register(self, path, object_ptr, caller=False):
+                pass
+
+            def unregister(self, path, caller=False):
+                pass
+
+            def get(self, path, caller=False):
+                return []
+
+        # the generated classes only accept a YANGPathHelper as their path
+        # helper, so the helper is set directly.
+        instance = self.bindings.memory()
+        instance._path_helper = UnindexedPathHelper()
+        self.assertIsNone(instance.memory_report()["path_helper"])
+
+    def test_snapshot_does_not_count_shared_elements(self):
+        snapshot = self.instance.snapshot()
+        report = snapshot.memory_report()
+        self.assertEqual(report["objects"], 1)
+        self.assertIsNone(report["path_helper"])
+        snapshot.device.name = "copy"
+        self.assertIn("/device/name", snapshot.memory_report()["paths"])
+
+
+class LazyMemoryReportTests(PyangBindTestCase):
+    yang_files = ["memory.yang"]
+    pyang_flags = ["--lazy-children"]
+
+    def test_elements_that_are_not_created_are_not_counted(self):
+        instance = self.bindings.memory()
+        self.assertEqual(sorted(instance.memory_report()["paths"]), ["/"])
+        instance.device.nested.value = 1
+        self.assertEqual(
+            sorted(instance.memory_report()["paths"]),
+            ["/", "/device", "/device/nested", "/device/nested/value"],
+        )
+
+
+class CompactMemoryReportTests(PyangBindTestCase):
+    yang_files = ["memory.yang"]
+    pyang_flags = ["--compact-leaves"]
+
+    def test_compact_leaves_are_counted_as_values(self):
+        instance = self.bindings.memory()
+        instance.device.name = "router"
+        report = instance.memory_report()
+        self.assertEqual(report["paths"]["/device/name"]["objects"], 1)
+        self.assertEqual(report["types"]["YANGLeafSchema"]["objects"], 1)
+        self.assertNotIn("/device/nested/value", report["paths"])
+
+
+if __name__ == "__main__":
+    unittest.main()
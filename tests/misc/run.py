@@ -38,7 +38,9 @@ class MiscTests(PyangBindTestCase):
         b.bar = "stringvaltwo"
 
         self.instance.b.append(b)
-        self.assertIsInstance(list(self.instance.b.keys())[0], six.text_type)
+        self.assertIsInstance(list(self.instance.b.keys())[0], tuple)
+        for keypart in list(self.instance.b.keys())[0]:
+            self.assertIsInstance(keypart, six.text_type)
 
     def test_003_checklistkeytype(self):
         import bindings.c as miscc
@@ -49,6 +51,14 @@ class MiscTests(PyangBindTestCase):
         self.instance.c.append(c)
         self.assertIsInstance(list(self.instance.c.keys())[0], int)
 
+    def test_004_failed_records_are_unregistered(self):
+        with self.assertRaises(AttributeError):
+            self.instance.c.from_records([{"one": 1}, {"one": 2, "nonexistent": 5}])
+        self.assertEqual(len(self.instance.c), 0)
+        self.assertEqual(self.path_helper.get("/c"), [])
+        self.instance.c.from_records([{"one": 1}])
+        self.assertEqual(len(self.path_helper.get("/c")), 1)
+
 
 if __name__ == "__main__":
     unittest.main(exit=False)
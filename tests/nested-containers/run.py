@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import unittest
+from unittest import mock
 
 from tests.base import PyangBindTestCase
 
@@ -37,6 +38,53 @@ class NestedContainerTests(PyangBindTestCase):
             self.nested_obj.get(), {"container": {"subcontainer": {"a-leaf": 1}}}, "instance get not correct"
         )
 
+    def test_container_stays_changed_after_further_changes(self):
+        self.nested_obj.container.subcontainer.a_leaf = 1
+        self.nested_obj.container.subcontainer.a_leaf = 2
+        self.assertTrue(self.nested_obj.container._changed())
+        self.assertEqual(self.nested_obj.get(filter=True), {"container": {"subcontainer": {"a-leaf": 2}}})
+
+    def test_propagation_stops_at_changed_container(self):
+        self.nested_obj.container.subcontainer.a_leaf = 1
+        container = self.nested_obj.container
+        with mock.patch.object(type(container), "_set", autospec=True, side_effect=type(container)._set) as set_mock:
+            self.nested_obj.container.subcontainer.a_leaf = 2
+        set_mock.assert_not_called()
+
+    def test_modification_count_increases_on_change(self):
+        count = self.nested_obj._modification_count()
+        self.nested_obj.container.subcontainer.a_leaf = 1
+        first = self.nested_obj._modification_count()
+        self.assertGreater(first, count)
+        self.nested_obj.container.subcontainer.a_leaf = 2
+        self.assertGreater(self.nested_obj._modification_count(), first)
+
+    def test_modification_count_is_shared_within_a_tree(self):
+        self.nested_obj.container.subcontainer.a_leaf = 1
+        self.assertEqual(
+            self.nested_obj.container.subcontainer._modification_count(), self.nested_obj._modification_count()
+        )
+        self.assertEqual(self.bindings.nested()._modification_count(), 0)
+
+    def test_unchanged_container_is_not_visited_by_filtered_get(self):
+        self.nested_obj.container.subcontainer.a_leaf = 1
+        self.assertEqual(self.nested_obj._changed_elements(), {"container"})
+        subcontainer = self.nested_obj.container.subcontainer
+        self.nested_obj.clear_changes()
+        with mock.patch.object(type(subcontainer), "get", autospec=True) as get_mock:
+            self.assertEqual(self.nested_obj.get(filter=True), {})
+        get_mock.assert_not_called()
+
+    def test_clear_changes(self):
+        self.nested_obj.container.subcontainer.a_leaf = 1
+        self.nested_obj.clear_changes()
+        self.assertFalse(self.nested_obj.container._changed())
+        self.assertFalse(self.nested_obj.container.subcontainer.a_leaf._changed())
+        self.assertEqual(self.nested_obj.container.subcontainer.a_leaf, 1)
+        self.assertEqual(self.nested_obj.get(filter=True), {})
+        self.nested_obj.container.subcontainer.a_leaf = 2
+        self.assertEqual(self.nested_obj.get(filter=True), {"container": {"subcontainer": {"a-leaf": 2}}})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,13 +1,14 @@
 #!/usr/bin/env python
 from __future__ import unicode_literals
 
+import io
 import json
 import os.path
 import unittest
 from collections import OrderedDict
 from decimal import Decimal
 
-from pyangbind.lib.serialise import pybindJSONDecoder
+from pyangbind.lib.serialise import pybindJSONDecoder, pybindJSONStreamDecoder
 from tests.base import PyangBindTestCase
 
 
@@ -124,6 +125,48 @@ class IETFJSONDeserialiseTests(PyangBindTestCase):
             allowed = False
         self.assertFalse(allowed, "Skipping keys that did not exist was not successfully handled.")
 
+    def stream_load(self, document, **kwargs):
+        fp = io.StringIO(json.dumps(document))
+        return pybindJSONStreamDecoder.load_ietf_json(fp, self.bindings, "ietf_json_deserialise", **kwargs)
+
+    def test_stream_load_matches_load(self):
+        for name in ["chlist.json", "complete-obj.json", "mkeylist.json", "skeylist.json"]:
+            with self.subTest(name=name):
+                with open(os.path.join(os.path.dirname(__file__), "json", name)) as fp:
+                    document = json.load(fp)
+                expected = pybindJSONDecoder.load_ietf_json(document, self.bindings, "ietf_json_deserialise")
+                self.assertEqual(self.stream_load(document).get(), expected.get())
+
+    def test_stream_load_keys_after_members(self):
+        document = {"chlist": [{"child": {"number": 1}, "keyleaf": 1}, {"keyleaf": 2, "child": {"number": 2}}]}
+        expected = pybindJSONDecoder.load_ietf_json(document, self.bindings, "ietf_json_deserialise")
+        self.assertEqual(self.stream_load(document).get(), expected.get())
+
+    def test_stream_load_metadata(self):
+        document = {
+            "@skey": {"inactive": True},
+            "skey": [{"leaf-one": "one"}, {"leaf-one": "two"}],
+            "chlist": [
+                {"keyleaf": 1, "child": {"@": {"container": "meta"}, "string": "one", "@string": {"comment": "first"}}}
+            ],
+        }
+        obj = self.stream_load(document)
+        self.assertEqual([entry._metadata for entry in obj.skey.values()], [{"inactive": True}, {"inactive": True}])
+        self.assertEqual(obj.chlist[1].child._metadata, {"container": "meta"})
+        self.assertEqual(obj.chlist[1].child.string._metadata, {"comment": "first"})
+
+    def test_stream_load_entry_callback(self):
+        with open(os.path.join(os.path.dirname(__file__), "json", "mkeylist.json")) as fp:
+            document = json.load(fp)
+        obj = self.stream_load(document, entry_callback=lambda entry: entry.leaf_one != "one")
+        self.assertEqual(obj.get(filter=True), {"mkey": {"three 2": {"leaf-one": "three", "leaf-two": 2}}})
+
+    def test_stream_load_overwrite(self):
+        obj = self.stream_load({"skey": [{"leaf-one": "one"}, {"leaf-one": "two"}]})
+        fp = io.StringIO(json.dumps({"skey": [{"leaf-one": "three"}, {"leaf-one": "four"}]}))
+        pybindJSONStreamDecoder.load_ietf_json(fp, None, None, obj=obj, overwrite=True)
+        self.assertEqual(list(obj.skey.keys()), ["three", "four"])
+
 
 if __name__ == "__main__":
     unittest.main()
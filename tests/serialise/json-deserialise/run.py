@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 from __future__ import unicode_literals
 
+import io
 import json
 import os.path
 import unittest
@@ -130,6 +131,65 @@ class JSONDeserialiseTests(PyangBindTestCase):
             allowed = False
         self.assertFalse(allowed, "Skipping keys that did not exist was not successfully handled.")
 
+    def json_path(self, name):
+        return os.path.join(os.path.dirname(__file__), "json", name)
+
+    def test_stream_load_matches_load(self):
+        for name in ["list.json", "alltypes.json", "orderedlist-order.json", "orderedlist-no-order.json"]:
+            with self.subTest(name=name):
+                expected = pbJ.load(self.json_path(name), self.bindings, "json_deserialise")
+                actual = pbJ.load_stream(self.json_path(name), self.bindings, "json_deserialise")
+                self.assertEqual(actual.get(), expected.get())
+                self.assertEqual(list(actual.ordered.keys()), list(expected.ordered.keys()))
+
+    def test_stream_load_across_chunks(self):
+        class OneByteFile(io.BytesIO):
+            def read(self, size=-1):
+                return super(OneByteFile, self).read(1)
+
+        document = {"c1": {"l1": {"1": {"k1": 1, "string": 'b\u00e9ar "one"', "decimal": 42.42}}}}
+        for ensure_ascii in [True, False]:
+            with self.subTest(ensure_ascii=ensure_ascii):
+                fp = OneByteFile(json.dumps(document, ensure_ascii=ensure_ascii).encode("utf-8"))
+                actual = pbJ.load_stream(fp, self.bindings, "json_deserialise")
+                entry = actual.c1.l1["1"].get()
+                self.assertEqual((entry["string"], entry["decimal"]), ('b\u00e9ar "one"', Decimal("42.42")))
+
+    def test_stream_load_from_text_file(self):
+        with open(self.json_path("list-items.json"), "r") as fp:
+            obj = pbJ.load_stream(fp, self.bindings, "json_deserialise")
+        self.assertEqual(
+            obj.get(filter=True),
+            {"load-list": {"5": {"index": 5, "value": "five"}, "4": {"index": 4, "value": "four"}}},
+        )
+
+    def test_stream_load_entry_callback(self):
+        seen = []
+
+        def keep_odd(entry):
+            seen.append(entry.index)
+            return entry.index % 2 == 1
+
+        obj = pbJ.load_stream(self.json_path("list.json"), self.bindings, "json_deserialise", entry_callback=keep_odd)
+        self.assertEqual(seen, [1, 2, 3])
+        self.assertEqual(list(obj.load_list.keys()), ["1", "3"])
+
+    def test_stream_load_overwrite(self):
+        self.deserialise_obj.load_list.add(7)
+        self.deserialise_obj.load_list.add(4).value = "vier"
+        with open(self.json_path("list-items.json"), "rb") as fp:
+            pbS.pybindJSONStreamDecoder.load_json(fp, None, None, obj=self.deserialise_obj, overwrite=True)
+        self.assertEqual(
+            self.deserialise_obj.get(filter=True),
+            {"load-list": {"4": {"index": 4, "value": "four"}, "5": {"index": 5, "value": "five"}}},
+        )
+
+    def test_stream_load_invalid_json(self):
+        for document in ['{"load-list": {"1": {"index": 1,}}}', '{"load-list": {}} {}', '{"load-list": tru}']:
+            with self.subTest(document=document):
+                with self.assertRaises(pbS.pybindJSONDecodeError):
+                    pbJ.load_stream(io.StringIO(document), self.bindings, "json_deserialise")
+
 
 if __name__ == "__main__":
     unittest.main()
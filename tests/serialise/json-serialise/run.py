@@ -1,13 +1,17 @@
 #!/usr/bin/env python
 
+import io
 import json
 import os.path
+import tempfile
 import unittest
 from decimal import Decimal
+from unittest import mock
 
 import six
 
-from pyangbind.lib.pybindJSON import dumps
+from pyangbind.lib.pybindJSON import dump, dumps, iterdump
+from pyangbind.lib.serialise import YangDataSerialiser
 from pyangbind.lib.xpathhelper import YANGPathHelper
 from tests.base import PyangBindTestCase
 
@@ -29,7 +33,7 @@ class JSONSerialiseTests(PyangBindTestCase):
                 "Invalid output returned when serialising a container.",
             )
 
-    def test_full_serialise(self):
+    def populate(self):
         self.serialise_obj.c1.l1.add(1)
         for signed in ["int", "uint"]:
             for size in [8, 16, 32, 64]:
@@ -69,11 +73,174 @@ class JSONSerialiseTests(PyangBindTestCase):
         for i in range(1, 10):
             self.serialise_obj.c1.l2.add(i)
 
+    def test_full_serialise(self):
+        self.populate()
         pybind_json = json.loads(dumps(self.serialise_obj))
         with open(os.path.join(os.path.dirname(__file__), "json", "expected-output.json"), "r") as fp:
             external_json = json.load(fp)
         self.assertEqual(pybind_json, external_json, "JSON did not match expected output.")
 
+    def test_encoder_is_resolved_once_per_type(self):
+        resolved = []
+
+        class CountingSerialiser(YangDataSerialiser):
+            def _encoder(self, obj):
+                resolved.append(type(obj))
+                return super(CountingSerialiser, self)._encoder(obj)
+
+        for i in range(1, 4):
+            self.serialise_obj.c1.l1.add(i).int32 = i
+        for _ in range(2):
+            encoded = CountingSerialiser().preprocess_element(self.serialise_obj.get(filter=True))
+            self.assertEqual(encoded["c1"]["l1"][2]["int32"], 2)
+        self.assertEqual(len(resolved), len(set(resolved)))
+
+    def test_leaves_of_a_shared_class_are_encoded_by_yang_type(self):
+        self.serialise_obj.c1.l1.add(1)
+        self.serialise_obj.c1.l1[1].string = "1"
+        self.serialise_obj.c1.l1[1].int64 = 1
+        self.serialise_obj.c1.l1[1].int32 = 1
+        encoded = json.loads(dumps(self.serialise_obj, mode="ietf"))["json-serialise:c1"]["l1"][0]
+        self.assertEqual((encoded["string"], encoded["int64"], encoded["int32"]), ("1", "1", 1))
+
+    def test_iterdump_matches_dumps(self):
+        self.populate()
+        for kwargs in [
+            {},
+            {"filter": False},
+            {"indent": None},
+            {"indent": 0},
+            {"mode": "ietf"},
+            {"mode": "ietf", "filter": False, "indent": 2},
+            {"skip_subtrees": ["/c1/l1"]},
+            {"skip_subtrees": ["/c1/l2/3"]},
+            {"skip_subtrees": ["/c1/l1/*/string", "/c1/l2[k1='3']"], "mode": "ietf"},
+        ]:
+            with self.subTest(**kwargs):
+                self.assertEqual("".join(iterdump(self.serialise_obj, **kwargs)), dumps(self.serialise_obj, **kwargs))
+
+    def test_iterdump_of_list_and_empty_tree(self):
+        self.populate()
+        for obj in [self.serialise_obj.c1.l2, self.bindings.json_serialise()]:
+            for mode in ["default", "ietf"]:
+                with self.subTest(obj=obj, mode=mode):
+                    self.assertEqual("".join(iterdump(obj, mode=mode)), dumps(obj, mode=mode))
+
+    def test_iterdump_yields_chunks(self):
+        # entries are added to a tree without a path helper, which is faster.
+        obj = self.bindings.json_serialise()
+        for i in range(1, 500):
+            obj.c1.l1.add(i).string = "entry" * 40
+        chunks = list(iterdump(obj, mode="ietf"))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), dumps(obj, mode="ietf"))
+
+    def test_dump_to_file_object(self):
+        self.populate()
+        fh = io.StringIO()
+        dump(self.serialise_obj, fh, mode="ietf")
+        self.assertEqual(fh.getvalue(), dumps(self.serialise_obj, mode="ietf"))
+
+    def test_dump_to_file_name(self):
+        self.populate()
+        with tempfile.TemporaryDirectory() as directory:
+            fn = os.path.join(directory, "dump.json")
+            dump(self.serialise_obj, fn)
+            with open(fn, "r") as fp:
+                self.assertEqual(fp.read(), dumps(self.serialise_obj))
+
+    def test_skip_subtrees_with_wildcards_and_predicates(self):
+        self.populate()
+        skip_subtrees = ["/c1/l1/*/string", "/c1/l2[k1=3]", "/c1/t1[target='16']"]
+        default = json.loads(dumps(self.serialise_obj, skip_subtrees=skip_subtrees))["c1"]
+        ietf = json.loads(dumps(self.serialise_obj, mode="ietf", skip_subtrees=skip_subtrees))["json-serialise:c1"]
+        for c1, l2_keys, t1_keys, entry in [
+            (default, list(default["l2"]), list(default["t1"]), default["l1"]["1"]),
+            (ietf, [i["k1"] for i in ietf["l2"]], [i["target"] for i in ietf["t1"]], ietf["l1"][0]),
+        ]:
+            with self.subTest(c1=c1):
+                self.assertEqual([six.text_type(i) for i in l2_keys], ["1", "2", "4", "5", "6", "7", "8", "9"])
+                self.assertEqual(t1_keys, ["32"])
+                self.assertNotIn("string", entry)
+                self.assertEqual(entry["restricted-string"], "aardvark")
+
+    def test_skip_subtrees_relative_to_object(self):
+        self.populate()
+        for mode in ["default", "ietf"]:
+            with self.subTest(mode=mode):
+                c1 = json.loads(dumps(self.serialise_obj.c1, mode=mode, skip_subtrees=["/c1/l1[k1=1]", "/two"]))
+                self.assertEqual(sorted(i.split(":")[-1] for i in c1), ["l2", "t1"])
+
+    def test_skip_subtrees_with_module_prefix(self):
+        self.populate()
+        for path in ["/c1/l2", "/json-serialise:c1/l2"]:
+            with self.subTest(path=path):
+                c1 = json.loads(dumps(self.serialise_obj, mode="ietf", skip_subtrees=[path]))["json-serialise:c1"]
+                self.assertEqual(sorted(c1), ["l1", "t1"])
+
+    def test_skipped_subtrees_are_not_visited(self):
+        self.populate()
+        entry_class = type(self.serialise_obj.c1.l1[1])
+        with mock.patch.object(entry_class, "_changed_elements", side_effect=AssertionError):
+            for mode in ["default", "ietf"]:
+                with self.subTest(mode=mode):
+                    self.assertNotIn("l1", dumps(self.serialise_obj, mode=mode, skip_subtrees=["/c1/l1"]))
+                    self.assertNotIn("l1", "".join(iterdump(self.serialise_obj, mode=mode, skip_subtrees=["/c1/l1"])))
+
+    def test_invalid_skip_path_predicate(self):
+        with self.assertRaises(ValueError):
+            dumps(self.serialise_obj, skip_subtrees=["/c1/l1[k1]"])
+
+    def test_select_list_entries(self):
+        self.populate()
+        c1 = self.serialise_obj.c1
+        for obj, key, select, expected in [
+            (c1.l2, "k1", {"k1": 3}, [3]),
+            (c1.l2, "k1", {"k1": "3"}, [3]),
+            (c1.l2, "k1", {"k1": 42}, []),
+            (c1.l2, "k1", {"k1": "42"}, []),
+            (c1.l2, "k1", {"k1": "fish"}, []),
+            (c1.t1, "target", {"json-serialise:target": 32}, ["32"]),
+            (c1.t1, "target", {"json-serialise:target": "64"}, []),
+            (c1.l1, "k1", {"string": "bear"}, [1]),
+            (c1.l1, "k1", {"k1": 1, "string": "fish"}, []),
+        ]:
+            with self.subTest(select=select):
+                default = json.loads(dumps(obj, select=select))
+                self.assertEqual(list(default), [six.text_type(i) for i in expected])
+                ietf = json.loads(dumps(obj, select=select, mode="ietf"))
+                self.assertEqual([v for entry in ietf for k, v in entry.items() if k.endswith(key)], expected)
+
+    def test_select_by_key_does_not_scan_the_list(self):
+        self.populate()
+        self.serialise_obj.c1.l2.add(k1=10)
+        members = self.serialise_obj.c1.l2._members
+        with mock.patch.object(self.serialise_obj.c1.l2, "_members", mock.MagicMock(wraps=members)) as wrapped:
+            wrapped.__contains__.side_effect = members.__contains__
+            wrapped.__getitem__.side_effect = members.__getitem__
+            for value, expected in [(10, ["10"]), ("3", ["3"]), ("42", [])]:
+                with self.subTest(value=value):
+                    self.assertEqual(list(json.loads(dumps(self.serialise_obj.c1.l2, select={"k1": value}))), expected)
+        wrapped.__iter__.assert_not_called()
+
+    def test_select_of_user_ordered_list(self):
+        self.populate()
+        self.assertEqual(
+            json.loads(dumps(self.serialise_obj.c1.l2, select={"k1": 5})), {"5": {"k1": 5, "__yang_order": 0}}
+        )
+
+    def test_select_by_key_serialises_only_the_entry(self):
+        self.populate()
+        entry_class = type(self.serialise_obj.c1.l2[1])
+        with mock.patch.object(entry_class, "get", autospec=True, side_effect=entry_class.get) as get:
+            self.assertEqual(list(json.loads(dumps(self.serialise_obj.c1.l2, select={"k1": 7}))), ["7"])
+        self.assertEqual(get.call_count, 1)
+
+    def test_select_unknown_leaf(self):
+        self.populate()
+        with self.assertRaises(KeyError):
+            dumps(self.serialise_obj.c1.l2, select={"nonexistent": 1})
+
 
 if __name__ == "__main__":
     unittest.main()
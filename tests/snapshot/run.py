@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+from __future__ import unicode_literals
+
+import unittest
+
+from pyangbind.lib import pybindJSON
+from pyangbind.lib.xpathhelper import YANGPathHelper
+from tests.base import PyangBindTestCase
+
+
+class SnapshotTests(PyangBindTestCase):
+    yang_files = ["snapshot.yang"]
+    pyang_flags = ["--use-xpathhelper"]
+
+    def setUp(self):
+        self.path_helper = YANGPathHelper()
+        self.instance = self.bindings.snapshot(path_helper=self.path_helper)
+        self.instance.config.name = "source"
+        self.instance.config.tags.append("red")
+        self.instance.config.flags.add("alpha")
+        self.instance.config.nested.value = 1
+        self.instance.config.entries.add("a").value = 10
+        self.instance.config.one_leaf = "one"
+
+    def test_snapshot_matches_source(self):
+        snapshot = self.instance.snapshot()
+        self.assertEqual(pybindJSON.dumps(snapshot, filter=False), pybindJSON.dumps(self.instance, filter=False))
+
+    def test_snapshot_keeps_changes_of_source(self):
+        snapshot = self.instance.snapshot()
+        self.assertEqual(pybindJSON.dumps(snapshot), pybindJSON.dumps(self.instance))
+
+    def test_snapshot_copies_values_that_are_not_changed(self):
+        self.instance.clear_changes()
+        snapshot = self.instance.snapshot()
+        self.assertEqual(snapshot.config.nested.value, 1)
+        self.assertFalse(snapshot.config.nested.value._changed())
+        self.assertEqual(list(snapshot.config.tags), ["red"])
+
+    def test_snapshot_does_not_copy_children_up_front(self):
+        snapshot = self.instance.snapshot()
+        self.assertFalse(snapshot._materialised("config"))
+
+    def test_changes_to_snapshot_do_not_reach_source(self):
+        expected = pybindJSON.dumps(self.instance, filter=False)
+        snapshot = self.instance.snapshot()
+        snapshot.config.name = "copy"
+        snapshot.config.tags.append("blue")
+        snapshot.config.flags.add("beta")
+        snapshot.config.nested.value = 2
+        snapshot.config.entries["a"].value = 20
+        snapshot.config.entries.add("b")
+        snapshot.config.two_leaf = "two"
+        self.assertEqual(pybindJSON.dumps(self.instance, filter=False), expected)
+
+    def test_changes_to_source_do_not_reach_snapshot(self):
+        expected = pybindJSON.dumps(self.instance, filter=False)
+        snapshot = self.instance.snapshot()
+        self.instance.config.name = "changed"
+        self.instance.config.tags.append("blue")
+        self.instance.config.flags.add("beta")
+        self.instance.config.nested.value = 2
+        self.instance.config.entries["a"].value = 20
+        self.instance.config.entries.add("b")
+        self.instance.config.two_leaf = "two"
+        self.assertEqual(pybindJSON.dumps(snapshot, filter=False), expected)
+
+    def test_deleting_source_entry_keeps_snapshot_entry(self):
+        snapshot = self.instance.snapshot()
+        self.instance.config.entries.delete("a")
+        self.assertEqual(list(snapshot.config.entries.keys()), ["a"])
+        self.assertEqual(snapshot.config.entries["a"].value, 10)
+
+    def test_clearing_source_changes_keeps_snapshot_changes(self):
+        expected = pybindJSON.dumps(self.instance, filter=False)
+        snapshot = self.instance.snapshot()
+        self.instance.clear_changes()
+        self.assertEqual(pybindJSON.dumps(snapshot, filter=False), expected)
+
+    def test_snapshot_of_snapshot(self):
+        expected = pybindJSON.dumps(self.instance, filter=False)
+        first = self.instance.snapshot()
+        second = first.snapshot()
+        self.instance.config.nested.value = 2
+        first.config.nested.value = 3
+        self.assertEqual(pybindJSON.dumps(second, filter=False), expected)
+        self.assertEqual(first.config.nested.value, 3)
+
+    def test_list_snapshot(self):
+        snapshot = self.instance.config.entries.snapshot()
+        snapshot.add("b")
+        self.assertEqual(list(self.instance.config.entries.keys()), ["a"])
+        self.assertEqual(list(snapshot.keys()), ["a", "b"])
+
+    def test_list_snapshot_copies_entries_when_they_are_accessed(self):
+        for k in ["b", "c"]:
+            self.instance.config.entries.add(k).value = 1
+        snapshot = self.instance.snapshot()
+        entries = snapshot.config.entries
+        self.assertEqual(len(entries._members._shared_entries()), 3)
+        self.instance.config.entries["b"].value = 2
+        self.assertEqual(len(entries._members._shared_entries()), 2)
+        self.assertEqual(entries["b"].value, 1)
+        entries["c"].value = 3
+        self.assertEqual(self.instance.config.entries["c"].value, 1)
+        self.assertEqual(entries._members._shared_entries(), [self.instance.config.entries["a"]])
+
+    def test_list_snapshot_of_snapshot_keeps_shared_entries(self):
+        self.instance.config.entries.add("b").value = 1
+        first = self.instance.config.entries.snapshot()
+        second = first.snapshot()
+        self.instance.config.entries["a"].value = 20
+        first["b"].value = 2
+        self.assertEqual([(i.id, i.value) for i in second.values()], [("a", 10), ("b", 1)])
+        self.assertEqual([(i.id, i.value) for i in first.values()], [("a", 10), ("b", 2)])
+
+    def test_clone_registers_with_its_own_path_helper(self):
+        clone = self.instance.clone()
+        self.assertIsNot(clone._path_helper, self.path_helper)
+        self.assertIs(clone._path_helper.get("/config/nested/value")[0], clone.config.nested.value)
+        self.assertIs(self.path_helper.get("/config/nested/value")[0], self.instance.config.nested.value)
+        self.assertEqual(pybindJSON.dumps(clone, filter=False), pybindJSON.dumps(self.instance, filter=False))
+
+    def test_clone_with_supplied_path_helper(self):
+        path_helper = YANGPathHelper()
+        clone = self.instance.clone(path_helper=path_helper)
+        self.assertIs(path_helper.get("/config/entries[id=a]")[0], clone.config.entries["a"])
+
+    def test_indexed_leaf_of_snapshot(self):
+        self.instance.config.entries.add_index("value")
+        snapshot = self.instance.snapshot()
+        self.instance.config.entries["a"].value = 20
+        self.assertEqual([str(i.id) for i in self.instance.config.entries.lookup(value=20)], ["a"])
+        self.assertEqual([str(i.id) for i in snapshot.config.entries.lookup(value=10)], ["a"])
+        snapshot.config.entries["a"].value = 30
+        self.assertEqual([str(i.id) for i in snapshot.config.entries.lookup(value=30)], ["a"])
+        self.assertEqual(self.instance.config.entries.lookup(value=30), [])
+
+    def test_indexed_leaf_of_clone(self):
+        self.instance.config.entries.add_index("value")
+        clone = self.instance.clone()
+        self.instance.config.entries["a"].value = 20
+        clone.config.entries["a"].value = 30
+        self.assertEqual([str(i.id) for i in self.instance.config.entries.lookup(value=20)], ["a"])
+        self.assertEqual([str(i.id) for i in clone.config.entries.lookup(value=30)], ["a"])
+
+    def test_indexed_leaf_of_list_snapshot(self):
+        self.instance.config.entries.add_index("value")
+        snapshot = self.instance.config.entries.snapshot()
+        self.instance.config.entries["a"].value = 20
+        self.assertEqual([str(i.id) for i in snapshot.lookup(value=10)], ["a"])
+        self.assertEqual(snapshot.lookup(value=20), [])
+
+    def test_entries_added_to_clone_are_within_clone(self):
+        clone = self.instance.clone()
+        entry = clone.config.entries.add("z")
+        self.assertIs(entry._parent, clone.config)
+        self.assertIs(clone._path_helper.get("/config/entries[id=z]")[0], entry)
+        self.assertEqual(self.path_helper.get("/config/entries[id=z]"), [])
+
+
+class LazyChildrenSnapshotTests(SnapshotTests):
+    pyang_flags = ["--use-xpathhelper", "--lazy-children"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ from __future__ import unicode_literals
 
 import unittest
 
+from pyangbind.lib.yangtypes import pattern_registry
 from tests.base import PyangBindTestCase
 
 
@@ -129,6 +130,75 @@ class StringTests(PyangBindTestCase):
                     allowed = False
                 self.assertEqual(allowed, valid)
 
+    def test_string_leaves_share_a_class(self):
+        other = self.bindings.string()
+        self.instance.string_container.string_leaf = "TestValue"
+        self.assertIs(
+            type(self.instance.string_container.string_leaf), type(other.string_container.string_default_leaf)
+        )
+        self.assertIs(type(self.instance.string_container), type(other.string_container))
+
+    def test_shared_class_keeps_per_instance_attributes(self):
+        self.assertEqual(self.instance.string_container.string_leaf.yang_name(), "string-leaf")
+        self.assertEqual(self.instance.string_container.string_default_leaf.yang_name(), "string-default-leaf")
+        self.assertEqual(self.instance.string_container.string_default_leaf._default, "string")
+        self.assertFalse(self.instance.string_container.string_leaf._default)
+
+    def test_leaves_share_a_schema_node(self):
+        other = self.bindings.string()
+        self.assertIs(
+            self.instance.string_container.string_leaf._schema_node,
+            other.string_container.string_leaf._schema_node,
+        )
+        self.assertIsNot(
+            self.instance.string_container.string_leaf._schema_node,
+            self.instance.string_container.string_default_leaf._schema_node,
+        )
+
+    def test_schema_node_cannot_be_modified(self):
+        with self.assertRaises(AttributeError):
+            self.instance.string_container.string_leaf._schema_node.yang_name = "other"
+
+    def test_metadata_is_created_when_added(self):
+        leaf = self.instance.string_container.string_leaf
+        self.assertIsNone(getattr(leaf, "_pybind_metadata", None))
+        self.assertEqual(leaf._metadata, {})
+        leaf._add_metadata("key", "value")
+        self.assertEqual(leaf._metadata, {"key": "value"})
+
+    def test_restricted_string_leaves_share_a_class(self):
+        other = self.bindings.string()
+        self.assertIs(
+            type(self.instance.string_container.restricted_string), type(other.string_container.restricted_string)
+        )
+
+    def test_pattern_results_are_cached(self):
+        pattern_registry.set_result_cache_size(16)
+        pattern_registry.reset_stats()
+        try:
+            for value, valid in [("fi$h", True), ("void", False), ("fi$h", True), ("void", False)]:
+                with self.subTest(value=value, valid=valid):
+                    allowed = True
+                    try:
+                        self.instance.string_container.stringLeafWithPatternWithDollar = value
+                    except ValueError:
+                        allowed = False
+                    self.assertEqual(allowed, valid)
+            stats = pattern_registry.stats()
+            self.assertEqual(stats["result_misses"], 2)
+            self.assertEqual(stats["result_hits"], 2)
+        finally:
+            pattern_registry.set_result_cache_size(0)
+
+    def test_result_cache_is_bounded(self):
+        pattern_registry.set_result_cache_size(2)
+        try:
+            for value in ["fi$h", "fi$ho", "fi$hy"]:
+                self.instance.string_container.stringLeafWithPatternWithDollar = value
+            self.assertEqual(pattern_registry.stats()["results"], 2)
+        finally:
+            pattern_registry.set_result_cache_size(0)
+
 
 if __name__ == "__main__":
     unittest.main()
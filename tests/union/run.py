@@ -6,6 +6,7 @@ import unittest
 
 import six
 
+from pyangbind.lib.yangtypes import RestrictedClassType, get_union_dispatch
 from tests.base import PyangBindTestCase
 
 
@@ -110,6 +111,24 @@ class UnionTests(PyangBindTestCase):
                     allowed = False
                 self.assertEqual(allowed, valid)
 
+    def test_union_dispatch_is_shared_and_counts_matches(self):
+        int8 = RestrictedClassType(base_type=int, restriction_dict={"range": ["-128..127"]}, int_size=8)
+        dispatch = get_union_dispatch([int8, six.text_type])
+        before = [count for _, count in dispatch.stats()]
+        self.instance.container.u1 = 2
+        self.instance.container.u1 = "aStringTest"
+        self.instance.container.u1 = 300
+        after = [count for _, count in dispatch.stats()]
+        self.assertEqual([after[0] - before[0], after[1] - before[1]], [1, 2])
+        self.assertEqual(self.instance.container.u1, "300")
+
+    def test_union_dispatch_skips_members_that_only_accept_strings(self):
+        int8 = RestrictedClassType(base_type=int, restriction_dict={"range": ["-128..127"]}, int_size=8)
+        pattern = RestrictedClassType(base_type=six.text_type, restriction_dict={"pattern": "h.*"})
+        dispatch = get_union_dispatch([int8, pattern])
+        self.assertEqual(dispatch.candidates(int), (0,))
+        self.assertEqual(dispatch.candidates(six.text_type), (0, 1))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -106,6 +106,24 @@ class XPathListLeaflistTests(PyangBindTestCase):
                 retr = self.path_helper.get("/container/t4[keyval=%s]" % beer)
                 self.assertEqual(len(retr), exists)
 
+    def test_add_many_list_items_registers_them_with_xpath_helper(self):
+        beers = ["steam", "liberty", "porter"]
+        self.instance.container.t4.add_many(beers)
+
+        for beer, exists in [("steam", 1), ("liberty", 1), ("porter", 1), ("pygmy-owl", 0)]:
+            with self.subTest(beer=beer, exists=exists):
+                retr = self.path_helper.get("/container/t4[keyval=%s]" % beer)
+                self.assertEqual(len(retr), exists)
+                retr = self.path_helper.get("/container/t4[keyval=%s]/keyval" % beer)
+                self.assertEqual(len(retr), exists)
+
+    def test_failed_add_many_does_not_register_list_items(self):
+        self.instance.container.t4.add("steam")
+        with self.assertRaises(KeyError):
+            self.instance.container.t4.add_many(["liberty", "steam"])
+        self.assertEqual(len(self.path_helper.get("/container/t4[keyval=liberty]")), 0)
+        self.assertEqual(len(self.path_helper.get("/container/t4[keyval=steam]")), 1)
+
     def test_remove_elements_from_list(self):
         for beer in ["steam", "liberty", "california-lager", "porter", "ipa", "foghorn"]:
             self.instance.container.t4.add(beer)